@@ -0,0 +1,11 @@
+"""
+udata benchmarks
+
+Generate a synthetic catalog with the model factories and time the hot paths on it:
+
+    python -m benchmarks run --datasets 10000 --resources 10 -o before.json
+    python -m benchmarks run --datasets 10000 --resources 10 -o after.json
+    python -m benchmarks compare before.json after.json
+
+See `python -m benchmarks run --help` for the available options.
+"""
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from os.path import dirname, join
+from urllib.parse import urlparse
+
+import click
+from mongoengine.connection import get_db
+
+from udata import settings
+from udata.app import create_app, standalone
+
+from . import catalog, hot_paths
+from .runner import compare, measure, select
+
+log = logging.getLogger(__name__)
+
+DEFAULT_DB = "mongodb://localhost:27017/udata-benchmarks"
+RESULTS_DIR = join(dirname(__file__), "results")
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=dirname(__file__), text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_settings(db: str, mongomock: bool) -> type:
+    overrides = {
+        "MONGODB_HOST_TEST": db,
+        "SEARCH_CACHE_TTL": 0,
+        "SEARCH_FACETS_CACHE_TTL": 0,
+    }
+    if mongomock:
+        try:
+            import mongomock as mongomock_module
+        except ImportError:
+            raise click.UsageError("--mongomock requires the `mongomock` package")
+        overrides["MONGODB_SETTINGS"] = {
+            "host": db,
+            "mongo_client_class": mongomock_module.MongoClient,
+        }
+    return type("Benchmarks", (settings.Testing,), overrides)
+
+
+@click.group()
+def cli():
+    """Benchmark udata hot paths on a generated catalog"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+@cli.command()
+@click.option("--datasets", default=catalog.CatalogSize.datasets, show_default=True)
+@click.option(
+    "--resources", default=catalog.CatalogSize.resources, show_default=True, help="By dataset"
+)
+@click.option("--organizations", default=catalog.CatalogSize.organizations, show_default=True)
+@click.option("--reuses", default=catalog.CatalogSize.reuses, show_default=True)
+@click.option("--geozones", default=catalog.CatalogSize.geozones, show_default=True)
+@click.option(
+    "--sample",
+    default=hot_paths.SAMPLE,
+    show_default=True,
+    help="Number of datasets handled by the per-dataset benchmarks",
+)
+@click.option("-r", "--repeat", default=5, show_default=True, help="Timed runs by benchmark")
+@click.option("--only", multiple=True, help="Only run benchmarks starting with this name")
+@click.option(
+    "--db",
+    default=DEFAULT_DB,
+    show_default=True,
+    help="A dedicated database, dropped before generating the catalog",
+)
+@click.option("--mongomock", is_flag=True, help="Use an in-memory mongomock database")
+@click.option("--keep", is_flag=True, help="Reuse the catalog already generated in the database")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="The results JSON file")
+def run(
+    datasets,
+    resources,
+    organizations,
+    reuses,
+    geozones,
+    sample,
+    repeat,
+    only,
+    db,
+    mongomock,
+    keep,
+    output,
+):
+    """Generate a catalog and time the hot paths"""
+    benchmarks = select(only)
+    if not benchmarks:
+        raise click.UsageError("No benchmark matches {0}".format(", ".join(only)))
+    if "bench" not in urlparse(db).path:
+        raise click.UsageError(
+            f"{db} is not a dedicated benchmark database (no `bench` in its name)"
+        )
+    size = catalog.CatalogSize(datasets, resources, organizations, reuses, geozones)
+    hot_paths.SAMPLE = sample
+
+    app = standalone(create_app(settings.Defaults, override=benchmark_settings(db, mongomock)))
+    with app.test_request_context():
+        database = get_db()
+        if keep and database.dataset.estimated_document_count():
+            log.info(f"Using the catalog of {db}")
+        else:
+            log.info(f"Generating a catalog of {size}")
+            database.client.drop_database(database.name)
+            catalog.generate(size)
+
+        results = {}
+        for bench in benchmarks:
+            log.info(f"Running {bench.name}")
+            results[bench.name] = result = measure(bench, repeat)
+            log.info(
+                f"  {result['median'] * 1000:.2f}ms (median of {repeat}) for {result['items']} item(s)"
+            )
+
+    commit = git_commit()
+    data = {
+        "meta": {
+            "commit": commit,
+            "date": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "backend": "mongomock" if mongomock else "mongodb",
+            "catalog": size.as_dict(),
+            "sample": sample,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    output = output or join(RESULTS_DIR, f"{commit or 'results'}.json")
+    if dirname(output):
+        os.makedirs(dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(data, f, indent=2)
+    click.echo(f"Results saved to {output}")
+
+
+@cli.command("compare")
+@click.argument("base", type=click.File())
+@click.argument("head", type=click.File())
+@click.option(
+    "-t", "--threshold", default=0.1, show_default=True, help="Change ratio flagged as significant"
+)
+@click.option("--fail", is_flag=True, help="Exit with an error status on regressions")
+def compare_command(base, head, threshold, fail):
+    """Compare the medians of two results files"""
+    base, head = json.load(base), json.load(head)
+    if base["meta"]["catalog"] != head["meta"]["catalog"]:
+        click.secho("Catalog sizes differ, timings are not comparable", fg="yellow")
+    rows = compare(base, head, threshold)
+    width = max((len(row["name"]) for row in rows), default=0)
+    colors = {"regression": "red", "improvement": "green"}
+    for row in rows:
+        base_ms = f"{row['base'] * 1000:.2f}ms" if row["base"] is not None else "-"
+        head_ms = f"{row['head'] * 1000:.2f}ms" if row["head"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else ""
+        click.secho(
+            f"{row['name']:<{width}}  {base_ms:>12}  {head_ms:>12}  {change:>8}  {row['status']}",
+            fg=colors.get(row["status"]),
+        )
+    if fail and any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
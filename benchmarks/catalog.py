@@ -0,0 +1,107 @@
+"""
+Synthetic catalog generation
+
+Documents are built with the existing factories and inserted by batches:
+save signals and slug allocation are skipped so large catalogs are generated quickly.
+Generation is seeded so the same sizes produce the same catalog between commits.
+"""
+
+import logging
+import random
+from dataclasses import asdict, dataclass
+
+import factory.random
+from bson import ObjectId
+
+from udata import models
+from udata.core.dataset.factories import DatasetFactory
+from udata.core.organization.factories import OrganizationFactory
+from udata.core.reuse.factories import ReuseFactory
+from udata.core.spatial.factories import GeoLevelFactory, GeoZoneFactory
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+SEED = 42
+
+
+@dataclass
+class CatalogSize:
+    datasets: int = 1000
+    resources: int = 10  # by dataset
+    organizations: int = 100
+    reuses: int = 200
+    geozones: int = 100
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def insert(model, build, count, batch_size=BATCH_SIZE) -> list[ObjectId]:
+    """Insert `count` documents built by `build(index)`, returning their ids"""
+    ids = []
+    batch = []
+    for index in range(count):
+        doc = build(index)
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            ids.extend(model.objects.insert(batch, load_bulk=False))
+            batch = []
+    if batch:
+        ids.extend(model.objects.insert(batch, load_bulk=False))
+    log.info(f"Inserted {count} {model.__name__.lower()}(s)")
+    return ids
+
+
+def generate(size: CatalogSize, seed: int = SEED):
+    """Generate a catalog of the given size in the current database"""
+    factory.random.reseed_random(seed)
+    rand = random.Random(seed)
+
+    level = GeoLevelFactory(id="benchmark", name="Benchmark")
+    zones = [
+        models.GeoZone(id=zone)
+        for zone in insert(
+            models.GeoZone,
+            lambda i: GeoZoneFactory.build(
+                id=f"benchmark:{i:05d}", code=f"{i:05d}", slug=f"zone-{i}", level=level.id
+            ),
+            size.geozones,
+        )
+    ]
+    organizations = [
+        models.Organization(id=org)
+        for org in insert(
+            models.Organization,
+            lambda i: OrganizationFactory.build(id=ObjectId(), slug=f"organization-{i}"),
+            size.organizations,
+        )
+    ]
+
+    def build_dataset(index):
+        dataset = DatasetFactory.build(
+            id=ObjectId(), slug=f"dataset-{index}", nb_resources=size.resources
+        )
+        if organizations:
+            dataset.organization = rand.choice(organizations)
+        if zones:
+            dataset.spatial = models.SpatialCoverage(zones=[rand.choice(zones)])
+        return dataset
+
+    datasets = [
+        models.Dataset(id=dataset)
+        for dataset in insert(models.Dataset, build_dataset, size.datasets)
+    ]
+
+    def build_reuse(index):
+        reuse = ReuseFactory.build(
+            id=ObjectId(),
+            slug=f"reuse-{index}",
+            datasets=rand.sample(datasets, min(3, len(datasets))),
+        )
+        if organizations:
+            reuse.organization = rand.choice(organizations)
+        reuse.clean()  # Computes the unique URL hash
+        return reuse
+
+    insert(models.Reuse, build_reuse, size.reuses)
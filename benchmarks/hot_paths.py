@@ -0,0 +1,196 @@
+"""
+Hot paths benchmarks
+
+Each benchmark runs within an application request context on the generated catalog.
+`SAMPLE` is the number of datasets handled by the per-dataset benchmarks.
+"""
+
+from os.path import join
+from unittest import mock
+
+from flask import current_app
+from flask_restx import marshal
+from rdflib import Graph
+from rdflib.namespace import RDF
+
+from udata.api.encoding import dumps, flask_dumps
+from udata.app import ROOT_DIR
+from udata.core.csv import yield_rows
+from udata.core.dataset.api_fields import dataset_page_fields
+from udata.core.dataset.csv import DatasetCsvAdapter, ResourcesCsvAdapter
+from udata.core.dataset.rdf import dataset_from_rdf
+from udata.core.dataset.search import DatasetSearch
+from udata.core.site.models import current_site
+from udata.core.site.rdf import build_catalog
+from udata.models import Dataset
+from udata.rdf import DCAT, graph_response
+from udata.search.query import SearchQuery
+
+from .runner import benchmark
+
+SAMPLE = 1000
+PAGE_SIZE = 20
+API_PAGES = 5
+DCAT_FIXTURE = join(ROOT_DIR, "harvest", "tests", "dcat", "udata.xml")
+SAVES = 100
+
+
+def sample(size=None):
+    return list(Dataset.objects.order_by("id").limit(size or SAMPLE))
+
+
+@benchmark("search.serialize")
+def search_serialize():
+    """DatasetSearch.serialize() of the sample datasets (as indexed)"""
+    datasets = sample()
+    yield lambda: [DatasetSearch.serialize(dataset) for dataset in datasets], len(datasets)
+
+
+def search_page(lean):
+    """Query the search API page with a stubbed search service returning the first datasets"""
+    page = sample(PAGE_SIZE)
+    data = {
+        "ids": [str(dataset.id) for dataset in page],
+        "total": Dataset.objects.count(),
+        "facets": {},
+        "sources": [DatasetSearch.lean_source_from_document(dataset) for dataset in page],
+    }
+    url = f"/api/2/datasets/search/?page_size={PAGE_SIZE}&lean={str(lean).lower()}"
+    client = current_app.test_client()
+
+    def query():
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+
+    with (
+        mock.patch.dict(current_app.config, {"ELASTICSEARCH_URL": "http://search.benchmark"}),
+        mock.patch.object(SearchQuery, "search_elastic", lambda self: data),
+    ):
+        yield query, len(page)
+
+
+@benchmark("search.full")
+def search_full():
+    """Search API page with datasets loaded from MongoDB"""
+    yield from search_page(lean=False)
+
+
+@benchmark("search.lean")
+def search_lean():
+    """Search API page served from the search index sources (`lean=true`)"""
+    yield from search_page(lean=True)
+
+
+@benchmark("csv.datasets")
+def csv_datasets():
+    """csv.yield_rows() of the sample datasets"""
+    queryset = Dataset.objects.order_by("id").limit(SAMPLE)
+    yield lambda: list(yield_rows(DatasetCsvAdapter(queryset))), queryset.count(True)
+
+
+@benchmark("csv.resources")
+def csv_resources():
+    """csv.yield_rows() of the sample datasets resources"""
+    queryset = Dataset.objects.order_by("id").limit(SAMPLE)
+    yield lambda: list(yield_rows(ResourcesCsvAdapter(queryset))), queryset.count(True)
+
+
+def rdf_catalog(_format):
+    """build_catalog() and graph_response() of a catalog page"""
+    queryset = Dataset.objects.visible().order_by("id")
+
+    def build():
+        datasets = queryset.paginate(1, SAMPLE)
+        catalog = build_catalog(current_site, datasets, _format=_format, page_size=SAMPLE)
+        graph_response(catalog, _format)
+
+    yield build, min(queryset.count(), SAMPLE)
+
+
+@benchmark("rdf.catalog.xml")
+def rdf_catalog_xml():
+    """DCAT catalog page as RDF/XML"""
+    yield from rdf_catalog("xml")
+
+
+@benchmark("rdf.catalog.json-ld")
+def rdf_catalog_jsonld():
+    """DCAT catalog page as JSON-LD"""
+    yield from rdf_catalog("json-ld")
+
+
+@benchmark("rdf.dataset_from_rdf")
+def rdf_dataset_from_rdf():
+    """dataset_from_rdf() on the datasets of a harvest fixture DCAT page"""
+    graph = Graph().parse(DCAT_FIXTURE, format="xml")
+    nodes = list(graph.subjects(RDF.type, DCAT.Dataset))
+
+    def parse():
+        for node in nodes:
+            dataset_from_rdf(graph, Dataset(), node=node, dryrun=True)
+
+    yield parse, len(nodes)
+
+
+@benchmark("api.datasets")
+def api_datasets():
+    """/api/1/datasets/ paging"""
+    client = current_app.test_client()
+    pages = max(min(API_PAGES, Dataset.objects.count() // PAGE_SIZE), 1)
+
+    def browse():
+        for page in range(1, pages + 1):
+            response = client.get(f"/api/1/datasets/?page={page}&page_size={PAGE_SIZE}")
+            assert response.status_code == 200, response.text
+
+    yield browse, pages
+
+
+def encoding(dumps):
+    """JSON encoding of a marshalled page of the sample datasets"""
+    with current_app.test_request_context("/api/1/datasets/"):
+        data = marshal(Dataset.objects.order_by("id").paginate(1, SAMPLE), dataset_page_fields)
+    yield lambda: dumps(data), len(data["data"])
+
+
+@benchmark("api.encoding.flask")
+def encoding_flask():
+    """Datasets page encoded by the Flask JSON provider"""
+    yield from encoding(flask_dumps)
+
+
+@benchmark("api.encoding.fast")
+def encoding_fast():
+    """Datasets page encoded by the API encoder (`orjson` if installed)"""
+    yield from encoding(dumps)
+
+
+def saves(auto_create_index_on_save):
+    """Save throughput of new datasets"""
+    meta = Dataset._meta
+    previous = meta.get("auto_create_index_on_save", False)
+    meta["auto_create_index_on_save"] = auto_create_index_on_save
+    created = []
+
+    def save():
+        for _ in range(SAVES):
+            dataset = Dataset(title=f"Benchmark {len(created)}", description="Benchmark")
+            created.append(dataset.save())
+
+    try:
+        yield save, SAVES
+    finally:
+        meta["auto_create_index_on_save"] = previous
+        Dataset.objects(id__in=[dataset.id for dataset in created]).delete()
+
+
+@benchmark("db.save")
+def db_save():
+    """Dataset saves without indexes creation"""
+    yield from saves(False)
+
+
+@benchmark("db.save.auto_index")
+def db_save_auto_index():
+    """Dataset saves creating indexes on each save (`auto_create_index_on_save`)"""
+    yield from saves(True)
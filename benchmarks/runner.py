@@ -0,0 +1,92 @@
+"""
+Benchmarks registry, timing and results comparison
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+BENCHMARKS: dict[str, "Benchmark"] = {}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    description: str
+    #: A context manager yielding the timed callable and the number of items it processes
+    setup: Callable
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark setup.
+
+    The decorated generator prepares the data, yields the timed callable
+    and the number of items it handles, and cleans up after the measures.
+    """
+
+    def wrapper(func):
+        description = (func.__doc__ or "").strip().splitlines()[0] if func.__doc__ else ""
+        BENCHMARKS[name] = Benchmark(name, description, contextmanager(func))
+        return func
+
+    return wrapper
+
+
+def select(patterns=None) -> list[Benchmark]:
+    """Benchmarks matching any of the name prefixes (all of them by default)"""
+    return [
+        bench
+        for name, bench in BENCHMARKS.items()
+        if not patterns or any(name.startswith(pattern) for pattern in patterns)
+    ]
+
+
+def measure(bench: Benchmark, repeat: int, warmup: int = 1) -> dict:
+    """Time the benchmark callable `repeat` times after `warmup` untimed calls"""
+    with bench.setup() as (func, items):
+        for _ in range(warmup):
+            func()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "description": bench.description,
+        "items": items,
+        "timings": timings,
+        "min": min(timings),
+        "median": median,
+        "mean": statistics.mean(timings),
+        "per_item": median / items if items else None,
+    }
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[dict]:
+    """
+    Compare the medians of two results files.
+
+    A change is flagged as a regression (or an improvement) when the median
+    changes by more than `threshold` (a ratio).
+    """
+    rows = []
+    for name in sorted(set(base["results"]) | set(head["results"])):
+        before = base["results"].get(name)
+        after = head["results"].get(name)
+        row = {"name": name, "base": None, "head": None, "change": None, "status": ""}
+        if before:
+            row["base"] = before["median"]
+        if after:
+            row["head"] = after["median"]
+        if before and after:
+            row["change"] = after["median"] / before["median"] - 1
+            if row["change"] > threshold:
+                row["status"] = "regression"
+            elif row["change"] < -threshold:
+                row["status"] = "improvement"
+        rows.append(row)
+    return rows
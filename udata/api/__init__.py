@@ -1,19 +1,21 @@
 import logging
 import urllib.parse
 from functools import wraps
+from itertools import islice
 
 import mongoengine
 from flask import (
     Blueprint,
+    Response,
     current_app,
     g,
-    json,
     make_response,
     redirect,
     request,
+    stream_with_context,
     url_for,
 )
-from flask_restx import Api, Resource
+from flask_restx import Api, Resource, marshal
 from flask_restx.reqparse import RequestParser
 from flask_storage import UnauthorizedFileType
 
@@ -21,9 +23,11 @@ from udata import tracking
 from udata.app import csrf
 from udata.auth import Permission, PermissionDenied, RoleNeed, current_user, login_user
 from udata.i18n import get_locale
+from udata.mongo.prefetch import model_reference_paths, prefetch
 from udata.utils import safe_unicode
 
 from . import fields
+from .encoding import describe_encoder, get_encoder
 from .signals import on_api_call
 
 log = logging.getLogger(__name__)
@@ -33,6 +37,8 @@ apiv2_blueprint = Blueprint("apiv2", __name__, url_prefix="/api/2")
 
 DEFAULT_PAGE_SIZE = 50
 HEADER_API_KEY = "X-API-KEY"
+#: Number of items fetched and marshalled at once by `marshal_stream()`
+STREAM_CHUNK_SIZE = 100
 
 
 class UDataApi(Api):
@@ -133,6 +139,31 @@ class UDataApi(Api):
             self.abort(400, errors=form.errors)
         return form
 
+    def marshal_stream(self, items, model):
+        """
+        A JSON list response of `items` marshalled with `model`, written incrementally.
+
+        Items are fetched, dereferenced in bulk and marshalled by chunks
+        so the whole list is never held in memory.
+        The fields mask header is honored as with `marshal_list_with`.
+        """
+        mask = request.headers.get(current_app.config["RESTX_MASK_HEADER"])
+        dumps = get_encoder()
+        items = iter(items)
+
+        def generate():
+            yield b"["
+            separator = b""
+            while chunk := list(islice(items, STREAM_CHUNK_SIZE)):
+                if isinstance(chunk[0], mongoengine.Document):
+                    prefetch(chunk, *model_reference_paths(chunk[0].__class__, model))
+                for data in marshal(chunk, model, mask=mask):
+                    yield separator + dumps(data)
+                    separator = b","
+            yield b"]"
+
+        return Response(stream_with_context(generate()), mimetype="application/json")
+
     def render_ui(self):
         return redirect(current_app.config["API_DOC_EXTERNAL_LINK"])
 
@@ -185,8 +216,8 @@ api.model_reference = api.model(
 
 @api.representation("application/json")
 def output_json(data, code, headers=None):
-    """Use Flask JSON to serialize"""
-    resp = make_response(json.dumps(data), code)
+    """Serialize with the configured `API_JSON_ENCODER`"""
+    resp = make_response(get_encoder()(data), code)
     resp.headers.extend(headers or {})
     return resp
 
@@ -336,7 +367,19 @@ def marshal_page_with(func):
     pass
 
 
-def init_app(app):
+def init_app(app, lazy=False):
+    """
+    Load and register the APIs.
+
+    With `lazy`, loading is deferred until an API URL is first built
+    (ex: CLI commands and workers which seldom need the API resources and their models).
+    """
+    if "api" in app.blueprints:
+        return
+    if lazy:
+        app.url_build_error_handlers.append(load_on_url_build)
+        return
+
     # Load all core APIs
     import udata.core.access_type.api  # noqa
     import udata.core.activity.api  # noqa
@@ -368,6 +411,8 @@ def init_app(app):
     import udata.core.avatars.api  # noqa
     import udata.harvest.api  # noqa
 
+    log.info("API responses serialized with %s", describe_encoder(app))
+
     # api.init_app(app)
     app.register_blueprint(apiv1_blueprint)
     app.register_blueprint(apiv2_blueprint)
@@ -375,3 +420,16 @@ def init_app(app):
     from udata.api.oauth2 import init_app as oauth2_init_app
 
     oauth2_init_app(app)
+
+    from udata.api import metrics
+
+    metrics.init_app(app)
+
+
+def load_on_url_build(error, endpoint, values):
+    """Load the lazily registered APIs when building one of their URLs"""
+    app = current_app._get_current_object()
+    if "api" in app.blueprints or endpoint.split(".")[0] not in ("api", "apiv2", "oauth"):
+        return None
+    init_app(app)
+    return url_for(endpoint, **values)
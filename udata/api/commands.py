@@ -6,7 +6,7 @@ from flask import current_app, json
 from flask_restx import schemas
 from werkzeug.security import gen_salt
 
-from udata.api import api
+from udata.api import api, init_app
 from udata.api.oauth2 import OAuth2Client
 from udata.commands import cli, exit_with_error, success
 from udata.models import User
@@ -35,6 +35,7 @@ def json_to_file(data, filename, pretty=False):
 @click.option("-p", "--pretty", is_flag=True, help="Pretty print")
 def swagger(filename, pretty):
     """Dump the swagger specifications"""
+    init_app(current_app)
     json_to_file(api.__schema__, filename, pretty)
 
 
@@ -45,6 +46,7 @@ def swagger(filename, pretty):
 @click.option("-s", "--swagger", is_flag=True, help="Export Swagger specifications")
 def postman(filename, pretty, urlvars, swagger):
     """Dump the API as a Postman collection"""
+    init_app(current_app)
     data = api.as_postman(urlvars=urlvars, swagger=swagger)
     json_to_file(data, filename, pretty)
 
@@ -52,6 +54,7 @@ def postman(filename, pretty, urlvars, swagger):
 @grp.command()
 def validate():
     """Validate the Swagger/OpenAPI specification with your config"""
+    init_app(current_app)
     with current_app.test_request_context():
         schema = json.loads(json.dumps(api.__schema__))
     try:
@@ -0,0 +1,79 @@
+"""
+Fast JSON encoding of API responses.
+
+`dumps()` serializes with `orjson` (a udata dependency): it natively encodes
+builtin types, `UUID` and dataclasses straight to bytes, and `default()` converts
+`ObjectId`, `datetime`, `Decimal`, lazy strings and documents without going through
+the Flask JSON provider. Other types fall back on `UdataJsonProvider.default()`
+and data `orjson` can't encode (ex: integers over 64 bits) on the Flask JSON provider,
+so responses are the same as with `flask.json.dumps()` apart from whitespaces and escaping.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from bson import ObjectId
+from flask import current_app, json
+from flask_babel.speaklater import LazyString
+from werkzeug.utils import import_string
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+DEFAULT_ENCODER = "udata.api.encoding.dumps"
+
+OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson
+    else 0
+)
+
+
+def default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, (Decimal, LazyString)):
+        return str(obj)
+    return current_app.json.default(obj)
+
+
+def flask_dumps(data) -> bytes:
+    """Serialize with the Flask JSON provider"""
+    return json.dumps(data).encode("utf-8")
+
+
+def dumps(data) -> bytes:
+    """Serialize with `orjson`, falling back on the Flask JSON provider"""
+    if orjson is None:
+        return flask_dumps(data)
+    try:
+        return orjson.dumps(data, default=default, option=OPTIONS)
+    except orjson.JSONEncodeError:
+        return flask_dumps(data)
+
+
+_encoders = {}
+
+
+def get_encoder():
+    """The `API_JSON_ENCODER` function (the Flask JSON provider if not set)"""
+    path = current_app.config["API_JSON_ENCODER"]
+    if not path:
+        return flask_dumps
+    if path not in _encoders:
+        _encoders[path] = import_string(path)
+    return _encoders[path]
+
+
+def describe_encoder(app) -> str:
+    """A human readable description of the active `API_JSON_ENCODER`"""
+    path = app.config["API_JSON_ENCODER"]
+    if not path:
+        return "Flask JSON provider"
+    elif path == DEFAULT_ENCODER:
+        return "orjson" if orjson else "Flask JSON provider (orjson is not installed)"
+    return path
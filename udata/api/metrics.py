@@ -0,0 +1,80 @@
+"""
+Requests metrics
+
+Each request is counted by endpoint, method and status, its duration and its response size
+are observed in histograms and the requests being processed are gauged.
+Values are kept in memory or, with `REQUESTS_METRICS_DIR`, in memory-mapped files of this
+directory (one by process) so the `/metrics` endpoint aggregates the values of all the
+gunicorn workers. The endpoint is only served with the `REQUESTS_METRICS_TOKEN` bearer token.
+"""
+
+import hmac
+import time
+
+from flask import Response, abort, current_app, g, request
+
+from udata import prometheus
+
+REQUESTS = "udata_http_requests_total"
+DURATION = "udata_http_request_duration_seconds"
+SIZE = "udata_http_response_size_bytes"
+IN_FLIGHT = "udata_http_requests_in_flight"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def create_registry(directory=None) -> prometheus.Registry:
+    registry = prometheus.Registry(directory)
+    registry.counter(REQUESTS, "Handled requests")
+    registry.histogram(
+        DURATION, "Requests duration (until the response is streamed)", DURATION_BUCKETS
+    )
+    registry.histogram(SIZE, "Responses size (when known)", SIZE_BUCKETS)
+    registry.gauge(IN_FLIGHT, "Requests being processed")
+    return registry
+
+
+def before_request():
+    current_app.extensions["requests_metrics"].inc(IN_FLIGHT)
+    g.metrics_start = time.perf_counter()
+
+
+def after_request(response):
+    start = g.get("metrics_start")
+    if start is not None:
+        registry = current_app.extensions["requests_metrics"]
+        # Unrouted requests are not labelled by path to bound the labels cardinality
+        labels = {"endpoint": request.endpoint or "none", "method": request.method}
+        registry.inc(REQUESTS, {**labels, "status": str(response.status_code)})
+        registry.observe(DURATION, time.perf_counter() - start, labels)
+        size = response.calculate_content_length()
+        if size is not None:
+            registry.observe(SIZE, size, labels)
+    return response
+
+
+def teardown_request(error=None):
+    if g.pop("metrics_start", None) is not None:
+        current_app.extensions["requests_metrics"].inc(IN_FLIGHT, amount=-1)
+
+
+def metrics():
+    token = current_app.config["REQUESTS_METRICS_TOKEN"]
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        abort(401)
+    return Response(
+        current_app.extensions["requests_metrics"].render(), content_type=prometheus.CONTENT_TYPE
+    )
+
+
+def init_app(app):
+    if not app.config["REQUESTS_METRICS"]:
+        return
+    app.extensions["requests_metrics"] = create_registry(app.config["REQUESTS_METRICS_DIR"])
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics)
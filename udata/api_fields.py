@@ -658,7 +658,9 @@ def generate_fields(**kwargs) -> Callable:
             args = cls.__index_parser__.parse_args()
 
             if paginable:
-                base_query = base_query.paginate(args["page"], args["page_size"])
+                base_query = base_query.prefetch_for(cls.__read_fields__).paginate(
+                    args["page"], args["page_size"]
+                )
             return base_query
 
         cls.apply_sort_filters = apply_sort_filters
@@ -180,14 +180,18 @@ def create_app(config="udata.settings.Defaults", override=None, init_logging=ini
     return app
 
 
-def standalone(app):
-    """Factory for an all in one application"""
+def standalone(app, lazy_api=False):
+    """
+    Factory for an all in one application
+
+    With `lazy_api`, the APIs are only loaded when needed (see `udata.api.init_app`).
+    """
     from udata import api, core, frontend
     from udata.features import notifications
 
     core.init_app(app)
     frontend.init_app(app)
-    api.init_app(app)
+    api.init_app(app, lazy=lazy_api)
     notifications.init_app(app)
 
     eps = entry_points(group="udata.plugins")
@@ -209,6 +213,7 @@ def register_extensions(app):
         mail,
         mongo,
         notifications,  # noqa
+        profiling,
         routing,
         search,
         sentry,
@@ -227,6 +232,7 @@ def register_extensions(app):
     mail.init_app(app)
     search.init_app(app)
     sentry.init_app(app)
+    profiling.init_app(app)
     proconnect.init_app(app)
 
     app.after_request(return_404_html_if_requested)
@@ -166,21 +166,44 @@ def create_cli_app():
     else:
         settings = DEFAULT_INFO_SETTINGS
     app = create_app(settings, init_logging=init_logging)
-    return standalone(app)
+    return standalone(app, lazy_api=True)
+
+
+#: Modules registering the udata commands, by command name.
+#: Only the module of the invoked command is imported.
+COMMANDS = {
+    "api": "udata.api.commands",
+    "badges": "udata.core.badges.commands",
+    "cache": "udata.commands.cache",
+    "dataset": "udata.core.dataset.commands",
+    "db": "udata.commands.db",
+    "dcat": "udata.commands.dcat",
+    "generate-fixtures-file": "udata.commands.fixtures",
+    "harvest": "udata.harvest.commands",
+    "images": "udata.commands.images",
+    "import-fixtures": "udata.commands.fixtures",
+    "info": "udata.commands.info",
+    "init": "udata.commands.init",
+    "job": "udata.core.jobs.commands",
+    "licenses": "udata.core.dataset.commands",
+    "metrics": "udata.core.metrics.commands",
+    "organizations": "udata.core.organization.commands",
+    "profiles": "udata.commands.profiles",
+    "purge": "udata.commands.purge",
+    "search": "udata.search.commands",
+    "serve": "udata.commands.serve",
+    "spatial": "udata.core.spatial.commands",
+    "test": "udata.commands.test",
+    "user": "udata.core.user.commands",
+    "worker": "udata.commands.worker",
+}
 
 
-MODULES_WITH_COMMANDS = [
-    "api",
-    "core.badges",
-    "core.dataset",
-    "core.jobs",
-    "core.metrics",
-    "core.organization",
-    "core.spatial",
-    "core.user",
-    "harvest",
-    "search",
-]
+def import_commands(module):
+    try:
+        __import__(module)
+    except Exception as e:
+        error("Unable to import {0}".format(module), e)
 
 
 class UdataGroup(FlaskGroup):
@@ -189,7 +212,10 @@ class UdataGroup(FlaskGroup):
         super(UdataGroup, self).__init__(*args, **kwargs)
 
     def get_command(self, ctx, name):
-        self.load_udata_commands(ctx)
+        if name in COMMANDS and name not in self.commands:
+            import_commands(COMMANDS[name])
+        elif name not in self.commands:
+            self.load_udata_commands(ctx)
         return super(UdataGroup, self).get_command(ctx, name)
 
     def list_commands(self, ctx):
@@ -198,7 +224,7 @@ class UdataGroup(FlaskGroup):
 
     def load_udata_commands(self, ctx):
         """
-        Load udata commands from:
+        Load all udata commands from:
         - `udata.commands.*` module
         - known internal modules with commands
         """
@@ -207,22 +233,17 @@ class UdataGroup(FlaskGroup):
 
         # Load all commands submodules
         pattern = os.path.join(os.path.dirname(__file__), "[!_]*.py")
-        for filename in iglob(pattern):
-            module = os.path.splitext(os.path.basename(filename))[0]
-            try:
-                __import__("udata.commands.{0}".format(module))
-            except Exception as e:
-                error("Unable to import {0}".format(module), e)
-
+        modules = [
+            "udata.commands.{0}".format(os.path.splitext(os.path.basename(filename))[0])
+            for filename in iglob(pattern)
+        ]
         # Load all core modules commands
-        for module in MODULES_WITH_COMMANDS:
-            try:
-                __import__("udata.{0}.commands".format(module))
-            except Exception as e:
-                error("Unable to import {0}".format(module), e)
+        modules += [module for module in COMMANDS.values() if module not in modules]
+        for module in modules:
+            import_commands(module)
 
         # Ensure loading happens once
-        self._udata_commands_loaded = False
+        self._udata_commands_loaded = True
 
     def main(self, *args, **kwargs):
         """
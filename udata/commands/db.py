@@ -13,7 +13,9 @@ from bson import DBRef
 
 from udata.commands import cli, cyan, echo, green, magenta, red, white, yellow
 from udata.core.dataset.models import Dataset, Resource
+from udata.db import indexes as db_indexes
 from udata.db import migrations
+from udata.mongo import slug_fields
 from udata.mongo.document import get_all_models
 
 # Date format used to for display
@@ -39,6 +41,8 @@ def status_label(record):
         return green(record.last_date.strftime(DATE_FORMAT))
     elif not record.exists():
         return yellow("Not applied")
+    elif record.checkpoints:
+        return yellow("Interrupted")
     else:
         return red(record.status)
 
@@ -73,7 +77,12 @@ def migrate(record, dry_run=False):
         if migration.record.ok or not success:
             log_status(migration, cyan("Skipped"))
         else:
-            status = magenta("Recorded") if record else yellow("Apply")
+            if record:
+                status = magenta("Recorded")
+            elif migration.record.checkpoints and not dry_run:
+                status = yellow("Resume")
+            else:
+                status = yellow("Apply")
             log_status(migration, status)
             try:
                 output = migration.execute(recordonly=record, dryrun=dry_run)
@@ -542,3 +551,80 @@ def check_duplicate_resources_ids(
 
     print(f"Resources with duplicated IDs: {count_resources}")
     print(f"Datasets concerned {count_datasets}")
+
+
+@grp.group("indexes")
+def indexes():
+    """Manage the indexes declared by models"""
+    pass
+
+
+def format_index(fields, options=None):
+    keys = ", ".join(f"{name}: {kind}" for name, kind in fields)
+    flags = [key for key, value in (options or {}).items() if key != "fields" and value is True]
+    return "{{{0}}}{1}".format(keys, " ({0})".format(", ".join(flags)) if flags else "")
+
+
+model_option = click.option(
+    "-m", "--model", "models", multiple=True, help="Only this model(s) (ex: Dataset)"
+)
+
+
+@indexes.command()
+@model_option
+def plan(models):
+    """Display the missing indexes that apply would build"""
+    count = 0
+    for model in db_indexes.collection_models(models):
+        for spec in db_indexes.diff(model).missing:
+            echo(
+                "{0}: {1}".format(
+                    cyan(model._get_collection_name()), format_index(spec["fields"], spec)
+                )
+            )
+            count += 1
+    echo(green("{0} index(es) to build".format(count)) if count else green("Nothing to build"))
+
+
+@indexes.command()
+@model_option
+def diff(models):
+    """Compare the declared indexes with the live ones"""
+    for model in db_indexes.collection_models(models):
+        result = db_indexes.diff(model)
+        if not (result.missing or result.extra or result.unused):
+            echo("{:.<70} [{}]".format(result.collection + " ", green("OK")))
+            continue
+        echo("{:.<70} [{}]".format(result.collection + " ", yellow("Diff")))
+        for spec in result.missing:
+            echo("  " + green("+ {0}".format(format_index(spec["fields"], spec))))
+        for name, fields in result.extra.items():
+            echo("  " + red("- {0} {1}".format(name, format_index(fields))))
+        for name in result.unused:
+            echo("  " + yellow("? {0} is unused".format(name)))
+
+
+@indexes.command()
+@model_option
+def apply(models):
+    """Build missing indexes in the background"""
+    for model in db_indexes.collection_models(models):
+        missing = db_indexes.diff(model).missing
+        if missing:
+            for name in db_indexes.build(model, missing):
+                echo("{0}: built {1}".format(cyan(model._get_collection_name()), name))
+    echo(green("Indexes are up to date"))
+
+
+@grp.command()
+@model_option
+def backfill_slug_counters(models):
+    """Initialize the slug counters from the existing slugs"""
+    for model in db_indexes.collection_models(models):
+        if not any(
+            isinstance(f, slug_fields.SlugField) and f.unique for f in model._fields.values()
+        ):
+            continue
+        count = slug_fields.backfill_slug_counters(model)
+        echo("{0}: {1} counter(s)".format(cyan(model._get_collection_name()), count))
+    echo(green("Slug counters are initialized"))
@@ -1,17 +1,63 @@
 import logging
+import subprocess
+import sys
 
+import click
 from click import echo
 from flask import current_app
 
-from udata.commands import KO, OK, cli, green, red, white
+from udata.commands import KO, OK, cli, exit_with_error, green, red, white
 
 log = logging.getLogger(__name__)
 
+#: Imports of a full application (as served by `udata.wsgi`)
+IMPORT_PROFILE_TARGET = "udata.wsgi"
 
-@cli.group("info")
-def grp():
+
+@cli.group("info", invoke_without_command=True)
+@click.option(
+    "--import-profile",
+    is_flag=True,
+    help="Display the modules with the highest import time of a full application",
+)
+@click.option("-l", "--limit", default=30, help="Number of modules displayed by the import profile")
+@click.pass_context
+def grp(ctx, import_profile, limit):
     """Display some details about the local environment"""
-    pass
+    if import_profile:
+        display_import_profile(limit)
+    elif ctx.invoked_subcommand is None:
+        echo(ctx.get_help())
+
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` output into `(module, self, cumulative)` tuples
+    (times in microseconds), in import order.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:") :].split("|")
+        imports.append((module.strip(), int(own), int(cumulative)))
+    return imports
+
+
+def display_import_profile(limit):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {IMPORT_PROFILE_TARGET}"],
+        capture_output=True,
+        text=True,
+    )
+    imports = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        exit_with_error("Unable to import the application", result.stderr.splitlines()[-1])
+    total = sum(own for _, own, _ in imports)
+    echo(white(f"Import time of {IMPORT_PROFILE_TARGET}: {total / 1e6:.2f}s"))
+    echo("{0:>12} {1:>12}  {2}".format("self (ms)", "cumul. (ms)", "module"))
+    for module, own, cumulative in sorted(imports, key=lambda i: i[2], reverse=True)[:limit]:
+        echo("{0:>12.1f} {1:>12.1f}  {2}".format(own / 1e3, cumulative / 1e3, module))
 
 
 def by_name(e):
@@ -0,0 +1,46 @@
+import logging
+import os
+
+import click
+
+from udata.commands import cli, echo, exit_with_error, success, white
+from udata.core.storages import profiles
+
+log = logging.getLogger(__name__)
+
+
+@cli.group("profiles")
+def grp():
+    """Captured requests and tasks profiles"""
+    pass
+
+
+@grp.command("list")
+@click.argument("name", required=False)
+def list_profiles(name):
+    """
+    List the captured profiles, optionally only those of an endpoint or a task.
+    """
+    found = False
+    for filename in sorted(profiles.list_files()):
+        kind, profile_name, _ = filename.split("/", 2)
+        if name and profile_name != name:
+            continue
+        found = True
+        echo(f"{white(profile_name)} ({kind[:-1]}): {filename}")
+    if not found:
+        echo("No profile captured")
+
+
+@grp.command()
+@click.argument("filename")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Output file")
+def download(filename, output):
+    """Download a captured profile"""
+    if filename not in profiles:
+        exit_with_error(f"Unknown profile {filename}")
+    output = output or os.path.basename(filename)
+    content = profiles.read(filename)
+    with open(output, "wb") as f:
+        f.write(content if isinstance(content, bytes) else content.encode())
+    success(f"Profile downloaded to {output}")
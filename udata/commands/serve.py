@@ -6,6 +6,7 @@ from flask import current_app
 from flask.cli import pass_script_info
 from werkzeug.serving import run_simple
 
+from udata import api
 from udata.commands import cli
 
 log = logging.getLogger(__name__)
@@ -58,6 +59,8 @@ def serve(info, host, port, reload, debugger, with_threads):
         debugger = bool(debug)
 
     app = info.load_app()
+    # The CLI application loads the APIs lazily, the server needs them up front
+    api.init_app(app)
 
     settings = os.environ.get("UDATA_SETTINGS", os.path.join(os.getcwd(), "udata.cfg"))
     extra_files = [settings]
@@ -1,14 +1,26 @@
 import json
 import logging
+import time
 from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
 from urllib.parse import urlparse
 
 import click
 import redis
 from flask import current_app
 
+from udata import prometheus
 from udata.commands import cli, exit_with_error
-from udata.tasks import celery, router
+from udata.tasks import (
+    SENT_AT_HEADER,
+    celery,
+    payload_stats,
+    reset_payload_stats,
+    reset_task_metrics,
+    router,
+    task_metrics,
+)
 
 log = logging.getLogger(__name__)
 
@@ -20,13 +32,102 @@ def grp():
 
 
 @grp.command()
-def start():
+@click.option(
+    "--metrics-port", type=int, help="Expose the tasks metrics for Prometheus on this port"
+)
+@click.option(
+    "--metrics-host",
+    default="127.0.0.1",
+    show_default=True,
+    help="Interface the tasks metrics are exposed on (0.0.0.0 for all)",
+)
+def start(metrics_port, metrics_host):
     """Start a worker"""
+    if metrics_port:
+        serve_metrics(metrics_port, metrics_host)
     worker = celery.Worker()
     worker.start()
     return worker.exitcode
 
 
+def metrics_exposition():
+    """The tasks metrics and the queues lengths in the Prometheus text format"""
+    queues = get_tasks()
+    metrics = task_metrics(list(queues))
+    counters = [
+        ("runs", "udata_task_runs_total", "Executed tasks"),
+        ("failures", "udata_task_failures_total", "Failed tasks"),
+        ("retries", "udata_task_retries_total", "Retried tasks"),
+    ]
+    exposition = [
+        prometheus.metric(
+            metric,
+            "counter",
+            help,
+            [
+                ("", {"task": name, "queue": queues[name]}, task[key])
+                for name, task in metrics.items()
+            ],
+        )
+        for key, metric, help in counters
+    ]
+    histograms = [
+        ("wait", "udata_task_wait_seconds", "Time between the tasks publication and start"),
+        ("run", "udata_task_run_seconds", "Tasks run time"),
+    ]
+    for key, metric, help in histograms:
+        samples = []
+        for name, task in metrics.items():
+            if task[key]["count"]:
+                labels = {"task": name, "queue": queues[name]}
+                samples += prometheus.histogram_samples(
+                    labels, task[key]["histogram"], task[key]["sum"]
+                )
+        exposition.append(prometheus.metric(metric, "histogram", help, samples))
+    try:
+        r = get_redis_connection()
+        lengths = [("", {"queue": queue}, r.llen(queue)) for queue in get_queues(None)]
+    except redis.RedisError as e:
+        log.warning(f"Unable to read the queues lengths: {e}")
+    else:
+        exposition.append(
+            prometheus.metric("udata_queue_length", "gauge", "Waiting tasks", lengths)
+        )
+    return prometheus.render(exposition)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    app = None
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/metrics":
+            self.send_error(404)
+            return
+        with self.app.app_context():
+            body = metrics_exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", prometheus.CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """
+    Serve the tasks metrics on `/metrics` from a background thread.
+
+    The endpoint is not authenticated: it only listens on the loopback interface by default.
+    """
+    handler = type("Handler", (MetricsHandler,), {"app": current_app._get_current_object()})
+    server = ThreadingHTTPServer((host, port), handler)
+    Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    log.info(f"Serving tasks metrics on {host}:{server.server_address[1]}")
+    return server
+
+
 def status_print_task(count, biggest_task_name, munin=False):
     if munin:
         # Munin expect all values, including zeros
@@ -52,16 +153,23 @@ def status_print_queue(queue, munin=False):
     if not munin:
         print("-" * 40)
     queue_length = r.llen(queue)
-    if not munin:
-        print('Queue "%s": %s task(s)' % (queue, queue_length))
     counter = Counter({n: 0 for n, q in get_tasks().items() if q == queue})
     biggest_task_name = 0
+    oldest = None
     for task in r.lrange(queue, 0, -1):
         task = json.loads(task)
         task_name = task["headers"]["task"]
         if len(task_name) > biggest_task_name:
             biggest_task_name = len(task_name)
         counter[task_name] += 1
+        sent_at = task["headers"].get(SENT_AT_HEADER)
+        if sent_at and (oldest is None or sent_at < oldest):
+            oldest = sent_at
+    if not munin:
+        waiting = (
+            ", oldest waiting for %s" % format_duration(time.time() - oldest) if oldest else ""
+        )
+        print('Queue "%s": %s task(s)%s' % (queue, queue_length, waiting))
     for count in counter.most_common():
         status_print_task(count, biggest_task_name, munin=munin)
 
@@ -132,3 +240,91 @@ def status(queue, munin, munin_config):
         status_print_queue(queue, munin=munin)
     if not munin:
         print("-" * 40)
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return "%d%s" % (size, unit)
+        size /= 1024
+    return "%d%s" % (size, "GB")
+
+
+def format_duration(seconds):
+    if seconds < 1:
+        return "%dms" % (seconds * 1000)
+    for unit, size in (("s", 60), ("m", 60), ("h", 24)):
+        if seconds < size:
+            return "%d%s" % (seconds, unit)
+        seconds /= size
+    return "%dd" % seconds
+
+
+def format_histogram(histogram):
+    labels = []
+    previous = 0
+    for bound, count in histogram.items():
+        label = "<=%s" % format_size(bound) if bound else ">%s" % format_size(previous)
+        if count:
+            labels.append("%s: %s" % (label, count))
+        previous = bound
+    return ", ".join(labels)
+
+
+@grp.command()
+@click.option("-r", "--reset", is_flag=True, help="Reset the recorded payload sizes")
+def payloads(reset):
+    """Display the serialized arguments size of sent tasks"""
+    tasks = list(get_tasks())
+    if reset:
+        reset_payload_stats(tasks)
+        print("Payload sizes reset")
+        return
+    stats = payload_stats(tasks)
+    if not stats:
+        print("No payload size recorded (see the TASKS_PAYLOAD_STATS setting)")
+        return
+    biggest_task_name = max(len(name) for name in stats)
+    # Tasks sending the most bytes first
+    for name, task in sorted(
+        stats.items(), key=lambda i: i[1]["count"] * i[1]["mean"], reverse=True
+    ):
+        print(
+            "* %s : %s task(s), mean %s (%s)"
+            % (
+                name.ljust(biggest_task_name),
+                task["count"],
+                format_size(task["mean"]),
+                format_histogram(task["histogram"]),
+            )
+        )
+
+
+@grp.command()
+@click.option("-r", "--reset", is_flag=True, help="Reset the recorded metrics")
+def metrics(reset):
+    """Display the executed tasks wait and run times, failures and retries"""
+    tasks = list(get_tasks())
+    if reset:
+        reset_task_metrics(tasks)
+        print("Tasks metrics reset")
+        return
+    metrics = task_metrics(tasks)
+    if not metrics:
+        print("No task metrics recorded")
+        return
+    biggest_task_name = max(len(name) for name in metrics)
+    # Tasks using the most worker time first
+    for name, task in sorted(metrics.items(), key=lambda i: i[1]["run"]["sum"], reverse=True):
+        wait = task["wait"]
+        print(
+            "* %s : %s run(s), %s failure(s), %s retry(ies), mean run %s, mean wait %s"
+            % (
+                name.ljust(biggest_task_name),
+                task["runs"],
+                task["failures"],
+                task["retries"],
+                format_duration(task["run"]["sum"] / task["runs"]),
+                format_duration(wait["sum"] / wait["count"]) if wait["count"] else "-",
+            )
+        )
@@ -0,0 +1,166 @@
+"""
+Conditional requests on object detail API endpoints.
+
+Responses of decorated endpoints carry an `ETag` and a `Last-Modified` header
+computed from the document versions:
+
+- its modification timestamp (ex: `last_modified_internal`),
+- its last save or deletion (as saves don't always update the timestamp),
+- the last bulk update of its model metrics.
+
+The `ETag` also depends on the user, the locale, the fields mask, the query string (`lang`...)
+and the application secret key.
+When a client sends `If-None-Match` or `If-Modified-Since`, the URL converter
+defers loading the document (see `udata.routing.LazyDocument`). With a matching `If-None-Match`,
+only its timestamp is fetched and a `304` is returned without checking permissions
+nor marshalling: as the `ETag` is bound to the user, it only confirms a version
+this user has already been given. `If-Modified-Since` alone is not bound to the user:
+the `304` is only returned once the view has checked the document is readable.
+
+Raw queryset updates bypass signals: they should update the timestamp
+or call `touch_document()`/`touch_models()`.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from functools import wraps
+
+import mongoengine
+from flask import current_app, request
+from flask_restx.utils import unpack
+from werkzeug.datastructures import ResponseCacheControl
+from werkzeug.exceptions import NotFound
+from werkzeug.http import http_date, is_resource_modified, parse_cache_control_header
+from werkzeug.wrappers import Response
+
+from udata.app import cache
+from udata.auth import current_user
+from udata.i18n import get_locale
+
+DOCUMENT_VERSION_KEY = "conditional:{0}:{1}"
+MODEL_VERSION_KEY = "conditional:{0}"
+
+VARY = ("Authorization", "Cookie", "X-API-KEY")
+
+
+def touch_document(sender, document, **kwargs):
+    """Record a new version of a document (connected to `post_save` and `post_delete`)"""
+    key = DOCUMENT_VERSION_KEY.format(sender.__name__, document.id)
+    cache.set(key, datetime.now(UTC), timeout=0)
+
+
+def touch_models(*names: str) -> None:
+    """Record a new version of all documents of some models (ex: after bulk metrics updates)"""
+    now = datetime.now(UTC)
+    cache.set_many({MODEL_VERSION_KEY.format(name): now for name in names}, timeout=0)
+
+
+def _aware(value):
+    return value.replace(tzinfo=UTC) if value and value.tzinfo is None else value
+
+
+def last_modified(model, id, timestamp) -> datetime:
+    """The most recent version of a document"""
+    name = model.__name__
+    versions = cache.get_many(DOCUMENT_VERSION_KEY.format(name, id), MODEL_VERSION_KEY.format(name))
+    versions = [_aware(value) for value in (timestamp, *versions) if value]
+    return max(versions) if versions else datetime.fromtimestamp(0, UTC)
+
+
+def compute_etag(model, id, modified: datetime) -> str:
+    """An `ETag` for the current request of a document in its `modified` version"""
+    mask = request.headers.get(current_app.config["RESTX_MASK_HEADER"], "")
+    user = str(current_user.id) if current_user.is_authenticated else ""
+    parts = [
+        request.endpoint,
+        model.__name__,
+        str(id),
+        modified.isoformat(),
+        user,
+        current_app.config["SECRET_KEY"] or "",
+        str(get_locale()),
+        mask,
+        *(f"{key}={value}" for key, value in sorted(request.args.items(multi=True))),
+    ]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_control() -> str:
+    """The `Cache-Control` of the current endpoint, always private for authenticated users"""
+    value = current_app.config["API_CACHE_CONTROL_ENDPOINTS"].get(
+        request.endpoint, current_app.config["API_CACHE_CONTROL"]
+    )
+    directives = parse_cache_control_header(value, cls=ResponseCacheControl)
+    if current_user.is_authenticated:
+        directives.public = False
+        directives.private = True
+    return directives.to_header()
+
+
+def validator_headers(etag: str, modified: datetime) -> dict:
+    return {
+        "ETag": f'W/"{etag}"',
+        "Last-Modified": http_date(modified),
+        "Cache-Control": cache_control(),
+        "Vary": ", ".join((*VARY, current_app.config["RESTX_MASK_HEADER"])),
+    }
+
+
+def conditional(timestamp: str):
+    """
+    Handle conditional requests on an endpoint returning a single document.
+
+    `timestamp` is the name of the document field storing its modification date.
+    The document is the view argument converted by a `ModelConverter`.
+    """
+    from udata.routing import LazyDocument, resolve_view_args
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            name, value = next(
+                (name, value)
+                for name, value in kwargs.items()
+                if isinstance(value, (LazyDocument, mongoengine.Document))
+            )
+            if isinstance(value, LazyDocument):
+                model = value.model
+                field = model._fields[timestamp].db_field
+                if request.if_none_match:
+                    data = value.queryset().only(timestamp).as_pymongo().first()
+                    if data is not None:
+                        modified = last_modified(model, data["_id"], data.get(field))
+                        etag = compute_etag(model, data["_id"], modified)
+                        if request.if_none_match.contains_weak(etag):
+                            return Response(status=304, headers=validator_headers(etag, modified))
+                # Resolve the request view args too, they are used while marshalling
+                result = resolve_view_args(request.view_args)
+                if isinstance(result, NotFound):
+                    raise result
+                elif result is not None:
+                    return result
+                kwargs.update(
+                    (key, request.view_args[key])
+                    for key in kwargs.keys() & request.view_args.keys()
+                )
+                document = kwargs[name]
+            else:
+                document = value
+
+            result = func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            data, code, headers = unpack(result)
+            model = document.__class__
+            modified = last_modified(model, document.id, getattr(document, timestamp))
+            etag = compute_etag(model, document.id, modified)
+            if code == 200 and not is_resource_modified(
+                request.environ, etag, last_modified=modified
+            ):
+                return Response(status=304, headers=validator_headers(etag, modified))
+            return data, code, dict(validator_headers(etag, modified), **(headers or {}))
+
+        wrapper.__defers_documents__ = True
+        return wrapper
+
+    return decorator
@@ -10,7 +10,9 @@ from udata.api import API, api, fields
 from udata.api_fields import patch
 from udata.auth import admin_permission
 from udata.core.access_type.constants import AccessType
+from udata.core.conditional import conditional
 from udata.core.dataset.models import Dataset
+from udata.core.feeds import cached_feed
 from udata.core.followers.api import FollowAPI
 from udata.core.legal.mails import add_send_legal_notice_argument, send_legal_notice_on_deletion
 from udata.frontend.markdown import md
@@ -59,34 +61,37 @@ class DataservicesAPI(API):
 class DataservicesAtomFeedAPI(API):
     @api.doc("recent_dataservices_atom_feed")
     def get(self):
-        feed = Atom1Feed(
-            _("Latest APIs"), description=None, feed_url=request.url, link=request.url_root
-        )
-
-        dataservices = get_rss_feed_list(Dataservice.objects.visible(), "created_at")
-        for dataservice in dataservices:
-            author_name = None
-            author_uri = None
-            if dataservice.organization:
-                author_name = dataservice.organization.name
-                author_uri = dataservice.organization.url_for()
-            elif dataservice.owner:
-                author_name = dataservice.owner.fullname
-                author_uri = dataservice.owner.url_for()
-            feed.add_item(
-                dataservice.title,
-                unique_id=dataservice.url_for(_useId=True),
-                description=dataservice.description,
-                content=str(md(dataservice.description)),
-                author_name=author_name,
-                author_link=author_uri,
-                link=dataservice.url_for(),
-                updateddate=dataservice.metadata_modified_at,
-                pubdate=dataservice.created_at,
+        def render():
+            feed = Atom1Feed(
+                _("Latest APIs"),
+                description=None,
+                feed_url=url_for("api.recent_dataservices_atom_feed", _external=True),
+                link=request.url_root,
             )
-        response = make_response(feed.writeString("utf-8"))
-        response.headers["Content-Type"] = "application/atom+xml"
-        return response
+            dataservices = get_rss_feed_list(Dataservice.objects.visible(), "created_at")
+            for dataservice in dataservices:
+                author_name = None
+                author_uri = None
+                if dataservice.organization:
+                    author_name = dataservice.organization.name
+                    author_uri = dataservice.organization.url_for()
+                elif dataservice.owner:
+                    author_name = dataservice.owner.fullname
+                    author_uri = dataservice.owner.url_for()
+                feed.add_item(
+                    dataservice.title,
+                    unique_id=dataservice.url_for(_useId=True),
+                    description=dataservice.description,
+                    content=str(md(dataservice.description)),
+                    author_name=author_name,
+                    author_link=author_uri,
+                    link=dataservice.url_for(),
+                    updateddate=dataservice.metadata_modified_at,
+                    pubdate=dataservice.created_at,
+                )
+            return feed.writeString("utf-8").encode("utf-8")
+
+        return cached_feed("Dataservice", {}, render)
 
 
 dataservice_delete_parser = add_send_legal_notice_argument(api.parser())
@@ -95,6 +100,8 @@ dataservice_delete_parser = add_send_legal_notice_argument(api.parser())
 @ns.route("/<dataservice:dataservice>/", endpoint="dataservice")
 class DataserviceAPI(API):
     @api.doc("get_dataservice")
+    @api.response(304, "Not modified")
+    @conditional("metadata_modified_at")
     @api.marshal_with(Dataservice.__read_fields__)
     def get(self, dataservice):
         if not dataservice.permissions["read"].can():
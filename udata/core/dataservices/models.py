@@ -15,19 +15,21 @@ from mongoengine.fields import (
     ReferenceField,
     StringField,
 )
-from mongoengine.signals import post_save
+from mongoengine.signals import post_delete, post_save
 
 from udata.api import api, fields
 from udata.api_fields import field, generate_fields
 from udata.core.access_type.models import WithAccessType
 from udata.core.activity.models import Auditable
 from udata.core.badges.models import Badge, BadgeMixin, BadgesList
+from udata.core.conditional import touch_document
 from udata.core.constants import HVD
 from udata.core.contact_point.models import ContactPoint
 from udata.core.dataservices.constants import DATASERVICE_FORMATS
 from udata.core.dataset.api_fields import dataset_ref_fields
 from udata.core.dataset.models import Dataset
 from udata.core.discussions.models import Discussion
+from udata.core.feeds import invalidate_feeds
 from udata.core.followers.models import Follow
 from udata.core.linkable import Linkable
 from udata.core.metrics.helpers import get_stock_metrics
@@ -204,7 +206,6 @@ class Dataservice(
         ]
         + Owned.meta["indexes"],
         "queryset_class": DataserviceQuerySet,
-        "auto_create_index_on_save": True,
     }
 
     after_save = Signal()
@@ -398,3 +399,7 @@ class Dataservice(
 
 post_save.connect(Dataservice.post_save, sender=Dataservice)
 post_save.connect(SpamMixin.post_save, sender=Dataservice)
+post_save.connect(invalidate_feeds, sender=Dataservice)
+post_delete.connect(invalidate_feeds, sender=Dataservice)
+post_save.connect(touch_document, sender=Dataservice)
+post_delete.connect(touch_document, sender=Dataservice)
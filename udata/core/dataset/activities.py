@@ -76,6 +76,18 @@ def on_user_updated_resource(sender, document, **kwargs):
         )
 
 
+@Dataset.on_resources_added.connect
+def on_user_added_resources_to_dataset(sender, document, **kwargs):
+    for resource_id in kwargs["resource_ids"]:
+        on_user_added_resource_to_dataset(sender, document, resource_id=resource_id)
+
+
+@Dataset.on_resources_updated.connect
+def on_user_updated_resources(sender, document, **kwargs):
+    for resource_id in kwargs["resource_ids"]:
+        on_user_updated_resource(sender, document, resource_id=resource_id)
+
+
 @Dataset.on_resource_removed.connect
 def on_user_removed_resource_from_dataset(sender, document, **kwargs):
     if (current_user and current_user.is_authenticated) or hasattr(g, "harvest_activity_user"):
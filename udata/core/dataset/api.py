@@ -36,8 +36,10 @@ from udata.core import storages
 from udata.core.access_type.constants import AccessType
 from udata.core.badges import api as badges_api
 from udata.core.badges.models import Badge
+from udata.core.conditional import conditional
 from udata.core.dataservices.models import Dataservice
 from udata.core.dataset.models import CHECKSUM_TYPES
+from udata.core.feeds import cached_feed
 from udata.core.followers.api import FollowAPI
 from udata.core.followers.models import Follow
 from udata.core.legal.mails import add_send_legal_notice_argument, send_legal_notice_on_deletion
@@ -323,7 +325,8 @@ class DatasetListAPI(API):
         )
         datasets = dataset_parser.parse_filters(datasets, args)
         sort = args["sort"] or ("$text_score" if args["q"] else None) or DEFAULT_SORTING
-        return datasets.order_by(sort).paginate(args["page"], args["page_size"])
+        datasets = datasets.order_by(sort).prefetch_for(dataset_fields)
+        return datasets.paginate(args["page"], args["page_size"])
 
     @api.secure
     @api.doc("create_dataset", responses={400: "Validation error"})
@@ -358,13 +361,6 @@ class DatasetsAtomFeedAPI(API):
         else:
             title = _("Latest datasets")
 
-        feed = Atom1Feed(
-            title,
-            description=None,
-            feed_url=request.url,
-            link=request.url_root,
-        )
-
         # Map sort parameter to a date field for RSS ordering
         # Only date fields make sense for chronological feeds
         sort_field = DEFAULT_SORTING.lstrip("-")
@@ -373,31 +369,43 @@ class DatasetsAtomFeedAPI(API):
             if sort_value in ("last_update", "created_at_internal"):
                 sort_field = sort_value
 
-        datasets: list[Dataset] = get_rss_feed_list(queryset, sort_field)
-
-        for dataset in datasets:
-            author_name = None
-            author_uri = None
-            if dataset.organization:
-                author_name = dataset.organization.name
-                author_uri = dataset.organization.url_for()
-            elif dataset.owner:
-                author_name = dataset.owner.fullname
-                author_uri = dataset.owner.url_for()
-            feed.add_item(
-                dataset.title,
-                unique_id=dataset.url_for(_useId=True),
-                description=dataset.description,
-                content=str(md(dataset.description)),
-                author_name=author_name,
-                author_link=author_uri,
-                link=dataset.url_for(),
-                updateddate=dataset.last_modified,
-                pubdate=dataset.created_at,
+        params = {
+            key: value
+            for key, value in args.items()
+            if value not in (None, "", []) and key not in ("page", "page_size")
+        }
+
+        def render():
+            feed = Atom1Feed(
+                title,
+                description=None,
+                feed_url=url_for("api.recent_datasets_atom_feed", _external=True, **params),
+                link=request.url_root,
             )
-        response = make_response(feed.writeString("utf-8"))
-        response.headers["Content-Type"] = "application/atom+xml"
-        return response
+            datasets: list[Dataset] = get_rss_feed_list(queryset, sort_field)
+            for dataset in datasets:
+                author_name = None
+                author_uri = None
+                if dataset.organization:
+                    author_name = dataset.organization.name
+                    author_uri = dataset.organization.url_for()
+                elif dataset.owner:
+                    author_name = dataset.owner.fullname
+                    author_uri = dataset.owner.url_for()
+                feed.add_item(
+                    dataset.title,
+                    unique_id=dataset.url_for(_useId=True),
+                    description=dataset.description,
+                    content=str(md(dataset.description)),
+                    author_name=author_name,
+                    author_link=author_uri,
+                    link=dataset.url_for(),
+                    updateddate=dataset.last_modified,
+                    pubdate=dataset.created_at,
+                )
+            return feed.writeString("utf-8").encode("utf-8")
+
+        return cached_feed("Dataset", params, render)
 
 
 dataset_delete_parser = add_send_legal_notice_argument(api.parser())
@@ -408,6 +416,8 @@ dataset_delete_parser = add_send_legal_notice_argument(api.parser())
 @api.response(410, "Dataset has been deleted")
 class DatasetAPI(API):
     @api.doc("get_dataset")
+    @api.response(304, "Not modified")
+    @conditional("last_modified_internal")
     @api.marshal_with(dataset_fields)
     def get(self, dataset: Dataset):
         """Get a dataset given its identifier"""
@@ -653,6 +663,32 @@ class ResourceMixin(object):
             api.abort(404, "Resource does not exist")
         return resource
 
+    def populate_resource(self, resource, form, data):
+        """Populate an existing resource from a validated form and its raw `data`"""
+        # ensure filetype is not modified after creation
+        if (
+            form._fields.get("filetype").data
+            and form._fields.get("filetype").data != resource.filetype
+        ):
+            abort(400, "Cannot modify filetype after creation")
+
+        # ensure API client does not override url on self-hosted resources
+        if resource.filetype == "file":
+            form._fields.get("url").data = resource.url
+
+        # populate_obj populates existing resource object with the content of the form.
+        # update_resource saves the updated resource dict to the database
+        form.populate_obj(resource)
+        resource.last_modified_internal = datetime.now(UTC)
+
+        # populate_obj is bugged when sending a None value we want to remove the existing
+        # value. We don't want to remove the existing value if no "schema" is sent.
+        # Will be fixed when we switch to the new API Fields.
+        if "schema" in data and form._fields.get("schema").data is None:
+            resource.schema = None
+        if "checksum" in data and form._fields.get("checksum").data is None:
+            resource.checksum = None
+
 
 @ns.route(
     "/<dataset:dataset>/resources/<uuid:rid>/upload/",
@@ -729,31 +765,7 @@ class ResourceAPI(ResourceMixin, API):
         dataset.permissions["edit_resources"].test()
         resource = self.get_resource_or_404(dataset, rid)
         form = api.validate(ResourceFormWithoutId, resource)
-
-        # ensure filetype is not modified after creation
-        if (
-            form._fields.get("filetype").data
-            and form._fields.get("filetype").data != resource.filetype
-        ):
-            abort(400, "Cannot modify filetype after creation")
-
-        # ensure API client does not override url on self-hosted resources
-        if resource.filetype == "file":
-            form._fields.get("url").data = resource.url
-
-        # populate_obj populates existing resource object with the content of the form.
-        # update_resource saves the updated resource dict to the database
-        form.populate_obj(resource)
-        resource.last_modified_internal = datetime.now(UTC)
-
-        # populate_obj is bugged when sending a None value we want to remove the existing
-        # value. We don't want to remove the existing value if no "schema" is sent.
-        # Will be fixed when we switch to the new API Fields.
-        if "schema" in request.get_json() and form._fields.get("schema").data is None:
-            resource.schema = None
-        if "checksum" in request.get_json() and form._fields.get("checksum").data is None:
-            resource.checksum = None
-
+        self.populate_resource(resource, form, request.get_json())
         dataset.update_resource(resource)
         return resource
 
@@ -767,6 +779,79 @@ class ResourceAPI(ResourceMixin, API):
         return "", 204
 
 
+@ns.route("/<dataset:dataset>/resources/bulk/", endpoint="resources_bulk", doc=common_doc)
+class ResourcesBulkAPI(ResourceMixin, API):
+    def validate_list(self):
+        if "application/json" not in request.headers.get("Content-Type", ""):
+            api.abort(400, errors={"Content-Type": "expecting application/json"})
+        items = request.json
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            api.abort(400, errors={"request": "expecting a JSON list of objects"})
+        if not items:
+            api.abort(400, errors={"request": "expecting at least one resource"})
+        return items
+
+    @api.secure
+    @api.doc("create_resources", responses={400: "Validation error"})
+    @api.expect([resource_fields])
+    @api.marshal_list_with(resource_fields, code=201)
+    def post(self, dataset):
+        """
+        Create many remote resources at once for a given dataset
+
+        Resources are prepended in the given order.
+        """
+        dataset.permissions["edit_resources"].test()
+        resources = []
+        errors = {}
+        for index, data in enumerate(self.validate_list()):
+            form = ResourceFormWithoutId.from_json(data, meta={"csrf": False})
+            if not form.validate():
+                errors[index] = form.errors
+            elif form._fields.get("filetype").data != "remote":
+                errors[index] = {"filetype": ["This endpoint only supports remote resources"]}
+            else:
+                resource = Resource()
+                form.populate_obj(resource)
+                resources.append(resource)
+        if errors:
+            api.abort(400, errors=errors)
+        dataset.add_resources(resources)
+        return resources, 201
+
+    @api.secure
+    @api.doc("update_resources_bulk", responses={400: "Validation error"})
+    @api.expect([resource_fields])
+    @api.marshal_list_with(resource_fields)
+    def put(self, dataset):
+        """Update many existing resources at once on a given dataset"""
+        dataset.permissions["edit_resources"].test()
+        items = self.validate_list()
+        ids = [str(data.get("id")) for data in items]
+        if len(set(ids)) != len(ids):
+            api.abort(400, "Each resource can only be updated once")
+        existing = {str(r.id): r for r in dataset.resources}
+        resources = []
+        errors = {}
+        for index, data in enumerate(items):
+            resource = existing.get(str(data.get("id")))
+            if resource is None:
+                errors[index] = {"id": ["Resource does not exist"]}
+                continue
+            form = ResourceFormWithoutId.from_json(
+                data, obj=resource, instance=resource, meta={"csrf": False}
+            )
+            if not form.validate():
+                errors[index] = form.errors
+                continue
+            self.populate_resource(resource, form, data)
+            resources.append(resource)
+        if errors:
+            api.abort(400, errors=errors)
+        dataset.update_resources(resources)
+        return resources
+
+
 @ns.route("/community_resources/", endpoint="community_resources")
 class CommunityResourcesAPI(API):
     @api.doc("list_community_resources")
@@ -1,7 +1,7 @@
 import logging
 
 import mongoengine
-from flask import abort, request, url_for
+from flask import abort, current_app, request, url_for
 from flask_login import current_user
 from flask_restx import marshal
 
@@ -9,6 +9,7 @@ from udata import search
 from udata.api import API, apiv2, fields
 from udata.core.access_type.models import AccessAudience
 from udata.core.badges.models import Badge
+from udata.core.conditional import conditional
 from udata.core.contact_point.models import ContactPoint
 from udata.core.dataset.api_fields import license_fields
 from udata.core.organization.models import Member, Organization
@@ -267,6 +268,62 @@ dataset_search_page_fields = apiv2.model(
     mask="data{{{0}}},*".format(DEFAULT_MASK_APIV2),
 )
 
+dataset_lean_organization_fields = apiv2.model(
+    "DatasetLeanOrganization",
+    {
+        "id": fields.String(description="The organization identifier", readonly=True),
+        "name": fields.String(description="The organization name", readonly=True),
+        "acronym": fields.String(description="The organization acronym", readonly=True),
+        "slug": fields.String(description="The organization permalink string", readonly=True),
+        "badges": fields.List(fields.Nested(Badge.__read_fields__), readonly=True),
+        "uri": fields.String(description="The API URI for this organization", readonly=True),
+        "page": fields.String(description="The organization web page URL", readonly=True),
+    },
+)
+
+dataset_lean_fields = apiv2.model(
+    "DatasetLean",
+    {
+        "id": fields.String(description="The dataset identifier", readonly=True),
+        "title": fields.String(description="The dataset title", readonly=True),
+        "acronym": fields.String(description="An optional dataset acronym", readonly=True),
+        "slug": fields.String(description="The dataset permalink string", readonly=True),
+        "description_short": fields.String(
+            description="The dataset short description", readonly=True
+        ),
+        "created_at": fields.ISODateTime(description="The dataset creation date", readonly=True),
+        "last_modified": fields.ISODateTime(
+            description="The dataset last modification date", readonly=True
+        ),
+        "last_update": fields.ISODateTime(
+            description="The resources last modification date", readonly=True
+        ),
+        "tags": fields.List(fields.String),
+        "badges": fields.List(
+            fields.Nested(Badge.__read_fields__), description="The dataset badges", readonly=True
+        ),
+        "license": fields.String(
+            default=DEFAULT_LICENSE["id"], description="The dataset license identifier"
+        ),
+        "frequency": fields.String(
+            enum=list(UpdateFrequency), description="The dataset update frequency identifier"
+        ),
+        "metrics": fields.Raw(description="The dataset metrics"),
+        "organization": fields.Nested(
+            dataset_lean_organization_fields,
+            allow_null=True,
+            description="The producer organization",
+        ),
+        "owner": fields.String(allow_null=True, description="The owner user identifier"),
+        "uri": fields.String(description="The API URI for this dataset", readonly=True),
+        "page": fields.String(description="The dataset web page URL", readonly=True),
+    },
+)
+
+dataset_lean_search_page_fields = apiv2.model(
+    "DatasetLeanSearchPage", fields.search_pager(dataset_lean_fields)
+)
+
 specific_resource_fields = apiv2.model(
     "SpecificResource",
     {
@@ -300,16 +357,25 @@ class DatasetSearchAPI(API):
 
     @apiv2.doc("search_datasets")
     @apiv2.expect(search_parser)
-    @apiv2.marshal_with(dataset_search_page_fields)
+    @apiv2.response(200, "Success", dataset_search_page_fields)
     def get(self):
-        """List or search all datasets"""
+        """
+        List or search all datasets
+
+        With `lean`, results are served from the search index without loading the datasets.
+        """
         args = search_parser.parse_args()
         try:
-            return search.query(Dataset, **args)
+            result = search.query(Dataset, **args)
         except NotImplementedError:
             abort(501, "Search endpoint not enabled")
         except RuntimeError:
             abort(500, "Internal search service error")
+        page_fields = (
+            dataset_lean_search_page_fields if args.get("lean") else dataset_search_page_fields
+        )
+        mask = request.headers.get(current_app.config["RESTX_MASK_HEADER"])
+        return marshal(result, page_fields, mask=mask)
 
 
 dataset_parser = DatasetApiParser()
@@ -338,6 +404,8 @@ class DatasetListAPI(API):
 @apiv2.response(410, "Dataset has been deleted")
 class DatasetAPI(API):
     @apiv2.doc("get_dataset")
+    @apiv2.response(304, "Not modified")
+    @conditional("last_modified_internal")
     @apiv2.marshal_with(dataset_fields)
     def get(self, dataset):
         """Get a dataset given its identifier"""
@@ -355,6 +423,8 @@ class DatasetAPI(API):
 @apiv2.response(410, "Dataset has been deleted")
 class DatasetExtrasAPI(API):
     @apiv2.doc("get_dataset_extras")
+    @apiv2.response(304, "Not modified")
+    @conditional("last_modified_internal")
     def get(self, dataset):
         """Get a dataset extras given its identifier"""
         if not dataset.permissions["read"].can():
@@ -404,6 +474,8 @@ class DatasetExtrasAPI(API):
 @ns.route("/<dataset:dataset>/resources/", endpoint="resources")
 class ResourcesAPI(API):
     @apiv2.doc("list_resources")
+    @apiv2.response(304, "Not modified")
+    @conditional("last_modified_internal")
     @apiv2.expect(resources_parser)
     @apiv2.marshal_with(resource_page_fields)
     def get(self, dataset):
@@ -5,11 +5,12 @@ import click
 import requests
 from bson import ObjectId
 
-from udata.commands import cli, exit_with_error, success
+from udata.commands import cli, echo, exit_with_error, success
 from udata.core.dataset.constants import DEFAULT_LICENSE
 from udata.models import Dataset, License
 
 from . import actions
+from .events import resource_events_metrics
 
 log = logging.getLogger(__name__)
 
@@ -107,3 +108,15 @@ def archive(filepath, comment):
                 actions.archive(dataset, comment)
                 count += 1
     log.info("Archived %s datasets, %s failed", count, errors)
+
+
+@grp.command("resource-events")
+def resource_events():
+    """Display the resource events publication metrics"""
+    metrics = resource_events_metrics()
+    echo("Pending events: {pending}".format(**metrics))
+    echo("Coalesced events: {coalesced}".format(**metrics))
+    echo("Delivered events: {delivered}".format(**metrics))
+    echo("Failed events: {failed}".format(**metrics))
+    echo("Mean latency: {mean_latency:.2f}s".format(**metrics))
+    echo("Max latency: {max_latency:.2f}s".format(**metrics))
@@ -1,15 +1,34 @@
 import datetime
-from collections.abc import Callable
+import logging
+import time
+from contextlib import contextmanager
 from typing import Any
+from uuid import UUID, uuid4
 
 import requests
+from bson import ObjectId
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
+from udata.app import cache
 from udata.event.values import EventMessageType
 from udata.models import Dataset
 from udata.tasks import task
 from udata.utils import get_by, to_iso_datetime
 
+log = logging.getLogger(__name__)
+
+PENDING_KEY = "resource-events:pending:{0}"
+#: Pending events are dropped if not delivered within this delay (in seconds)
+PENDING_TIMEOUT = 24 * 60 * 60
+METRICS_KEY = "resource-events:metrics:{0}"
+LOCK_KEY = "resource-events:lock:{0}"
+#: A pending event lock is released after this delay (in seconds) if its holder died
+LOCK_TIMEOUT = 5
+
+_session = None
+
 
 def serialize_resource_for_event(resource):
     resource_dict = {
@@ -51,60 +70,241 @@ def payload_for_resource(document: Any, resource_id: str | None) -> dict | None:
     }
 
 
-@task(route="high.resource")
-def publish(url: str, document: Any, resource_id: str, action: str) -> None:
-    method: Callable
+def get_session() -> requests.Session:
+    """A pooled session, shared by all deliveries of a worker process"""
+    global _session
+    if _session is None:
+        retries = Retry(
+            total=current_app.config["RESOURCES_ANALYSER_RETRIES"],
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("POST", "PUT", "DELETE"),
+        )
+        adapter = HTTPAdapter(max_retries=retries)
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+def url_for_event(resource_id: str, action: EventMessageType) -> str:
+    base_url = current_app.config["RESOURCES_ANALYSER_URI"]
+    if action == EventMessageType.CREATED:
+        return f"{base_url}/api/resources/"
+    return f"{base_url}/api/resources/{resource_id}"
+
+
+def deliver(url: str, payload: dict | None, action: EventMessageType) -> None:
+    method: str
     match action:
         case EventMessageType.CREATED:
-            method = requests.post
+            method = "POST"
         case EventMessageType.MODIFIED:
-            method = requests.put
+            method = "PUT"
         case EventMessageType.DELETED:
-            method = requests.delete
-    payload: dict | None = payload_for_resource(document, resource_id)
+            method = "DELETE"
     headers = {}
     if current_app.config["RESOURCES_ANALYSER_API_KEY"]:
         headers = {"Authorization": f"Bearer {current_app.config['RESOURCES_ANALYSER_API_KEY']}"}
-    r = method(url, json=payload, headers=headers)
+    r = get_session().request(
+        method,
+        url,
+        json=payload,
+        headers=headers,
+        timeout=current_app.config["RESOURCES_ANALYSER_TIMEOUT"],
+    )
     r.raise_for_status()
 
 
+def merge_actions(previous: str | None, action: str) -> str | None:
+    """The action to publish for a resource given a not yet delivered one (`None` to skip)"""
+    if previous == EventMessageType.CREATED.value:
+        if action == EventMessageType.MODIFIED.value:
+            return EventMessageType.CREATED.value
+        if action == EventMessageType.DELETED.value:
+            # Never delivered, nothing to delete
+            return None
+    return action
+
+
+@contextmanager
+def pending_lock(resource_id):
+    """
+    Hold the lock of a resource pending event, so concurrent updates don't lose any action.
+
+    The lock is ignored with a warning if it can't be acquired within `LOCK_TIMEOUT` seconds.
+    """
+    key = LOCK_KEY.format(resource_id)
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not (acquired := cache.add(key, 1, timeout=LOCK_TIMEOUT)):
+        if time.monotonic() > deadline:
+            log.warning("Unable to lock the pending event of resource %s", resource_id)
+            break
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+def queue_resource_events(
+    dataset_id: str, resource_ids: list[str], action: EventMessageType
+) -> None:
+    """
+    Queue the publication of some resources events.
+
+    Events on a resource are coalesced until their delivery,
+    which happens after `RESOURCES_ANALYSER_EVENTS_DELAY` seconds:
+    only the last queued task of a resource delivers its (merged) event.
+    """
+    events = []
+    for resource_id in resource_ids:
+        key = PENDING_KEY.format(resource_id)
+        token = uuid4().hex
+        with pending_lock(resource_id):
+            pending = cache.get(key)
+            cache.set(
+                key,
+                {
+                    "token": token,
+                    "action": merge_actions(pending["action"] if pending else None, action.value),
+                    "queued_at": pending["queued_at"] if pending else time.time(),
+                },
+                timeout=PENDING_TIMEOUT,
+            )
+        cache.cache.inc(METRICS_KEY.format("coalesced" if pending else "pending"))
+        events.append((str(dataset_id), str(resource_id), action.value, token))
+
+    batch_size = current_app.config["RESOURCES_ANALYSER_BATCH_SIZE"]
+    for i in range(0, len(events), batch_size):
+        publish_resource_events.apply_async(
+            (events[i : i + batch_size],),
+            countdown=current_app.config["RESOURCES_ANALYSER_EVENTS_DELAY"],
+        )
+
+
+def resource_events_metrics() -> dict:
+    """Resource events publication metrics, latencies are in seconds"""
+    names = ("pending", "coalesced", "delivered", "failed", "latency_ms", "max_latency_ms")
+    values = dict(zip(names, cache.get_many(*(METRICS_KEY.format(n) for n in names))))
+    values = {name: int(value or 0) for name, value in values.items()}
+    delivered = values.pop("delivered")
+    return {
+        "pending": max(values["pending"], 0),
+        "coalesced": values["coalesced"],
+        "delivered": delivered,
+        "failed": values["failed"],
+        "mean_latency": values["latency_ms"] / delivered / 1000 if delivered else 0,
+        "max_latency": values["max_latency_ms"] / 1000,
+    }
+
+
+def _record_delivery(queued_at: float | None, failed: bool = False) -> None:
+    cache.cache.dec(METRICS_KEY.format("pending"))
+    if failed:
+        cache.cache.inc(METRICS_KEY.format("failed"))
+        return
+    cache.cache.inc(METRICS_KEY.format("delivered"))
+    if queued_at is not None:
+        latency_ms = int((time.time() - queued_at) * 1000)
+        cache.cache.inc(METRICS_KEY.format("latency_ms"), latency_ms)
+        if latency_ms > int(cache.get(METRICS_KEY.format("max_latency_ms")) or 0):
+            cache.set(METRICS_KEY.format("max_latency_ms"), latency_ms, timeout=0)
+
+
+@task(route="high.resource")
+def publish_resource_events(events: list[tuple[str, str, str, str]]) -> None:
+    """
+    Deliver a batch of `(dataset_id, resource_id, action, token)` events.
+
+    Payloads are serialized at delivery time from the current dataset state.
+    """
+    to_deliver = []
+    for dataset_id, resource_id, action, token in events:
+        key = PENDING_KEY.format(resource_id)
+        with pending_lock(resource_id):
+            pending = cache.get(key)
+            if pending is not None and pending["token"] == token:
+                cache.delete(key)
+        if pending is not None:
+            if pending["token"] != token:
+                # Superseded by a later event, which will be delivered by its own task
+                continue
+            action = pending["action"]
+        if action is None:
+            _record_delivery(None)
+            continue
+        queued_at = pending["queued_at"] if pending else None
+        to_deliver.append((dataset_id, resource_id, EventMessageType(action), queued_at))
+
+    dataset_ids = {
+        ObjectId(dataset_id)
+        for dataset_id, _, action, _ in to_deliver
+        if action != EventMessageType.DELETED
+    }
+    datasets = Dataset.objects.only("resources").in_bulk(list(dataset_ids)) if dataset_ids else {}
+
+    failures = 0
+    for dataset_id, resource_id, action, queued_at in to_deliver:
+        payload = None
+        if action != EventMessageType.DELETED:
+            dataset = datasets.get(ObjectId(dataset_id))
+            if dataset is None or get_by(dataset.resources, id=UUID(resource_id)) is None:
+                log.info("Resource %s of dataset %s no longer exists", resource_id, dataset_id)
+                _record_delivery(queued_at)
+                continue
+            payload = payload_for_resource(dataset, UUID(resource_id))
+        try:
+            deliver(url_for_event(resource_id, action), payload, action)
+        except requests.RequestException:
+            log.exception("Unable to publish %s event for resource %s", action, resource_id)
+            failures += 1
+            _record_delivery(queued_at, failed=True)
+        else:
+            _record_delivery(queued_at)
+    if failures:
+        raise RuntimeError(f"Failed to publish {failures} resource events")
+
+
+@task(route="high.resource")
+def publish(url: str, document: Any, resource_id: str, action: str) -> None:
+    """Deliver a single event with its document: kept to consume messages queued by older versions"""
+    deliver(url, payload_for_resource(document, resource_id), action)
+
+
+def should_publish() -> bool:
+    return bool(
+        current_app.config.get("PUBLISH_ON_RESOURCE_EVENTS")
+        and current_app.config.get("RESOURCES_ANALYSER_URI")
+    )
+
+
 @Dataset.on_resource_added.connect
 def publish_added_resource_message(sender, document, **kwargs) -> None:
-    if current_app.config.get("PUBLISH_ON_RESOURCE_EVENTS") and current_app.config.get(
-        "RESOURCES_ANALYSER_URI"
-    ):
-        publish.delay(
-            f"{current_app.config.get('RESOURCES_ANALYSER_URI')}/api/resources/",
-            document,
-            kwargs["resource_id"],
-            EventMessageType.CREATED,
-        )
+    if should_publish():
+        queue_resource_events(document.id, [kwargs["resource_id"]], EventMessageType.CREATED)
 
 
 @Dataset.on_resource_updated.connect
 def publish_updated_resource_message(sender, document, **kwargs) -> None:
-    if current_app.config.get("PUBLISH_ON_RESOURCE_EVENTS") and current_app.config.get(
-        "RESOURCES_ANALYSER_URI"
-    ):
-        resource_id: str = kwargs["resource_id"]
-        publish.delay(
-            f"{current_app.config.get('RESOURCES_ANALYSER_URI')}/api/resources/{resource_id}",
-            document,
-            resource_id,
-            EventMessageType.MODIFIED,
-        )
+    if should_publish():
+        queue_resource_events(document.id, [kwargs["resource_id"]], EventMessageType.MODIFIED)
+
+
+@Dataset.on_resources_added.connect
+def publish_added_resources_message(sender, document, **kwargs) -> None:
+    if should_publish():
+        queue_resource_events(document.id, kwargs["resource_ids"], EventMessageType.CREATED)
+
+
+@Dataset.on_resources_updated.connect
+def publish_updated_resources_message(sender, document, **kwargs) -> None:
+    if should_publish():
+        queue_resource_events(document.id, kwargs["resource_ids"], EventMessageType.MODIFIED)
 
 
 @Dataset.on_resource_removed.connect
 def publish_removed_resource_message(sender, document, **kwargs) -> None:
-    if current_app.config.get("PUBLISH_ON_RESOURCE_EVENTS") and current_app.config.get(
-        "RESOURCES_ANALYSER_URI"
-    ):
-        resource_id: str = kwargs["resource_id"]
-        publish.delay(
-            f"{current_app.config.get('RESOURCES_ANALYSER_URI')}/api/resources/{resource_id}",
-            document,
-            None,
-            EventMessageType.DELETED,
-        )
+    if should_publish():
+        queue_resource_events(document.id, [kwargs["resource_id"]], EventMessageType.DELETED)
@@ -25,7 +25,7 @@ from mongoengine.fields import (
     ReferenceField,
     StringField,
 )
-from mongoengine.signals import post_save, pre_init, pre_save
+from mongoengine.signals import post_delete, post_save, pre_init, pre_save
 from werkzeug.utils import cached_property
 
 from udata.api_fields import field, generate_fields
@@ -35,12 +35,14 @@ from udata.core.access_type.constants import AccessType
 from udata.core.access_type.models import WithAccessType, check_only_one_condition_per_role
 from udata.core.activity.models import Auditable
 from udata.core.badges.models import Badge, BadgeMixin, BadgesList
+from udata.core.conditional import touch_document
 from udata.core.constants import HVD
 from udata.core.contact_point.models import (
     ContactPoint,  # noqa: F401 — must be registered before Dataset
 )
 from udata.core.dataset.api_fields import temporal_coverage_fields
 from udata.core.dataset.preview import TabularAPIPreview
+from udata.core.feeds import invalidate_feeds
 from udata.core.linkable import Linkable
 from udata.core.metrics.helpers import get_stock_metrics
 from udata.core.metrics.models import WithMetrics
@@ -104,6 +106,9 @@ BADGES: dict[str, LazyString] = {
 
 NON_ASSIGNABLE_SCHEMA_TYPES = ["datapackage"]
 
+# Attempts of a bulk resources update when resources are reordered concurrently
+MAX_RESOURCES_UPDATE_ATTEMPTS = 3
+
 log = logging.getLogger(__name__)
 
 
@@ -675,7 +680,6 @@ class Dataset(
         + Owned.meta["indexes"],
         "ordering": ["-created_at_internal"],
         "queryset_class": DatasetQuerySet,
-        "auto_create_index_on_save": True,
     }
 
     before_save = signal("Dataset.before_save")
@@ -689,6 +693,8 @@ class Dataset(
     on_resource_added = signal("Dataset.on_resource_added")
     on_resource_updated = signal("Dataset.on_resource_updated")
     on_resource_removed = signal("Dataset.on_resource_removed")
+    on_resources_added = signal("Dataset.on_resources_added")
+    on_resources_updated = signal("Dataset.on_resources_updated")
 
     verbose_name = _("dataset")
 
@@ -1036,6 +1042,79 @@ class Dataset(
         self.reload()
         self.on_resource_updated.send(self.__class__, document=self, resource_id=resource.id)
 
+    def add_resources(self, resources: list[Resource]):
+        """
+        Perform a single atomic prepend for many new resources, keeping their order.
+
+        Quality is computed once, the dataset is reloaded once
+        and a single `on_resources_added` signal is sent.
+        """
+        if not resources:
+            return
+        existing_ids = set(r.id for r in self.resources)
+        for resource in resources:
+            resource.validate()
+            if resource.id in existing_ids:
+                raise MongoEngineValidationError(
+                    f"Cannot add resource '{resource.title}'. A resource already exists with ID '{resource.id}'"
+                )
+            existing_ids.add(resource.id)
+
+        # only useful for compute_quality(), we will reload to have a clean object
+        self.resources[0:0] = resources
+
+        self.update(
+            set__quality_cached=self.compute_quality(),
+            push__resources={"$each": [r.to_mongo() for r in resources], "$position": 0},
+            set__last_modified_internal=datetime.now(UTC),
+        )
+
+        self.reload()
+        self.on_resources_added.send(
+            self.__class__, document=self, resource_ids=[r.id for r in resources]
+        )
+
+    def update_resources(self, resources: list[Resource]):
+        """
+        Perform a single atomic update for many existing resources.
+
+        Each resource is set at its current position, which is checked by the update query:
+        if resources have been reordered or removed concurrently, positions are read again.
+        """
+        if not resources:
+            return
+        for resource in resources:
+            resource.validate()
+
+        for attempt in range(MAX_RESOURCES_UPDATE_ATTEMPTS):
+            positions = {r.id: i for i, r in enumerate(self.resources)}
+            missing = [str(r.id) for r in resources if r.id not in positions]
+            if missing:
+                raise MongoEngineValidationError(f"Unknown resources: {', '.join(missing)}")
+
+            # only useful for compute_quality(), we will reload to have a clean object
+            for resource in resources:
+                self.resources[positions[resource.id]] = resource
+
+            query = {}
+            changes = {}
+            for resource in resources:
+                son = resource.to_mongo()
+                query[f"resources.{positions[resource.id]}._id"] = son["_id"]
+                changes[f"resources.{positions[resource.id]}"] = son
+            changes["quality_cached"] = self.compute_quality()
+            changes["last_modified_internal"] = datetime.now(UTC)
+            result = self._get_collection().update_one({"_id": self.id, **query}, {"$set": changes})
+            self.reload()
+            if result.matched_count:
+                break
+        else:
+            raise MongoEngineValidationError("Resources have been modified concurrently")
+
+        self.on_resources_updated.send(
+            self.__class__, document=self, resource_ids=[r.id for r in resources]
+        )
+
     def remove_resource(self, resource):
         # only useful for compute_quality(), we will reload to have a clean object
         self.resources = [r for r in self.resources if r.id != resource.id]
@@ -1151,6 +1230,10 @@ pre_init.connect(Dataset.pre_init, sender=Dataset)
 pre_save.connect(Dataset.pre_save, sender=Dataset)
 post_save.connect(Dataset.post_save, sender=Dataset)
 post_save.connect(SpamMixin.post_save, sender=Dataset)
+post_save.connect(invalidate_feeds, sender=Dataset)
+post_delete.connect(invalidate_feeds, sender=Dataset)
+post_save.connect(touch_document, sender=Dataset)
+post_delete.connect(touch_document, sender=Dataset)
 
 
 class CommunityResource(ResourceMixin, WithMetrics, Owned, Document[OwnedQuerySet]):
@@ -1,7 +1,9 @@
 import datetime
 
+from flask import url_for
+
 from udata.core.dataset.api import DEFAULT_SORTING, DatasetApiParser
-from udata.core.dataset.constants import FormatFamily, get_format_family
+from udata.core.dataset.constants import FormatFamily, UpdateFrequency, get_format_family
 from udata.core.organization.constants import PRODUCER_TYPES
 from udata.core.organization.helpers import get_producer_type
 from udata.core.spatial.constants import ADMIN_LEVEL_MAX
@@ -17,6 +19,7 @@ from udata.search import (
     TemporalCoverageFilter,
     register,
 )
+from udata.uris import cdata_url
 from udata.utils import to_iso_datetime
 from udata_search_service.consumers import DatasetConsumer
 from udata_search_service.services import DatasetService
@@ -35,6 +38,27 @@ class DatasetSearch(ModelSearchAdapter):
     service_class = DatasetService
     consumer_class = DatasetConsumer
 
+    lean_fields = (
+        "title",
+        "acronym",
+        "slug",
+        "description_short",
+        "created_at",
+        "last_modified",
+        "last_update",
+        "tags",
+        "badges",
+        "license",
+        "frequency",
+        "metrics",
+        "organization",
+        "organization_name",
+        "organization_acronym",
+        "organization_slug",
+        "organization_badges",
+        "owner",
+    )
+
     sorts = {
         "created": "created_at_internal",
         "last_update": "last_modified_internal",
@@ -70,6 +94,43 @@ class DatasetSearch(ModelSearchAdapter):
     def is_indexable(cls, dataset: Dataset):
         return dataset.is_visible
 
+    @classmethod
+    def lean_object(cls, source):
+        slug = source.get("slug")
+        if slug is None:
+            return None
+        organization = None
+        if source["organization"]:
+            org_slug = source["organization_slug"] or source["organization"]
+            organization = {
+                "id": source["organization"],
+                "name": source["organization_name"],
+                "acronym": source["organization_acronym"],
+                "slug": source["organization_slug"],
+                "badges": [{"kind": kind} for kind in source["organization_badges"] or []],
+                "uri": url_for("api.organization", org=org_slug, _external=True),
+                "page": cdata_url(f"/organizations/{org_slug}"),
+            }
+        return {
+            "id": source["id"],
+            "title": source["title"],
+            "acronym": source["acronym"],
+            "slug": slug,
+            "description_short": source["description_short"],
+            "created_at": source["created_at"],
+            "last_modified": source["last_modified"],
+            "last_update": source["last_update"],
+            "tags": source["tags"] or [],
+            "badges": [{"kind": kind} for kind in source["badges"] or []],
+            "license": source["license"],
+            "frequency": source["frequency"] or UpdateFrequency.UNKNOWN,
+            "metrics": source["metrics"] or {},
+            "organization": organization,
+            "owner": source["owner"],
+            "uri": url_for("api.dataset", dataset=slug, _external=True),
+            "page": cdata_url(f"/datasets/{slug}"),
+        }
+
     @classmethod
     def _compute_format_family(cls, dataset: Dataset) -> list[str]:
         """
@@ -112,6 +173,8 @@ class DatasetSearch(ModelSearchAdapter):
                 "public_service": 1 if dataset.organization.public_service else 0,
                 "followers": dataset.organization.metrics.get("followers", 0),
                 "badges": [badge.kind for badge in dataset.organization.badges],
+                "slug": dataset.organization.slug,
+                "acronym": dataset.organization.acronym,
             }
 
         document = {
@@ -144,6 +207,10 @@ class DatasetSearch(ModelSearchAdapter):
             "access_type": dataset.access_type,
             "format_family": cls._compute_format_family(dataset),
             "producer_type": get_producer_type(dataset),
+            "slug": dataset.slug,
+            "description_short": dataset.description_short,
+            "last_modified": to_iso_datetime(dataset.last_modified),
+            "metrics": dataset.get_metrics(),
         }
         extras = {}
         for key, value in dataset.extras.items():
@@ -11,16 +11,14 @@ def discussions_for(user, only_open=True):
 
     :param bool only_open: whether to include closed discussions or not.
     """
-    # Only fetch required fields for discussion filtering (id and slug)
-    # Greatly improve performances and memory usage
-    datasets = Dataset.objects.owned_by(user.id, *user.organizations).only("id", "slug")
-    reuses = Reuse.objects.owned_by(user.id, *user.organizations).only("id", "slug")
+    datasets = Dataset.objects.owned_by(user.id, *user.organization_ids)
+    reuses = Reuse.objects.owned_by(user.id, *user.organization_ids)
 
     # TODO: add dataservices when ready. It would now break notification routing in current admin
     # since dataservices aren't supported by the current admin.
-    # dataservices = Dataservice.objects.owned_by(user.id, *user.organizations).only("id", "slug")
+    # dataservices = Dataservice.objects.owned_by(user.id, *user.organization_ids)
 
-    qs = Discussion.objects(subject__in=list(datasets) + list(reuses))
+    qs = Discussion.objects.about(datasets, reuses)
     if only_open:
         qs = qs(closed__exists=False)
     return qs
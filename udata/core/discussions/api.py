@@ -327,11 +327,11 @@ class DiscussionsAPI(API):
             org = Organization.objects.get_or_404(id=id_or_404(args["org"]))
             if not org:
                 api.abort(404, "Organization does not exist")
-            reuses = Reuse.objects(organization=org).only("id")
-            datasets = Dataset.objects(organization=org).only("id")
-            dataservices = Dataservice.objects(organization=org).only("id")
-            subjects = list(reuses) + list(datasets) + list(dataservices)
-            discussions = discussions(subject__in=subjects)
+            discussions = discussions.about(
+                Reuse.objects(organization=org),
+                Dataset.objects(organization=org),
+                Dataservice.objects(organization=org),
+            )
         if args["user"]:
             discussions = discussions(discussion__posted_by=ObjectId(args["user"]))
         if args["closed"] is False:
@@ -343,7 +343,7 @@ class DiscussionsAPI(API):
             phrase_query = " ".join([f'"{elem}"' for elem in args["q"].split(" ")])
             discussions = discussions.search_text(phrase_query).order_by("$text_score")
 
-        discussions = discussions.order_by(args["sort"])
+        discussions = discussions.order_by(args["sort"]).prefetch_for(discussion_fields)
         return discussions.paginate(args["page"], args["page_size"])
 
     @api.secure
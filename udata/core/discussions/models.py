@@ -1,6 +1,7 @@
 import logging
 from datetime import UTC, datetime
 
+from bson import SON, DBRef
 from flask import url_for
 from flask_login import current_user
 from mongoengine import EmbeddedDocument
@@ -19,6 +20,7 @@ from udata.core.spam.models import SpamMixin, spam_protected
 from udata.i18n import lazy_gettext as _
 from udata.mongo.document import UDataDocument as Document
 from udata.mongo.extras_fields import ExtrasField
+from udata.mongo.queryset import UDataQuerySet
 from udata.mongo.uuid_fields import AutoUUIDField
 
 from .signals import (
@@ -90,6 +92,25 @@ class Message(SpamMixin, EmbeddedDocument):
         return message
 
 
+class DiscussionQuerySet(UDataQuerySet):
+    def about(self, *subjects):
+        """
+        Filter discussions about the documents matched by the `subjects` querysets.
+
+        Only the subjects ids are fetched (no document is built)
+        and they are matched against the indexed `subject` field.
+        """
+        refs = []
+        for qs in subjects:
+            model = qs._document
+            collection = model._get_collection_name()
+            refs.extend(
+                SON([("_cls", model._class_name), ("_ref", DBRef(collection, id))])
+                for id in qs.distinct("id")
+            )
+        return self(__raw__={"subject": {"$in": refs}})
+
+
 class Discussion(SpamMixin, Linkable, Document):
     verbose_name = _("discussion")
 
@@ -117,7 +138,7 @@ class Discussion(SpamMixin, Linkable, Document):
             "-created",
         ],
         "ordering": ["-created"],
-        "auto_create_index_on_save": True,
+        "queryset_class": DiscussionQuerySet,
     }
 
     @property
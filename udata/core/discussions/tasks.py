@@ -12,9 +12,24 @@ from .signals import on_discussion_closed, on_new_discussion, on_new_discussion_
 log = get_logger(__name__)
 
 
-@connect(on_new_discussion, by_id=True)
-def notify_new_discussion(discussion_id):
-    discussion = Discussion.objects.get(pk=discussion_id)
+def load_discussion(discussion):
+    """
+    The discussion given to a task, `None` if it has been deleted since.
+
+    Tasks queued by previous versions were given the discussion id.
+    """
+    if isinstance(discussion, str):
+        discussion = Discussion.objects(pk=discussion).first()
+    if discussion is None:
+        log.info("Discussion deleted before its notification")
+    return discussion
+
+
+@connect(on_new_discussion)
+def notify_new_discussion(discussion):
+    discussion = load_discussion(discussion)
+    if discussion is None:
+        return
     if isinstance(discussion.subject, NOTIFY_DISCUSSION_SUBJECTS):
         recipients = discussion.owner_recipients(sender=discussion.user)
         mails.new_discussion(discussion).send(recipients)
@@ -32,9 +47,11 @@ def notify_new_discussion(discussion_id):
         log.warning("Unrecognized discussion subject type %s", type(discussion.subject))
 
 
-@connect(on_new_discussion_comment, by_id=True)
-def notify_new_discussion_comment(discussion_id, message=None):
-    discussion = Discussion.objects.get(pk=discussion_id)
+@connect(on_new_discussion_comment)
+def notify_new_discussion_comment(discussion, message=None):
+    discussion = load_discussion(discussion)
+    if discussion is None:
+        return
     message = discussion.discussion[message]
     if isinstance(discussion.subject, NOTIFY_DISCUSSION_SUBJECTS):
         recipients = discussion.owner_recipients(sender=message.posted_by)
@@ -62,9 +79,11 @@ def notify_new_discussion_comment(discussion_id, message=None):
         log.warning("Unrecognized discussion subject type %s", type(discussion.subject))
 
 
-@connect(on_discussion_closed, by_id=True)
-def notify_discussion_closed(discussion_id, message=None):
-    discussion = Discussion.objects.get(pk=discussion_id)
+@connect(on_discussion_closed)
+def notify_discussion_closed(discussion, message=None):
+    discussion = load_discussion(discussion)
+    if discussion is None:
+        return
     message = discussion.discussion[message] if message else None
     if isinstance(discussion.subject, NOTIFY_DISCUSSION_SUBJECTS):
         recipients = discussion.owner_recipients(sender=discussion.closed_by)
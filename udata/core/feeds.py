@@ -0,0 +1,82 @@
+"""
+Caching of rendered Atom feeds.
+
+Feed readers poll the `recent.atom` endpoints constantly while their content rarely changes.
+Rendered feeds are cached by model and normalized parameters and served with
+an `ETag` and a `Last-Modified` header so unchanged feeds are answered with a `304`.
+
+Cache keys include a generation of the model bumped each time one of its documents
+is saved or deleted. Entries also expire after `FEED_CACHE_TTL` seconds
+so documents delayed by `DELAY_BEFORE_APPEARING_IN_RSS_FEED` show up in time.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from flask import current_app, make_response, request
+
+from udata.app import cache
+from udata.i18n import get_locale
+from udata.search.cache import params_digest
+
+GENERATION_KEY = "feeds:generation:{0}"
+FEED_KEY = "feeds:{0}:{1}:{2}"
+VERSION_KEY = "feeds:version:{0}:{1}"
+#: Lifetime (in seconds) of the last known version of a feed, used to keep `Last-Modified` stable
+VERSION_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def feed_generation(model_name: str) -> str:
+    return cache.get(GENERATION_KEY.format(model_name)) or "0"
+
+
+def bump_feed_generation(model_name: str) -> None:
+    """Invalidate all cached feeds of a model"""
+    cache.set(GENERATION_KEY.format(model_name), uuid4().hex, timeout=0)
+
+
+def invalidate_feeds(sender, document, **kwargs):
+    """Invalidate the cached feeds of a model when one of its documents is written"""
+    if "post_save" in kwargs.get("ignores", []):
+        return
+    bump_feed_generation(sender.__name__)
+
+
+def _render(model_name, digest, render):
+    content = render()
+    etag = hashlib.sha1(content).hexdigest()
+    version_key = VERSION_KEY.format(model_name, digest)
+    version = cache.get(version_key)
+    if version and version["etag"] == etag:
+        modified = version["modified"]
+    else:
+        modified = datetime.now(UTC).replace(microsecond=0)
+        cache.set(version_key, {"etag": etag, "modified": modified}, timeout=VERSION_TIMEOUT)
+    return {"content": content, "etag": etag, "modified": modified}
+
+
+def cached_feed(model_name: str, params: dict, render):
+    """
+    An Atom feed response rendered by `render()` (as bytes) or served from cache.
+
+    `params` should contain all the parameters affecting the feed content.
+    The response is conditional: a `304` is returned if the client already has this version.
+    """
+    ttl = current_app.config["FEED_CACHE_TTL"]
+    params = dict(params, _locale=str(get_locale()), _root=request.url_root)
+    digest = params_digest(params)
+    if ttl:
+        key = FEED_KEY.format(model_name, feed_generation(model_name), digest)
+        entry = cache.get(key)
+        if entry is None:
+            entry = _render(model_name, digest, render)
+            cache.set(key, entry, timeout=ttl)
+    else:
+        entry = _render(model_name, digest, render)
+
+    response = make_response(entry["content"])
+    response.headers["Content-Type"] = "application/atom+xml"
+    response.set_etag(entry["etag"])
+    response.last_modified = entry["modified"]
+    return response.make_conditional(request)
@@ -5,6 +5,7 @@ from flask import current_app
 
 from udata.commands import cli, success
 from udata.core.dataservices.models import Dataservice
+from udata.core.metrics.counters import FAMILIES, compute_counters
 from udata.models import Dataset, GeoZone, Organization, Reuse, Site, User
 
 log = logging.getLogger(__name__)
@@ -129,15 +130,13 @@ def update(
 
     if do_all or users:
         log.info("Update user metrics")
+        if drop:
+            User.objects.update(set__metrics={})
+        compute_counters("users")
         all_users = User.objects.timeout(False)
         with click.progressbar(all_users, length=User.objects.count()) as users_bar:
             for user in users_bar:
                 try:
-                    if drop:
-                        user.metrics.clear()
-                    user.count_datasets()
-                    user.count_reuses()
-                    user.count_dataservices()
                     user.count_followers()
                     user.count_following()
                 except Exception as e:
@@ -146,15 +145,17 @@ def update(
 
     if do_all or geozones:
         log.info("Update GeoZone metrics")
-        all_geozones = GeoZone.objects.timeout(False)
-        with click.progressbar(all_geozones, length=GeoZone.objects.count()) as geozones_bar:
-            for geozone in geozones_bar:
-                try:
-                    if drop:
-                        geozone.metrics.clear()
-                    geozone.count_datasets()
-                except Exception as e:
-                    log.info(f"Error during update: {e}")
-                    continue
+        if drop:
+            GeoZone.objects.update(set__metrics={})
+        compute_counters("geozones")
 
     success("All metrics have been updated")
+
+
+@grp.command()
+@click.argument("families", nargs=-1, type=click.Choice(list(FAMILIES)))
+def counters(families):
+    """Compute counters metrics with batch aggregations (all families if none is given)"""
+    for name, updated in compute_counters(*families).items():
+        log.info(f"{name}: {updated} non-zero counters")
+    success("Counters have been updated")
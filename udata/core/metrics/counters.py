@@ -0,0 +1,140 @@
+"""
+Batch computation of simple per-entity counters.
+
+Instead of issuing one `count()` and one `save()` per entity,
+each counter is computed with a single `$group` aggregation
+(with an `$unwind` for list fields) over the visible source documents,
+and results are written back with unordered `bulk_write`.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mongoengine import QuerySet
+from pymongo import UpdateOne
+
+from udata.core.conditional import touch_models
+from udata.core.metrics.signals import on_counters_computed
+
+log = logging.getLogger(__name__)
+
+__all__ = ("Counter", "FAMILIES", "compute_counters")
+
+BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Counter:
+    """
+    Count `source()` documents by `path` values into `metrics.<metric>` of `target()`.
+
+    Models are given as callables to avoid circular imports.
+    """
+
+    metric: str
+    target: Callable[[], type]
+    source: Callable[[], QuerySet]
+    path: str
+    unwind: bool = False
+
+    def aggregate(self) -> dict:
+        """Counts by target id, computed with a single aggregation"""
+        if self.unwind:
+            # A value is only counted once per source document
+            pipeline = [
+                {"$project": {"value": {"$setUnion": [f"${self.path}", []]}}},
+                {"$unwind": "$value"},
+            ]
+        else:
+            pipeline = [{"$project": {"value": f"${self.path}"}}]
+        pipeline.append({"$group": {"_id": "$value", "count": {"$sum": 1}}})
+        results = self.source().aggregate(pipeline, allowDiskUse=True)
+        return {row["_id"]: row["count"] for row in results if row["_id"] is not None}
+
+    def write(self, counts: dict, batch_size: int = BATCH_SIZE) -> int:
+        """Write counts with bulk updates and reset the other targets to zero"""
+        collection = self.target()._get_collection()
+        key = f"metrics.{self.metric}"
+        operations = []
+        for id, count in counts.items():
+            operations.append(UpdateOne({"_id": id}, {"$set": {key: count}}))
+            if len(operations) >= batch_size:
+                collection.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+        # Reset in batches: a single `$nin` of all the counted ids could exceed the BSON size limit
+        stale = []
+        for doc in collection.find({key: {"$ne": 0}}, {"_id": 1}):
+            if doc["_id"] not in counts:
+                stale.append(doc["_id"])
+            if len(stale) >= batch_size:
+                collection.update_many({"_id": {"$in": stale}}, {"$set": {key: 0}})
+                stale = []
+        if stale:
+            collection.update_many({"_id": {"$in": stale}}, {"$set": {key: 0}})
+        return len(counts)
+
+
+def _model(name):
+    def getter():
+        from udata import models
+
+        return getattr(models, name)
+
+    return getter
+
+
+def _visible(name):
+    # Clear the default ordering which would add a useless `$sort` stage
+    return lambda: _model(name)().objects.visible().order_by()
+
+
+FAMILIES: dict[str, list[Counter]] = {
+    "geozones": [
+        Counter("datasets", _model("GeoZone"), _visible("Dataset"), "spatial.zones", unwind=True),
+    ],
+    "organizations": [
+        Counter("datasets", _model("Organization"), _visible("Dataset"), "organization"),
+        Counter("reuses", _model("Organization"), _visible("Reuse"), "organization"),
+        Counter("dataservices", _model("Organization"), _visible("Dataservice"), "organization"),
+    ],
+    "users": [
+        Counter("datasets", _model("User"), _visible("Dataset"), "owner"),
+        Counter("reuses", _model("User"), _visible("Reuse"), "owner"),
+        Counter("dataservices", _model("User"), _visible("Dataservice"), "owner"),
+    ],
+    "datasets": [
+        Counter("reuses", _model("Dataset"), _visible("Reuse"), "datasets", unwind=True),
+        Counter(
+            "dataservices", _model("Dataset"), _visible("Dataservice"), "datasets", unwind=True
+        ),
+    ],
+}
+
+
+def compute_counters(*families: str, batch_size: int = BATCH_SIZE) -> dict[str, int]:
+    """
+    Compute all counters of the given families (all families if none is given).
+
+    Returns the number of updated entities by `<family>.<metric>`.
+    """
+    unknown = set(families) - set(FAMILIES)
+    if unknown:
+        raise ValueError(f"Unknown counter families: {', '.join(sorted(unknown))}")
+    results = {}
+    for family in families or FAMILIES:
+        for counter in FAMILIES[family]:
+            start = time.perf_counter()
+            counts = counter.aggregate()
+            updated = counter.write(counts, batch_size=batch_size)
+            results[f"{family}.{counter.metric}"] = updated
+            touch_models(counter.target().__name__)
+            log.info(
+                f"Computed {family}.{counter.metric} for {updated} entities "
+                f"in {time.perf_counter() - start:.4f} seconds."
+            )
+        on_counters_computed.send(family)
+    return results
@@ -4,3 +4,6 @@ namespace = Namespace()
 
 #: Trigerred when a site's metrics job is done.
 on_site_metrics_computed = namespace.signal("on-site-metrics-computed")
+
+#: Trigerred when a family of counters has been computed and written.
+on_counters_computed = namespace.signal("on-counters-computed")
@@ -7,7 +7,9 @@ from typing import Any
 import requests
 from flask import current_app
 
+from udata.core.conditional import touch_models
 from udata.core.dataservices.models import Dataservice
+from udata.core.metrics.counters import compute_counters
 from udata.core.metrics.signals import on_site_metrics_computed
 from udata.models import CommunityResource, Dataset, Organization, Reuse, Site
 from udata.mongo.document import UDataDocument as Document
@@ -137,6 +139,7 @@ def update_metrics_for_models():
     update_dataservices()
     update_reuses()
     update_organizations()
+    touch_models("Dataset", "CommunityResource", "Dataservice", "Reuse", "Organization")
 
 
 @job("update-metrics", route="low.metrics")
@@ -170,3 +173,9 @@ def compute_site_metrics(self):
     site.count_stock_metrics()
     # Sending signal
     on_site_metrics_computed.send(site)
+
+
+@job("compute-counters-metrics")
+def compute_counters_metrics(self, *families):
+    """Compute counters metrics (all families if none is given) with batch aggregations"""
+    compute_counters(*families)
@@ -10,6 +10,7 @@ from udata.auth import admin_permission, current_user
 from udata.core import csv
 from udata.core.badges import api as badges_api
 from udata.core.badges.models import Badge
+from udata.core.conditional import conditional
 from udata.core.contact_point.models import ContactPoint
 from udata.core.dataservices.csv import DataserviceCsvAdapter
 from udata.core.dataservices.models import Dataservice
@@ -33,6 +34,7 @@ from udata.mongo import db
 from udata.mongo.errors import FieldValidationError
 from udata.rdf import RDF_EXTENSIONS, graph_response, negociate_content
 
+from . import memberships
 from .api_fields import (
     invite_fields,
     org_role_fields,
@@ -176,6 +178,8 @@ org_delete_parser = add_send_legal_notice_argument(api.parser())
 @api.response(410, "Organization has been deleted")
 class OrganizationAPI(API):
     @api.doc("get_organization")
+    @api.response(304, "Not modified")
+    @conditional("last_modified")
     @api.marshal_with(Organization.__read_fields__)
     def get(self, org):
         """Get a organization given its identifier"""
@@ -245,7 +249,7 @@ class DiscussionsCsvAPI(API):
     def get(self, org):
         datasets = Dataset.objects.filter(organization=str(org.id))
         # select_related allows us to dereference subject Referencefield  as efficiently as possible
-        discussions = Discussion.objects.filter(subject__in=datasets).select_related()
+        discussions = Discussion.objects.about(datasets).select_related()
         adapter = DiscussionCsvAdapter(discussions)
         return csv.stream(adapter, "{0}-discussions".format(org.slug))
 
@@ -605,6 +609,7 @@ class MemberAPI(API):
         member = org.member(user)
         if member:
             Organization.objects(id=org.id).update_one(pull__members=member)
+            memberships.invalidate(user.id)
             Assignment.objects(user=user, organization=org).delete()
             org.reload()
             org.count_members()
@@ -743,26 +748,33 @@ class OrgDatasetsAPI(API):
 @ns.route("/<org:org>/reuses/", endpoint="org_reuses")
 class OrgReusesAPI(API):
     @api.doc("list_organization_reuses")
-    @api.marshal_list_with(Reuse.__read_fields__)
+    @api.response(200, "Success", [Reuse.__read_fields__])
     def get(self, org):
-        """List organization reuses (including private ones when member)"""
+        """
+        List organization reuses (including private ones when member)
+
+        The list is streamed: see the API v2 for a paginated version.
+        """
         qs = Reuse.objects.owned_by(org)
         if not org.permissions["private"].can():
             qs = qs(private__ne=True)
-        return list(qs)
+        return api.marshal_stream(qs, Reuse.__read_fields__)
 
 
 @ns.route("/<org:org>/discussions/", endpoint="org_discussions")
 class OrgDiscussionsAPI(API):
     @api.doc("list_organization_discussions")
-    @api.marshal_list_with(discussion_fields)
+    @api.response(200, "Success", [discussion_fields])
     def get(self, org):
-        """List organization discussions"""
-        reuses = Reuse.objects(organization=org).only("id")
-        datasets = Dataset.objects(organization=org).only("id")
-        subjects = list(reuses) + list(datasets)
-        qs = Discussion.objects(subject__in=subjects).order_by("-created")
-        return list(qs)
+        """
+        List organization discussions
+
+        The list is streamed: see the API v2 for a paginated version.
+        """
+        qs = Discussion.objects.about(
+            Reuse.objects(organization=org), Dataset.objects(organization=org)
+        ).order_by("-created")
+        return api.marshal_stream(qs, discussion_fields)
 
 
 @ns.route("/roles/", endpoint="org_roles")
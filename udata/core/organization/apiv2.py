@@ -3,6 +3,10 @@ from flask import request
 from udata import search
 from udata.api import API, apiv2, fields
 from udata.core.contact_point.models import ContactPoint
+from udata.core.dataset.models import Dataset
+from udata.core.discussions.api import discussion_fields
+from udata.core.discussions.models import Discussion
+from udata.core.reuse.models import Reuse
 
 from .models import Member, MembershipRequest, Organization, Team, org_permissions_fields
 from .search import OrganizationSearch
@@ -18,10 +22,14 @@ apiv2.inherit("OrganizationPermissions", org_permissions_fields)
 org_search_page_fields = apiv2.model(
     "OrganizationSearchPage", fields.search_pager(Organization.__read_fields__)
 )
+org_discussion_page_fields = apiv2.model(
+    "OrganizationDiscussionPage", fields.pager(discussion_fields)
+)
 
 
 ns = apiv2.namespace("organizations", "Organization related operations")
 search_parser = OrganizationSearch.as_request_parser(store_missing=False)
+page_parser = apiv2.page_parser()
 
 DEFAULT_SORTING = "-created_at"
 
@@ -39,6 +47,37 @@ class OrganizationSearchAPI(API):
         return search.query(OrganizationSearch, **args)
 
 
+@ns.route("/<org:org>/reuses/", endpoint="organization_reuses")
+class OrganizationReusesAPI(API):
+    @apiv2.doc("list_organization_reuses")
+    @apiv2.expect(Reuse.__index_parser__)
+    @apiv2.marshal_with(Reuse.__page_fields__)
+    def get(self, org):
+        """List organization reuses by page (including private ones when member)"""
+        qs = Reuse.objects.owned_by(org)
+        if not org.permissions["private"].can():
+            qs = qs(private__ne=True)
+        return Reuse.apply_pagination(Reuse.apply_sort_filters(qs))
+
+
+@ns.route("/<org:org>/discussions/", endpoint="organization_discussions")
+class OrganizationDiscussionsAPI(API):
+    @apiv2.doc("list_organization_discussions")
+    @apiv2.expect(page_parser)
+    @apiv2.marshal_with(org_discussion_page_fields)
+    def get(self, org):
+        """List organization discussions by page"""
+        args = page_parser.parse_args()
+        qs = Discussion.objects.about(
+            Reuse.objects(organization=org), Dataset.objects(organization=org)
+        )
+        return (
+            qs.order_by("-created", "id")
+            .prefetch_for(org_discussion_page_fields)
+            .paginate(args["page"], args["page_size"])
+        )
+
+
 @ns.route("/<org:org>/extras/", endpoint="organization_extras")
 @apiv2.response(400, "Wrong payload format, dict expected")
 @apiv2.response(400, "Wrong payload format, list expected")
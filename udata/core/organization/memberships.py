@@ -0,0 +1,106 @@
+"""
+Users organizations memberships
+
+The organizations of a user and their roles are loaded in a single query,
+once by request (or task) and cached for `MEMBERSHIPS_CACHE_TIMEOUT` seconds across requests.
+Cached memberships are invalidated once the members of an organization are saved.
+"""
+
+from dataclasses import dataclass, field
+
+from bson import ObjectId
+from flask import current_app, g, has_app_context
+
+from udata.app import cache
+
+CACHE_KEY = "memberships:{0}"
+
+
+@dataclass
+class Memberships:
+    """The organizations of a user"""
+
+    #: Roles by organization id (deleted organizations included)
+    roles: dict[ObjectId, str] = field(default_factory=dict)
+    #: Ids of the organizations which are not deleted
+    active: list[ObjectId] = field(default_factory=list)
+
+
+def load(user_id: ObjectId) -> Memberships:
+    from .models import Organization
+
+    memberships = Memberships()
+    orgs = Organization.objects(members__user=user_id).only("members", "deleted").as_pymongo()
+    for org in orgs:
+        role = next(
+            (member.get("role") for member in org["members"] if member.get("user") == user_id),
+            None,
+        )
+        memberships.roles[org["_id"]] = role
+        if not org.get("deleted"):
+            memberships.active.append(org["_id"])
+    return memberships
+
+
+def get(user) -> Memberships:
+    """The memberships of a user, from the current request, the cache or the database"""
+    if user is None or user.is_anonymous or not user.id:
+        return Memberships()
+    if not has_app_context():
+        return load(user.id)
+    loaded = g.setdefault("memberships", {})
+    memberships = loaded.get(user.id)
+    if memberships is None:
+        key = CACHE_KEY.format(user.id)
+        memberships = cache.get(key)
+        if memberships is None:
+            memberships = load(user.id)
+            cache.set(key, memberships, timeout=current_app.config["MEMBERSHIPS_CACHE_TIMEOUT"])
+        loaded[user.id] = memberships
+    return memberships
+
+
+def invalidate(*user_ids: ObjectId):
+    """Forget the memberships of some users"""
+    if not user_ids:
+        return
+    if has_app_context():
+        loaded = g.get("memberships", {})
+        for user_id in user_ids:
+            loaded.pop(user_id, None)
+        cache.delete_many(*(CACHE_KEY.format(user_id) for user_id in user_ids))
+
+
+def members(org) -> set[ObjectId]:
+    return {member.user.id for member in org.members if member.user}
+
+
+def on_organization_pre_save(sender, document, **kwargs):
+    """Collect the previous and the new members to invalidate on changes"""
+    changed = document._get_changed_fields()
+    created = document._created or not document.id
+    if not created and not any(
+        name == "deleted" or name.split(".")[0] == "members" for name in changed
+    ):
+        return
+    from .models import Organization
+
+    user_ids = members(document)
+    if document.id:
+        stored = Organization.objects(id=document.id).only("members").as_pymongo().first()
+        user_ids |= {member.get("user") for member in (stored or {}).get("members", [])}
+    document._memberships_user_ids = {user_id for user_id in user_ids if user_id}
+
+
+def on_organization_post_save(sender, document, **kwargs):
+    """
+    Invalidate the collected memberships once written,
+    a concurrent request could cache the previous ones otherwise.
+    """
+    user_ids = document.__dict__.pop("_memberships_user_ids", None)
+    if user_ids:
+        invalidate(*user_ids)
+
+
+def on_organization_delete(sender, document, **kwargs):
+    invalidate(*members(document))
@@ -17,7 +17,7 @@ from mongoengine.fields import (
     ReferenceField,
     StringField,
 )
-from mongoengine.signals import post_save, pre_save
+from mongoengine.signals import post_delete, post_save, pre_save
 from werkzeug.utils import cached_property
 
 from udata.api import api
@@ -25,6 +25,7 @@ from udata.api import fields as api_fields
 from udata.api_fields import field, generate_fields, required_if
 from udata.core.activity.models import Auditable
 from udata.core.badges.models import Badge, BadgeMixin, BadgesList
+from udata.core.conditional import touch_document
 from udata.core.linkable import Linkable
 from udata.core.metrics.helpers import get_stock_metrics
 from udata.core.metrics.models import WithMetrics
@@ -43,6 +44,7 @@ from udata.mongo.url_field import URLField
 from udata.mongo.uuid_fields import AutoUUIDField
 from udata.uris import cdata_url
 
+from . import memberships
 from .constants import (
     ASSIGNABLE_OBJECT_TYPES,
     ASSOCIATION,
@@ -270,7 +272,6 @@ class Organization(
         ],
         "ordering": ["-created_at"],
         "queryset_class": OrganizationQuerySet,
-        "auto_create_index_on_save": True,
     }
 
     verbose_name = _("organization")
@@ -578,3 +579,8 @@ class Organization(
 pre_save.connect(Organization.pre_save, sender=Organization)
 post_save.connect(Organization.post_save, sender=Organization)
 post_save.connect(SpamMixin.post_save, sender=Organization)
+post_save.connect(touch_document, sender=Organization)
+post_delete.connect(touch_document, sender=Organization)
+pre_save.connect(memberships.on_organization_pre_save, sender=Organization)
+post_save.connect(memberships.on_organization_post_save, sender=Organization)
+post_delete.connect(memberships.on_organization_delete, sender=Organization)
@@ -2,8 +2,7 @@ from collections import namedtuple
 from functools import partial
 
 from udata.auth import Permission, current_user, identity_loaded
-from udata.core.organization.models import Organization
-from udata.utils import get_by
+from udata.core.organization import memberships
 
 OrganizationNeed = namedtuple("organization", ("role", "value"))
 OrganizationAdminNeed = partial(OrganizationNeed, "admin")
@@ -35,9 +34,8 @@ class OrganizationPrivatePermission(Permission):
 @identity_loaded.connect
 def inject_organization_needs(sender, identity):
     if current_user.is_authenticated:
-        for org in Organization.objects(members__user=current_user.id):
-            membership = get_by(org.members, user=current_user._get_current_object())
-            identity.provides.add(OrganizationNeed(membership.role, org.id))
+        for org_id, role in memberships.get(current_user).roles.items():
+            identity.provides.add(OrganizationNeed(role, org_id))
 
         from udata.core.organization.assignment import Assignment
 
@@ -1,6 +1,7 @@
 import logging
 
 from blinker import signal
+from bson import ObjectId
 from mongoengine import NULLIFY, Q, post_save
 from mongoengine.fields import ReferenceField
 
@@ -30,7 +31,7 @@ class OwnedQuerySet(UDataQuerySet):
         if user.sysadmin:
             return self()
 
-        owners: list[User | Organization] = list(user.organizations) + [user.id]
+        owners: list[ObjectId] = user.organization_ids + [user.id]
         # We create a new queryset because we want a pristine self._query_obj.
         owned_qs: OwnedQuerySet = self.__class__(self._document, self._collection_obj).owned_by(
             *owners
@@ -3,7 +3,7 @@ from datetime import UTC, datetime
 import mongoengine
 from bson.objectid import ObjectId
 from feedgenerator.django.utils.feedgenerator import Atom1Feed
-from flask import make_response, request
+from flask import request, url_for
 from flask_login import current_user
 
 from udata.api import API, api, errors
@@ -12,8 +12,10 @@ from udata.api_fields import patch, patch_and_save
 from udata.auth import admin_permission
 from udata.core.badges import api as badges_api
 from udata.core.badges.models import Badge
+from udata.core.conditional import conditional
 from udata.core.dataservices.models import Dataservice
 from udata.core.dataset.api_fields import dataset_ref_fields
+from udata.core.feeds import cached_feed
 from udata.core.followers.api import FollowAPI
 from udata.core.legal.mails import add_send_legal_notice_argument, send_legal_notice_on_deletion
 from udata.core.organization.models import Organization
@@ -140,37 +142,37 @@ class ReuseListAPI(API):
 class ReusesAtomFeedAPI(API):
     @api.doc("recent_reuses_atom_feed")
     def get(self):
-        feed = Atom1Feed(
-            _("Latests reuses"),
-            description=None,
-            feed_url=request.url,
-            link=request.url_root,
-        )
-
-        reuses = get_rss_feed_list(Reuse.objects.visible(), "created_at")
-        for reuse in reuses:
-            author_name = None
-            author_uri = None
-            if reuse.organization:
-                author_name = reuse.organization.name
-                author_uri = reuse.organization.url_for()
-            elif reuse.owner:
-                author_name = reuse.owner.fullname
-                author_uri = reuse.owner.url_for()
-            feed.add_item(
-                reuse.title,
-                unique_id=reuse.url_for(_useId=True),
-                description=reuse.description,
-                content=str(md(reuse.description)),
-                author_name=author_name,
-                author_link=author_uri,
-                link=reuse.url_for(),
-                updateddate=reuse.last_modified,
-                pubdate=reuse.created_at,
+        def render():
+            feed = Atom1Feed(
+                _("Latests reuses"),
+                description=None,
+                feed_url=url_for("api.recent_reuses_atom_feed", _external=True),
+                link=request.url_root,
             )
-        response = make_response(feed.writeString("utf-8"))
-        response.headers["Content-Type"] = "application/atom+xml"
-        return response
+            reuses = get_rss_feed_list(Reuse.objects.visible(), "created_at")
+            for reuse in reuses:
+                author_name = None
+                author_uri = None
+                if reuse.organization:
+                    author_name = reuse.organization.name
+                    author_uri = reuse.organization.url_for()
+                elif reuse.owner:
+                    author_name = reuse.owner.fullname
+                    author_uri = reuse.owner.url_for()
+                feed.add_item(
+                    reuse.title,
+                    unique_id=reuse.url_for(_useId=True),
+                    description=reuse.description,
+                    content=str(md(reuse.description)),
+                    author_name=author_name,
+                    author_link=author_uri,
+                    link=reuse.url_for(),
+                    updateddate=reuse.last_modified,
+                    pubdate=reuse.created_at,
+                )
+            return feed.writeString("utf-8").encode("utf-8")
+
+        return cached_feed("Reuse", {}, render)
 
 
 reuse_delete_parser = add_send_legal_notice_argument(api.parser())
@@ -181,6 +183,8 @@ reuse_delete_parser = add_send_legal_notice_argument(api.parser())
 @api.response(410, "Reuse has been deleted")
 class ReuseAPI(API):
     @api.doc("get_reuse")
+    @api.response(304, "Not modified")
+    @conditional("last_modified")
     @api.marshal_with(Reuse.__read_fields__)
     def get(self, reuse):
         """Fetch a given reuse"""
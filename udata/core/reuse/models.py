@@ -13,13 +13,15 @@ from mongoengine.fields import (
     ReferenceField,
     StringField,
 )
-from mongoengine.signals import post_save, pre_save
+from mongoengine.signals import post_delete, post_save, pre_save
 from werkzeug.utils import cached_property
 
 from udata.api_fields import field, generate_fields
 from udata.core.activity.models import Auditable
 from udata.core.badges.models import Badge, BadgeMixin, BadgesList
+from udata.core.conditional import touch_document
 from udata.core.dataset.api_fields import dataset_fields
+from udata.core.feeds import invalidate_feeds
 from udata.core.linkable import Linkable
 from udata.core.metrics.helpers import get_stock_metrics
 from udata.core.metrics.models import WithMetrics
@@ -210,7 +212,6 @@ class Reuse(
         + Owned.meta["indexes"],
         "ordering": ["-created_at"],
         "queryset_class": ReuseQuerySet,
-        "auto_create_index_on_save": True,
     }
 
     before_save = Signal()
@@ -353,3 +354,7 @@ class Reuse(
 pre_save.connect(Reuse.pre_save, sender=Reuse)
 post_save.connect(Reuse.post_save, sender=Reuse)
 post_save.connect(SpamMixin.post_save, sender=Reuse)
+post_save.connect(invalidate_feeds, sender=Reuse)
+post_delete.connect(invalidate_feeds, sender=Reuse)
+post_save.connect(touch_document, sender=Reuse)
+post_delete.connect(touch_document, sender=Reuse)
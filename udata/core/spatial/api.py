@@ -1,7 +1,6 @@
 import re
 
 from flask_restx import inputs
-from mongoengine.queryset.visitor import Q
 
 from udata.api import API, api
 from udata.core.dataset.api_fields import dataset_ref_fields
@@ -14,6 +13,7 @@ from .api_fields import (
     level_fields,
     zone_suggestion_fields,
 )
+from .index import get_index
 from .models import GeoLevel, GeoZone, spatial_granularities
 
 GEOM_TYPES = ("Point", "LineString", "Polygon", "MultiPoint", "MultiLineString", "MultiPolygon")
@@ -52,15 +52,9 @@ class SuggestZonesAPI(API):
     @api.expect(suggest_parser)
     @api.doc("suggest_zones")
     def get(self):
-        """Geospatial zones suggest endpoint using mongoDB contains"""
+        """Geospatial zones suggest endpoint using the in-memory zones index"""
         args = suggest_parser.parse_args()
-        geozones = GeoZone.objects(
-            Q(name__icontains=args["q"]) | Q(code__icontains=args["q"]) | Q(id__icontains=args["q"])
-        )
-
-        # We're manually sorting based on zone level int (cause we don't have the int value directly in mongo document)
-        level_id_to_int_level = {level.id: level.admin_level for level in GeoLevel.objects()}
-        geozones = sorted(geozones, key=lambda zone: level_id_to_int_level[zone.level])
+        geozones = get_index().suggest(args["q"], args["size"])
 
         return [
             {
@@ -70,7 +64,7 @@ class SuggestZonesAPI(API):
                 "level": geozone.level,
                 "uri": geozone.uri,
             }
-            for geozone in geozones[: args["size"]]
+            for geozone in geozones
         ]
 
 
@@ -90,8 +84,12 @@ class ZonesAPI(API):
     def get(self, ids):
         """Fetch a zone list as GeoJSON"""
         ids_list = list(map(legacy_geoid, ids))
-        zones = GeoZone.objects.in_bulk(ids_list)
-        zones = [zones[id] for id in ids_list]
+        zones = get_index().in_bulk(ids_list)
+        missing = [id for id in ids_list if id not in zones]
+        if missing:
+            # Zones created since the index was built
+            zones.update(GeoZone.objects.in_bulk(missing))
+        zones = [zones[id] for id in ids_list if id in zones]
         return {
             "type": "FeatureCollection",
             "features": [z.toGeoJSON() for z in zones],
@@ -153,10 +151,12 @@ class SpatialCoverageAPI(API):
     @api.marshal_list_with(feature_collection_fields)
     def get(self, level):
         """List each zone for a given level with their datasets count"""
-        level = GeoLevel.objects.get_or_404(id=level)
+        index = get_index()
+        if not index.has_level(level):
+            GeoLevel.objects.get_or_404(id=level)
         features = []
 
-        for zone in GeoZone.objects(level=level.id):
+        for zone in index.by_level(level):
             features.append(
                 {
                     "id": zone.id,
@@ -165,7 +165,7 @@ class SpatialCoverageAPI(API):
                         "name": _(zone.name),
                         "code": zone.code,
                         "uri": zone.uri,
-                        "datasets": zone.metrics.get("datasets", 0),
+                        "datasets": zone.datasets,
                     },
                 }
             )
@@ -1,7 +1,9 @@
+import codecs
 import json
 import logging
 import signal
 import sys
+import time
 from collections import Counter
 from contextlib import contextmanager
 from datetime import UTC, datetime
@@ -12,10 +14,12 @@ import requests
 import slugify
 from mongoengine import errors
 from mongoengine.context_managers import switch_collection
+from pymongo import ReplaceOne, UpdateOne
 
 from udata.commands import cli
 from udata.core.dataset.models import Dataset
 from udata.core.spatial import geoids
+from udata.core.spatial.index import invalidate as invalidate_index
 from udata.core.spatial.models import GeoLevel, GeoZone, SpatialCoverage
 
 log = logging.getLogger(__name__)
@@ -24,6 +28,9 @@ log = logging.getLogger(__name__)
 DEFAULT_GEOZONES_FILE = "https://www.data.gouv.fr/datasets/r/a1bb263a-6cc7-4871-ab4f-2470235a67bf"
 DEFAULT_LEVELS_FILE = "https://www.data.gouv.fr/datasets/r/e0206442-78b3-4a00-b71c-c065d20561c8"
 
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
 
 @cli.group("spatial")
 def grp():
@@ -31,43 +38,192 @@ def grp():
     pass
 
 
-def load_levels(col, json_levels):
-    for i, level in enumerate(json_levels):
-        col.objects(id=level["id"]).modify(
-            upsert=True, set__name=level["label"], set__admin_level=level.get("admin_level")
-        )
-    return i
+def iter_json_array(chunks):
+    """
+    Incrementally parse a JSON array from an iterable of text or bytes chunks,
+    yielding each item as soon as it is complete.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    retry_at = 0  # Avoid reparsing a big incomplete item on each chunk
+
+    def parse(final=False):
+        nonlocal buffer, pos, started, retry_at
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                return False
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return True
+            if not final and len(buffer) < retry_at:
+                return False
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                if not final and end == len(buffer) and not isinstance(item, (dict, list)):
+                    # A scalar may be truncated (ie. a number), wait for more data
+                    raise json.JSONDecodeError("Truncated value", buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # Retry once the pending data size has doubled (buffer is rebased on `pos`)
+                retry_at = 2 * (len(buffer) - pos)
+                return False
+            pos = end
+            retry_at = 0
+            yield item
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + (utf8.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        pos = 0
+        if (yield from parse()):
+            return
+    buffer = buffer[pos:] + utf8.decode(b"", final=True)
+    pos = 0
+    if not (yield from parse(final=True)):
+        raise ValueError("Unexpected end of JSON array")
+
+
+def iter_json_file(filename):
+    """Stream items from a JSON array, either from a local path or a remote URL"""
+    if filename.startswith("http"):
+        with requests.get(filename, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_json_array(response.iter_content(CHUNK_SIZE))
+    else:
+        with open(filename, "rb") as f:
+            yield from iter_json_array(iter(lambda: f.read(CHUNK_SIZE), b""))
 
 
-def load_zones(col, json_geozones):
-    loaded_geozones = 0
-    for _, geozone in enumerate(json_geozones):
-        if geozone.get("is_deleted", False):
-            continue
-        params = {
-            "slug": slugify.slugify(geozone["nom"], separator="-"),
-            "level": str(geozone["level"]),
-            "code": geozone["codeINSEE"],
-            "name": geozone["nom"],
-            "uri": geozone["uri"],
-        }
-        try:
-            col.objects(id=geozone["_id"]).modify(
-                upsert=True, **{"set__{0}".format(k): v for k, v in params.items()}
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parsed(doc, fields):
+    """The mongo representation of a validated document, restricted to its parsed `fields`"""
+    data = doc.to_mongo().to_dict()
+    db_fields = {doc._fields[name].db_field for name in fields}
+    return {k: v for k, v in data.items() if k in db_fields}
+
+
+def write_batch(collection, documents, upsert):
+    """
+    Write a batch of validated documents with a single unordered `bulk_write`.
+
+    In upsert mode only the given fields are set (other fields like metrics are kept),
+    otherwise documents are fully replaced (used for the staging collection).
+    """
+    # Only keep the last occurrence of a given id, unordered writes would race otherwise
+    documents = {doc["_id"]: doc for doc in documents}
+    if not documents:
+        return 0
+    if upsert:
+        requests_ = [
+            UpdateOne(
+                {"_id": id}, {"$set": {k: v for k, v in doc.items() if k != "_id"}}, upsert=True
+            )
+            for id, doc in documents.items()
+        ]
+    else:
+        requests_ = [ReplaceOne({"_id": id}, doc, upsert=True) for id, doc in documents.items()]
+    collection.bulk_write(requests_, ordered=False)
+    return len(documents)
+
+
+def load_levels(collection, json_levels, upsert=True, batch_size=BATCH_SIZE):
+    loaded_levels = 0
+    for batch in batched(json_levels, batch_size):
+        documents = []
+        for level in batch:
+            doc = GeoLevel(
+                id=level["id"], name=level["label"], admin_level=level.get("admin_level")
             )
-            loaded_geozones += 1
-        except errors.ValidationError as e:
-            log.warning("Validation error (%s) for %s with %s", e, geozone["nom"], params)
-            continue
+            try:
+                doc.validate()
+            except errors.ValidationError as e:
+                log.warning("Validation error (%s) for level %s", e, level["id"])
+                continue
+            documents.append(parsed(doc, ("id", "name", "admin_level")))
+        loaded_levels += write_batch(collection, documents, upsert)
+    return loaded_levels
+
+
+def load_zones(collection, json_geozones, upsert=True, batch_size=BATCH_SIZE):
+    loaded_geozones = 0
+    start = time.monotonic()
+    for batch in batched(json_geozones, batch_size):
+        documents = []
+        for geozone in batch:
+            if geozone.get("is_deleted", False):
+                continue
+            params = {
+                "slug": slugify.slugify(geozone["nom"], separator="-"),
+                "level": str(geozone["level"]),
+                "code": geozone["codeINSEE"],
+                "name": geozone["nom"],
+                "uri": geozone["uri"],
+            }
+            doc = GeoZone(id=geozone["_id"], **params)
+            try:
+                doc.validate()
+            except errors.ValidationError as e:
+                log.warning("Validation error (%s) for %s with %s", e, geozone["nom"], params)
+                continue
+            documents.append(parsed(doc, ("id", *params)))
+        loaded_geozones += write_batch(collection, documents, upsert)
+        elapsed = time.monotonic() - start
+        log.debug(
+            "%s zones loaded (%.0f zones/s)", loaded_geozones, loaded_geozones / (elapsed or 1)
+        )
     return loaded_geozones
 
 
+def load_collection(model, loader, items, drop, ts, batch_size):
+    """
+    Load `items` into the `model` collection using `loader`.
+
+    When dropping existing data, items are loaded into a staging collection
+    which atomically replaces the live one once fully loaded and indexed.
+    """
+    start = time.monotonic()
+    if drop and model.objects.count():
+        target = model._get_collection_name()
+        name = "_".join((target, ts))
+        staging = model._get_db()[name]
+        with handle_error(staging):
+            total = loader(staging, items, upsert=False, batch_size=batch_size)
+            with switch_collection(model, name):
+                model.ensure_indexes()
+            staging.rename(target, dropTarget=True)
+    else:
+        with handle_error():
+            total = loader(model._get_collection(), items, upsert=True, batch_size=batch_size)
+    elapsed = time.monotonic() - start
+    return total, elapsed
+
+
 @contextmanager
 def handle_error(to_delete=None):
     """
     Handle errors while loading.
     In case of error, properly log it, remove the temporary files and collections and exit.
-    If `to_delete` is given a collection, it will be deleted deleted.
+    If `to_delete` is given a collection, it will be deleted.
     """
     # Handle keyboard interrupt
     signal.signal(signal.SIGINT, signal.default_int_handler)
@@ -81,9 +237,9 @@ def handle_error(to_delete=None):
         log.error(e)
     else:
         return  # Nothing to do in case of success
-    if to_delete:
-        log.info("Removing temporary collection %s", to_delete._get_collection_name())
-        to_delete.drop_collection()
+    if to_delete is not None:
+        log.info("Removing temporary collection %s", to_delete.name)
+        to_delete.drop()
     sys.exit(-1)
 
 
@@ -91,50 +247,32 @@ def handle_error(to_delete=None):
 @click.argument("geozones-file", default=DEFAULT_GEOZONES_FILE)
 @click.argument("levels-file", default=DEFAULT_LEVELS_FILE)
 @click.option("-d", "--drop", is_flag=True, help="Drop existing data")
-def load(geozones_file, levels_file, drop=False):
+@click.option(
+    "-b", "--batch-size", default=BATCH_SIZE, show_default=True, help="Number of items per write"
+)
+def load(geozones_file, levels_file, drop=False, batch_size=BATCH_SIZE):
     """
     Load a geozones archive from <filename>
 
     <filename> can be either a local path or a remote URL.
+    Files are streamed and written by batches.
     """
-    log.info("Loading GeoZones levels")
-    if levels_file.startswith("http"):
-        json_levels = requests.get(levels_file).json()
-    else:
-        with open(levels_file) as f:
-            json_levels = json.load(f)
-
     ts = datetime.now(UTC).isoformat().replace("-", "").replace(":", "").split(".")[0]
-    if drop and GeoLevel.objects.count():
-        name = "_".join((GeoLevel._get_collection_name(), ts))
-        target = GeoLevel._get_collection_name()
-        with switch_collection(GeoLevel, name):
-            with handle_error(GeoLevel):
-                total = load_levels(GeoLevel, json_levels)
-                GeoLevel.objects._collection.rename(target, dropTarget=True)
-    else:
-        with handle_error():
-            total = load_levels(GeoLevel, json_levels)
+
+    log.info("Loading GeoZones levels")
+    json_levels = iter_json_file(levels_file)
+    total, elapsed = load_collection(GeoLevel, load_levels, json_levels, drop, ts, batch_size)
     log.info("Loaded {total} levels".format(total=total))
 
     log.info("Loading Zones")
-    if geozones_file.startswith("http"):
-        json_geozones = requests.get(geozones_file).json()
-    else:
-        with open(geozones_file) as f:
-            json_geozones = json.load(f)
-
-    if drop and GeoZone.objects.count():
-        name = "_".join((GeoZone._get_collection_name(), ts))
-        target = GeoZone._get_collection_name()
-        with switch_collection(GeoZone, name):
-            with handle_error(GeoZone):
-                total = load_zones(GeoZone, json_geozones)
-                GeoZone.objects._collection.rename(target, dropTarget=True)
-    else:
-        with handle_error():
-            total = load_zones(GeoZone, json_geozones)
-    log.info("Loaded {total} zones".format(total=total))
+    json_geozones = iter_json_file(geozones_file)
+    total, elapsed = load_collection(GeoZone, load_zones, json_geozones, drop, ts, batch_size)
+    log.info(
+        "Loaded {total} zones in {elapsed:.1f}s ({rate:.0f} zones/s)".format(
+            total=total, elapsed=elapsed, rate=total / (elapsed or 1)
+        )
+    )
+    invalidate_index()
 
     log.info("Clean removed geozones in datasets")
     count = fixup_removed_geozone()
@@ -0,0 +1,270 @@
+"""
+In-memory GeoZone index.
+
+GeoZones are a mostly static referential (loaded with `udata spatial load`)
+which is read on every zone suggestion, zone lookup and coverage request.
+Instead of querying MongoDB on each of those requests, each process keeps
+a lazily built index of all zones and levels.
+
+The index is invalidated:
+- when a `GeoZone` or a `GeoLevel` is saved or deleted in this process
+- when another process bumps the shared version stored in the cache
+  (see `invalidate()`, called by the loading command and after metrics computation)
+- after `SPATIAL_ZONES_INDEX_TTL` seconds as a safety net
+"""
+
+import logging
+import threading
+import time
+import unicodedata
+import uuid
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from flask import current_app
+from mongoengine.signals import post_delete, post_save
+
+from udata.app import cache
+from udata.core.metrics.signals import on_counters_computed
+from udata.i18n import _
+
+from .models import GeoLevel, GeoZone
+
+log = logging.getLogger(__name__)
+
+__all__ = ("GeoZoneIndex", "IndexedZone", "get_index", "invalidate", "normalize")
+
+VERSION_CACHE_KEY = "spatial:geozones-index-version"
+EXTENSION_KEY = "geozones_index"
+
+# Rank given to zones whose level is unknown (same as `GeoLevel.admin_level` default)
+DEFAULT_LEVEL_RANK = 100
+
+# Bumped on local writes so the current process never serves a stale index,
+# even when no shared cache is configured.
+_local_version = 0
+
+
+def normalize(value):
+    """Normalize a string for case and accent insensitive lookups"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(value))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedZone:
+    """A lightweight read-only GeoZone representation"""
+
+    id: str
+    slug: str
+    name: str
+    code: str
+    level: str
+    uri: str | None
+    datasets: int
+    rank: int
+    keys: tuple[str, str, str]  # Normalized (name, code, id)
+
+    def toGeoJSON(self):
+        return {
+            "id": self.id,
+            "type": "Feature",
+            "properties": {
+                "slug": self.slug,
+                "name": _(self.name),
+                "code": self.code,
+                "uri": self.uri,
+                "level": self.level,
+            },
+        }
+
+
+@dataclass
+class _LevelBucket:
+    """Zones of a single level with sorted keys for prefix lookups"""
+
+    rank: int
+    zones: list[IndexedZone] = field(default_factory=list)
+    sorted_keys: list[tuple[str, int]] = field(default_factory=list)
+
+    def freeze(self):
+        self.zones.sort(key=lambda z: (z.keys[0], z.id))
+        self.sorted_keys = sorted(
+            (key, position)
+            for position, zone in enumerate(self.zones)
+            for key in set(zone.keys)
+            if key
+        )
+
+    def prefixed(self, q):
+        """Positions of zones having a key starting with `q`"""
+        start = bisect_left(self.sorted_keys, (q,))
+        positions = set()
+        for key, position in self.sorted_keys[start:]:
+            if not key.startswith(q):
+                break
+            positions.add(position)
+        return positions
+
+
+class GeoZoneIndex:
+    """
+    A read-only snapshot of all known GeoZones and GeoLevels.
+
+    Suggestions are ranked by level (`GeoLevel.admin_level`) first,
+    then exact matches, prefix matches and finally substring matches,
+    each group being sorted by name.
+    """
+
+    def __init__(self, zones, levels, version=None):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.levels = {
+            level["_id"]: level.get("admin_level", DEFAULT_LEVEL_RANK) for level in levels
+        }
+        self.zones = {}
+        buckets = {}
+        for zone in zones:
+            rank = self.levels.get(zone["level"], DEFAULT_LEVEL_RANK)
+            indexed = IndexedZone(
+                id=zone["_id"],
+                slug=zone.get("slug"),
+                name=zone.get("name"),
+                code=zone.get("code"),
+                level=zone["level"],
+                uri=zone.get("uri"),
+                datasets=(zone.get("metrics") or {}).get("datasets", 0),
+                rank=rank,
+                keys=(
+                    normalize(zone.get("name")),
+                    normalize(zone.get("code")),
+                    normalize(zone["_id"]),
+                ),
+            )
+            self.zones[indexed.id] = indexed
+            buckets.setdefault(indexed.level, _LevelBucket(rank)).zones.append(indexed)
+        for bucket in buckets.values():
+            bucket.freeze()
+        self._buckets = buckets
+        self._ranked_buckets = sorted(buckets.items(), key=lambda item: (item[1].rank, item[0]))
+
+    @classmethod
+    def load(cls, version=None):
+        """Build an index from the database"""
+        start = time.monotonic()
+        levels = GeoLevel.objects.only("id", "admin_level").as_pymongo()
+        zones = GeoZone.objects.only(
+            "id", "slug", "name", "code", "level", "uri", "metrics"
+        ).as_pymongo()
+        index = cls(zones, levels, version=version)
+        log.debug(
+            "GeoZones index built with %s zones in %.3fs", len(index), time.monotonic() - start
+        )
+        return index
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __contains__(self, id):
+        return id in self.zones
+
+    def get(self, id):
+        return self.zones.get(id)
+
+    def in_bulk(self, ids):
+        """Same as `QuerySet.in_bulk`: a dict of known zones by id"""
+        return {id: self.zones[id] for id in ids if id in self.zones}
+
+    def has_level(self, level):
+        return level in self.levels
+
+    def by_level(self, level):
+        """All zones of a given level, sorted by code"""
+        bucket = self._buckets.get(level)
+        if not bucket:
+            return []
+        return sorted(bucket.zones, key=lambda z: (z.code or "", z.id))
+
+    def suggest(self, q, size=10):
+        """
+        Suggest zones whose name, code or id contains `q`.
+
+        Levels are processed from the highest (lowest `admin_level`) to the lowest
+        and the lookup stops as soon as `size` suggestions have been found.
+        """
+        q = normalize(q).strip()
+        if not q or size <= 0:
+            return []
+        results = []
+        for _level, bucket in self._ranked_buckets:
+            remaining = size - len(results)
+            if remaining <= 0:
+                break
+            prefixed = bucket.prefixed(q)
+            exact = sorted(p for p in prefixed if q in bucket.zones[p].keys)
+            matches = exact + sorted(prefixed.difference(exact))
+            if len(matches) < remaining:
+                # Substring lookup only when prefixes are not enough
+                for position, zone in enumerate(bucket.zones):
+                    if position in prefixed:
+                        continue
+                    if any(q in key for key in zone.keys):
+                        matches.append(position)
+                        if len(matches) >= remaining:
+                            break
+            results.extend(bucket.zones[p] for p in matches[:remaining])
+        return results
+
+
+class _IndexHolder:
+    def __init__(self):
+        self.index = None
+        self.lock = threading.Lock()
+
+
+def _current_version():
+    return (_local_version, cache.get(VERSION_CACHE_KEY))
+
+
+def _is_fresh(index, version):
+    if index is None or index.version != version:
+        return False
+    ttl = current_app.config["SPATIAL_ZONES_INDEX_TTL"]
+    return not ttl or time.monotonic() - index.built_at < ttl
+
+
+def get_index():
+    """Get the current application GeoZone index, (re)building it if needed"""
+    holder = current_app.extensions.setdefault(EXTENSION_KEY, _IndexHolder())
+    version = _current_version()
+    if _is_fresh(holder.index, version):
+        return holder.index
+    with holder.lock:
+        # Another thread may have rebuilt it while we were waiting
+        if not _is_fresh(holder.index, version):
+            holder.index = GeoZoneIndex.load(version=version)
+        return holder.index
+
+
+def invalidate():
+    """Invalidate the GeoZone index in this process and in every process sharing the cache"""
+    global _local_version
+    _local_version += 1
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=0)
+
+
+def _on_write(sender, document, **kwargs):
+    invalidate()
+
+
+@on_counters_computed.connect_via("geozones")
+def _on_metrics_computed(family, **kwargs):
+    invalidate()
+
+
+post_save.connect(_on_write, sender=GeoZone)
+post_delete.connect(_on_write, sender=GeoZone)
+post_save.connect(_on_write, sender=GeoLevel)
+post_delete.connect(_on_write, sender=GeoLevel)
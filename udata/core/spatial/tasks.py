@@ -1,8 +1,10 @@
-from udata.core.spatial.models import GeoZone
+from udata.core.metrics.counters import compute_counters
 from udata.tasks import job
 
+# Invalidates the GeoZones index once metrics are computed
+from . import index  # noqa: F401
+
 
 @job("compute-geozones-metrics")
 def compute_geozones_metrics(self):
-    for geozone in GeoZone.objects.timeout(False):
-        geozone.count_datasets()
+    compute_counters("geozones")
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from udata.core.spatial.factories import GeoLevelFactory, GeoZoneFactory
+from udata.core.spatial.models import GeoLevel, GeoZone
+from udata.tests.api import PytestOnlyDBTestCase
+
+from ..commands import iter_json_array, load_zones
+
+LEVELS = [
+    {"id": "fr:region", "label": "French region", "admin_level": 40},
+    {"id": "fr:commune", "label": "French town", "admin_level": 80},
+]
+
+ZONES = [
+    {
+        "_id": "fr:region:93",
+        "level": "fr:region",
+        "codeINSEE": "93",
+        "nom": "Provence-Alpes-Côte d'Azur",
+        "uri": "http://example.org/93",
+        "geom": {"type": "MultiPolygon", "coordinates": [[[[5.0, 43.0], [5.1, 43.1]]]]},
+    },
+    {
+        "_id": "fr:commune:13004",
+        "level": "fr:commune",
+        "codeINSEE": "13004",
+        "nom": "Arles",
+        "uri": "http://example.org/13004",
+    },
+    {
+        "_id": "fr:commune:13055",
+        "level": "fr:commune",
+        "codeINSEE": "13055",
+        "nom": "Marseille",
+        "uri": "http://example.org/13055",
+        "is_deleted": True,
+    },
+]
+
+
+def chunked(data, size):
+    raw = json.dumps(data).encode()
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+class IterJsonArrayTest:
+    @pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+    def test_stream_items(self, size):
+        assert list(iter_json_array(chunked(ZONES, size))) == ZONES
+
+    def test_text_chunks(self):
+        assert list(iter_json_array([" [1, ", '{"a": "é"}', " ]"])) == [1, {"a": "é"}]
+
+    def test_empty_array(self):
+        assert list(iter_json_array(["[]"])) == []
+
+    def test_not_an_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(['{"a": 1}']))
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(['[{"a": 1}, {"b"']))
+
+
+class SpatialLoadCommandTest(PytestOnlyDBTestCase):
+    @pytest.fixture
+    def files(self, tmp_path):
+        levels_file = tmp_path / "levels.json"
+        levels_file.write_text(json.dumps(LEVELS))
+        zones_file = tmp_path / "zones.json"
+        zones_file.write_text(json.dumps(ZONES))
+        return str(zones_file), str(levels_file)
+
+    def test_load(self, files):
+        zone = GeoZoneFactory(id="fr:commune:13004", level="fr:commune", code="13004")
+        zone.metrics["datasets"] = 3
+        zone.save()
+
+        self.cli("spatial", "load", *files, "--batch-size", "1")
+
+        assert GeoLevel.objects.count() == 2
+        assert GeoLevel.objects.get(id="fr:commune").admin_level == 80
+        assert GeoZone.objects.count() == 2
+        arles = GeoZone.objects.get(id="fr:commune:13004")
+        assert arles.name == "Arles"
+        assert arles.slug == "arles"
+        # Fields not provided by the file are kept
+        assert arles.metrics["datasets"] == 3
+
+    def test_load_zones_keeps_metrics(self):
+        zone = GeoZoneFactory(id="fr:commune:13004", level="fr:commune", code="13004")
+        GeoZone.objects(id=zone.id).update(set__metrics={"datasets": 3})
+
+        assert load_zones(GeoZone._get_collection(), ZONES) == 2
+
+        arles = GeoZone.objects.get(id="fr:commune:13004")
+        assert arles.name == "Arles"
+        assert arles.metrics == {"datasets": 3}
+        assert GeoZone.objects.get(id="fr:region:93").metrics == {}
+
+    def test_load_drop(self, files):
+        GeoLevelFactory(id="fr:obsolete")
+        GeoZoneFactory(id="fr:obsolete:1", level="fr:obsolete")
+
+        self.cli("spatial", "load", *files, "--drop")
+
+        assert sorted(GeoLevel.objects.values_list("id")) == ["fr:commune", "fr:region"]
+        assert sorted(GeoZone.objects.values_list("id")) == ["fr:commune:13004", "fr:region:93"]
+        indexes = GeoZone._get_collection().index_information()
+        assert any(("name", 1) in index["key"] for index in indexes.values())
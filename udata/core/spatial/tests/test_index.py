@@ -0,0 +1,115 @@
+from udata.core.spatial.factories import GeoLevelFactory, GeoZoneFactory
+from udata.tests.api import PytestOnlyDBTestCase
+
+from ..index import GeoZoneIndex, get_index, normalize
+
+LEVELS = [
+    {"_id": "fr:region", "admin_level": 40},
+    {"_id": "fr:departement", "admin_level": 60},
+    {"_id": "fr:commune", "admin_level": 80},
+]
+
+
+def zone(level, code, name, **kwargs):
+    return {
+        "_id": f"{level}:{code}",
+        "slug": name.lower(),
+        "name": name,
+        "code": code,
+        "level": level,
+        "uri": f"http://example.org/{code}",
+        **kwargs,
+    }
+
+
+def build_index():
+    return GeoZoneIndex(
+        [
+            zone("fr:commune", "13004", "Arles"),
+            zone("fr:commune", "75056", "Paris", metrics={"datasets": 3}),
+            zone("fr:commune", "91377", "Massy-Palaiseau"),
+            zone("fr:departement", "75", "Paris"),
+            zone("fr:departement", "13", "Bouches-du-Rhône"),
+            zone("fr:region", "93", "Provence-Alpes-Côte d'Azur"),
+        ],
+        LEVELS,
+    )
+
+
+class GeoZoneIndexTest:
+    def test_normalize(self):
+        assert normalize("Côte d'Azur") == "cote d'azur"
+        assert normalize("ÉLANCOURT") == "elancourt"
+        assert normalize(None) == ""
+
+    def test_suggest_ranked_by_level(self):
+        index = build_index()
+
+        results = index.suggest("paris", 10)
+
+        assert [z.id for z in results] == ["fr:departement:75", "fr:commune:75056"]
+
+    def test_suggest_accents_and_case_insensitive(self):
+        index = build_index()
+
+        assert [z.id for z in index.suggest("COTE", 10)] == ["fr:region:93"]
+        assert [z.id for z in index.suggest("rhone", 10)] == ["fr:departement:13"]
+
+    def test_suggest_prefix_before_substring(self):
+        index = build_index()
+
+        results = index.suggest("pa", 10)
+
+        # `fr:departement:13` matches on its id
+        assert [z.id for z in results] == [
+            "fr:departement:75",
+            "fr:departement:13",
+            "fr:commune:75056",
+            "fr:commune:91377",
+        ]
+
+    def test_suggest_on_code_and_id(self):
+        index = build_index()
+
+        assert [z.id for z in index.suggest("13004", 10)] == ["fr:commune:13004"]
+        assert [z.id for z in index.suggest("fr:region", 10)] == ["fr:region:93"]
+
+    def test_suggest_size(self):
+        index = build_index()
+
+        assert len(index.suggest("a", 2)) == 2
+        assert index.suggest("a", 0) == []
+        assert index.suggest("", 10) == []
+
+    def test_in_bulk(self):
+        index = build_index()
+
+        zones = index.in_bulk(["fr:commune:75056", "unknown"])
+
+        assert list(zones.keys()) == ["fr:commune:75056"]
+        assert zones["fr:commune:75056"].datasets == 3
+        assert zones["fr:commune:75056"].toGeoJSON()["properties"]["slug"] == "paris"
+
+    def test_by_level(self):
+        index = build_index()
+
+        assert [z.code for z in index.by_level("fr:commune")] == ["13004", "75056", "91377"]
+        assert index.by_level("unknown") == []
+        assert index.has_level("fr:region")
+        assert not index.has_level("unknown")
+
+
+class GeoZoneIndexLifecycleTest(PytestOnlyDBTestCase):
+    def test_index_is_rebuilt_on_write(self):
+        level = GeoLevelFactory(id="fr:commune", admin_level=80)
+        GeoZoneFactory(id="fr:commune:13004", level=level.id, name="Arles", code="13004")
+
+        index = get_index()
+        assert get_index() is index
+        assert "fr:commune:13004" in index
+
+        GeoZoneFactory(id="fr:commune:75056", level=level.id, name="Paris", code="75056")
+
+        rebuilt = get_index()
+        assert rebuilt is not index
+        assert "fr:commune:75056" in rebuilt
@@ -28,6 +28,7 @@ images = fs.Storage("images", fs.IMAGES)
 chunks = fs.Storage("chunks", AUTHORIZED_TYPES)
 tmp = fs.Storage("tmp", fs.ALL, upload_to=tmp_upload_to)
 references = fs.Storage("references", AUTHORIZED_TYPES)
+profiles = fs.Storage("profiles", fs.ALL)
 
 
 def default_image_basename(*args, **kwargs):
@@ -38,4 +39,4 @@ def default_image_basename(*args, **kwargs):
 def init_app(app):
     if "BUCKETS_PREFIX" not in app.config:
         app.config["BUCKETS_PREFIX"] = "/s"
-    fs.init_app(app, resources, avatars, logos, images, chunks, tmp, references)
+    fs.init_app(app, resources, avatars, logos, images, chunks, tmp, references, profiles)
@@ -12,7 +12,7 @@ __all__ = ("Tag",)
 
 class Tag(Document):
     """
-    This collection is auto-populated every hour map-reducing tag properties
+    This collection is auto-populated every hour aggregating tag properties
     from Datasets dans Reuses.
     """
 
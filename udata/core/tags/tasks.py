@@ -1,4 +1,8 @@
 import logging
+import time
+from collections import defaultdict
+
+from pymongo import DeleteMany, UpdateOne
 
 from udata.models import Dataset, Reuse
 from udata.tasks import job
@@ -7,23 +11,7 @@ from .models import Tag
 
 log = logging.getLogger(__name__)
 
-map_tags = """
-function() {
-    this.tags.forEach(function(tag) {
-        emit(tag, 1);
-    });
-}
-"""
-
-reduce_tags = """
-function(key, values) {
-    var total = 0;
-    for(var i = 0; i < values.length; i++) {
-        total += values[i];
-    }
-    return total;
-}
-"""
+BATCH_SIZE = 1000
 
 TAGGED = {
     "datasets": Dataset,
@@ -31,13 +19,47 @@ TAGGED = {
 }
 
 
+def aggregate_tags(model) -> dict:
+    """Count tag occurences of a model with a single aggregation"""
+    pipeline = [
+        {"$match": {"tags.0": {"$exists": True}}},
+        {"$project": {"tags": 1}},
+        {"$unwind": "$tags"},
+        {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+    ]
+    results = model._get_collection().aggregate(pipeline, allowDiskUse=True)
+    return {row["_id"]: row["count"] for row in results}
+
+
+def write_tags(counts: dict, batch_size: int = BATCH_SIZE) -> int:
+    """Upsert tag counts with unordered bulk writes and remove tags no longer used"""
+    collection = Tag._get_collection()
+    operations = []
+    for name, tag_counts in counts.items():
+        operations.append(
+            UpdateOne(
+                {"name": name},
+                {"$set": {"counts": tag_counts, "total": sum(tag_counts.values())}},
+                upsert=True,
+            )
+        )
+        if len(operations) >= batch_size:
+            collection.bulk_write(operations, ordered=False)
+            operations = []
+    operations.append(DeleteMany({"name": {"$nin": list(counts)}}))
+    collection.bulk_write(operations, ordered=False)
+    return len(counts)
+
+
 @job("count-tags")
 def count_tags(self):
     """Count tag occurences by type and update the tag collection"""
+    counts = defaultdict(dict)
     for key, model in TAGGED.items():
-        collection = "{0}_tags".format(key)
-        results = model.objects(tags__exists=True).map_reduce(map_tags, reduce_tags, collection)
-        for result in results:
-            tag, _ = Tag.objects.get_or_create(name=result.key)
-            tag.counts[key] = int(result.value) if result.value else 0
-            tag.save()
+        start = time.perf_counter()
+        for name, count in aggregate_tags(model).items():
+            counts[name][key] = count
+        log.info(f"Counted {key} tags in {time.perf_counter() - start:.4f} seconds.")
+    start = time.perf_counter()
+    updated = write_tags(counts)
+    log.info(f"Updated {updated} tags in {time.perf_counter() - start:.4f} seconds.")
@@ -68,7 +68,6 @@ class TopicElement(Auditable, Document):
                 "fields": ["$title", "$description"],
             }
         ],
-        "auto_create_index_on_save": True,
     }
 
     after_save = Signal()
@@ -131,7 +130,6 @@ class Topic(Datetimed, Auditable, Linkable, Document[OwnedQuerySet], Owned):
         ]
         + Owned.meta["indexes"],
         "ordering": ["-created_at"],
-        "auto_create_index_on_save": True,
         "queryset_class": OwnedQuerySet,
     }
 
@@ -142,7 +142,7 @@ class MyOrgDatasetsAPI(API):
     def get(self):
         """List all datasets related to me and my organizations."""
         q = filter_parser.parse_args().get("q")
-        owners = list(current_user.organizations) + [current_user.id]
+        owners = current_user.organization_ids + [current_user.id]
         datasets = Dataset.objects.owned_by(*owners).order_by("-last_modified")
         if q:
             datasets = datasets.filter(title__icontains=q)
@@ -158,7 +158,7 @@ class MyOrgCommunityResourcesAPI(API):
     def get(self):
         """List all community resources related to me and my organizations."""
         q = filter_parser.parse_args().get("q")
-        owners = list(current_user.organizations) + [current_user.id]
+        owners = current_user.organization_ids + [current_user.id]
         community_resources = CommunityResource.objects.owned_by(*owners).order_by("-last_modified")
         if q:
             community_resources = community_resources.filter(title__icontains=q)
@@ -174,7 +174,7 @@ class MyOrgReusesAPI(API):
     def get(self):
         """List all reuses related to me and my organizations."""
         q = filter_parser.parse_args().get("q")
-        owners = list(current_user.organizations) + [current_user.id]
+        owners = current_user.organization_ids + [current_user.id]
         reuses = Reuse.objects.owned_by(*owners).order_by("-last_modified")
         if q:
             reuses = reuses.filter(title__icontains=q)
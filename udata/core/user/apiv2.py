@@ -19,7 +19,7 @@ class MyOrgTopicsAPI(API):
     def get(self):
         """List all topics related to me and my organizations."""
         args = topic_parser.parse()
-        owners = list(current_user.organizations) + [current_user.id]
+        owners = current_user.organization_ids + [current_user.id]
         topics = Topic.objects.owned_by(*owners)
         topics = topic_parser.parse_filters(topics, args)
         sort = args["sort"] or ("$text_score" if args["q"] else None) or "-last-modified"
@@ -190,7 +190,6 @@ class User(SpamMixin, WithMetrics, UserMixin, Linkable, Document):
             "slug",
         ],
         "ordering": ["-created_at"],
-        "auto_create_index_on_save": True,
     }
 
     verbose_name = _("account")
@@ -213,11 +212,21 @@ class User(SpamMixin, WithMetrics, UserMixin, Linkable, Document):
     def fullname(self):
         return " ".join((self.first_name or "", self.last_name or "")).strip()
 
+    @property
+    def organization_ids(self) -> list:
+        """The ids of the user organizations (see `udata.core.organization.memberships`)"""
+        from udata.core.organization import memberships
+
+        return list(memberships.get(self).active)
+
     @cached_property
     def organizations(self):
         from udata.core.organization.models import Organization
 
-        return Organization.objects(members__user=self, deleted__exists=False)
+        ids = self.organization_ids
+        if not ids:
+            return Organization.objects.none()
+        return Organization.objects(id__in=ids)
 
     @property
     def sysadmin(self):
@@ -254,16 +263,18 @@ class User(SpamMixin, WithMetrics, UserMixin, Linkable, Document):
         """Return the number of datasets of user's organizations."""
         from udata.models import Dataset  # Circular imports.
 
-        return sum(
-            Dataset.objects(organization=org).visible().count() for org in self.organizations
-        )
+        ids = self.organization_ids
+        return Dataset.objects(organization__in=ids).visible().count() if ids else 0
 
     @cached_property
     def followers_org_count(self):
         """Return the number of followers of user's organizations."""
-        from udata.models import Follow  # Circular imports.
+        from udata.models import Follow, Organization  # Circular imports.
 
-        return sum(Follow.objects(following=org).count() for org in self.organizations)
+        ids = self.organization_ids
+        if not ids:
+            return 0
+        return Follow.objects(following__in=[Organization(id=id) for id in ids]).count()
 
     @property
     def datasets_count(self):
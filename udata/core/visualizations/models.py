@@ -183,7 +183,6 @@ class Chart(Datetimed, Auditable, WithMetrics, Linkable, Owned, UDataDocument[Ch
         + Owned.meta["indexes"],
         "ordering": ["-created_at"],
         "queryset_class": ChartQuerySet,
-        "auto_create_index_on_save": True,
     }
 
     after_save = Signal()
@@ -0,0 +1,187 @@
+"""
+Batch helpers for large data migrations
+
+Instead of iterating over `Model.objects` and saving documents one by one, migrations can:
+
+- iterate over documents by batches in `_id` order with `batches()`,
+- accumulate writes in a `BulkWriter`, flushed with unordered `bulk_write`,
+- split the work over `_id` ranges processed by parallel workers with `parallel()`.
+
+The last `_id` of each processed batch is checkpointed in the migration record:
+if the migration fails, `udata db migrate` resumes it after the last completed batch.
+Batches may be processed again on resume so changes must be idempotent.
+
+    def migrate(db):
+        with BulkWriter(db.dataset) as writer:
+            for batch in batches(db.dataset, {"extras.legacy": {"$exists": True}}, writer=writer):
+                for dataset in batch:
+                    writer.update_one({"_id": dataset["_id"]}, {"$unset": {"extras.legacy": True}})
+"""
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import InsertOne, UpdateOne
+
+from udata.db.migrations import current_migration
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+WORKERS = 4
+
+
+def _collection(source):
+    """Accept a model or a pymongo collection"""
+    return source._get_collection() if hasattr(source, "_get_collection") else source
+
+
+def _checkpoint_name(collection, checkpoint):
+    return (checkpoint or collection.name).replace(".", "_")
+
+
+class BulkWriter:
+    """
+    Accumulate write operations and flush them by `batch_size` with an unordered `bulk_write`.
+
+    Pending operations are flushed when exiting the context manager without error.
+    A writer is not thread safe: use one per worker.
+    """
+
+    def __init__(self, source, batch_size=BATCH_SIZE):
+        self.collection = _collection(source)
+        self.batch_size = batch_size
+        self.operations = []
+        self.inserted = 0
+        self.modified = 0
+        self.upserted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def add(self, operation):
+        self.operations.append(operation)
+        if len(self.operations) >= self.batch_size:
+            self.flush()
+
+    def insert_one(self, document):
+        self.add(InsertOne(document))
+
+    def update_one(self, filter, update, upsert=False):
+        self.add(UpdateOne(filter, update, upsert=upsert))
+
+    def flush(self):
+        if not self.operations:
+            return
+        result = self.collection.bulk_write(self.operations, ordered=False)
+        self.operations = []
+        self.inserted += result.inserted_count
+        self.modified += result.modified_count
+        self.upserted += result.upserted_count
+
+
+def batches(
+    source,
+    query=None,
+    projection=None,
+    batch_size=BATCH_SIZE,
+    checkpoint=None,
+    writer=None,
+    start=None,
+    end=None,
+):
+    """
+    Iterate over the documents matching `query` by batches (lists) in `_id` order.
+
+    Documents are model instances if `source` is a model, raw dicts for a collection.
+    Within a migration, progress is checkpointed under `checkpoint` (the collection name
+    by default) once a batch is processed, after flushing `writer` if given.
+    `start` (included) and `end` (excluded) restrict iteration to an `_id` range.
+    """
+    collection = _collection(source)
+    name = _checkpoint_name(collection, checkpoint)
+    migration = current_migration.get()
+    last_id = migration.checkpoints.get(name) if migration else None
+    if last_id is not None:
+        log.info(f"Resuming {name} after {last_id}")
+    while True:
+        ids = {}
+        if last_id is not None:
+            ids["$gt"] = last_id
+        elif start is not None:
+            ids["$gte"] = start
+        if end is not None:
+            ids["$lt"] = end
+        filter = {"$and": [query or {}, {"_id": ids}]} if ids else query or {}
+        docs = list(collection.find(filter, projection).sort("_id", 1).limit(batch_size))
+        if not docs:
+            return
+        yield [source._from_son(doc) for doc in docs] if source is not collection else docs
+        last_id = docs[-1]["_id"]
+        if writer is not None:
+            writer.flush()
+        if migration:
+            migration.checkpoint(name, last_id)
+        if len(docs) < batch_size:
+            return
+
+
+def split_ids(source, query=None, parts=WORKERS) -> list:
+    """The `_id` bounds splitting the documents matching `query` into `parts` ranges"""
+    collection = _collection(source)
+    count = collection.count_documents(query or {})
+    bounds = []
+    for part in range(1, parts):
+        doc = next(
+            collection.find(query or {}, {"_id": 1})
+            .sort("_id", 1)
+            .skip(part * count // parts)
+            .limit(1),
+            None,
+        )
+        if doc is not None and doc["_id"] not in bounds:
+            bounds.append(doc["_id"])
+    return bounds
+
+
+def parallel(source, func, query=None, workers=WORKERS, checkpoint=None, **kwargs) -> int:
+    """
+    Call `func(batch)` for all the batches of documents matching `query`.
+
+    Documents are split into `workers` `_id` ranges processed in threads.
+    The ranges and the progress of each of them are checkpointed in the migration record
+    so a resumed migration processes the same ranges. Extra arguments are given to `batches()`.
+    Return the number of processed documents.
+    """
+    collection = _collection(source)
+    name = _checkpoint_name(collection, checkpoint)
+    migration = current_migration.get()
+    bounds = migration.checkpoints.get(f"{name}-bounds") if migration else None
+    if bounds is None:
+        bounds = split_ids(collection, query, workers)
+        if migration:
+            migration.checkpoint(f"{name}-bounds", bounds)
+    ranges = list(zip([None, *bounds], [*bounds, None]))
+
+    def work(index, start, end):
+        count = 0
+        for batch in batches(
+            source, query, checkpoint=f"{name}-{index}", start=start, end=end, **kwargs
+        ):
+            func(batch)
+            count += len(batch)
+        return count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, work, index, start, end)
+            for index, (start, end) in enumerate(ranges)
+        ]
+        count = sum(future.result() for future in futures)
+    log.info(f"Processed {count} documents of {name} with {len(ranges)} workers")
+    return count
@@ -0,0 +1,133 @@
+"""
+Declarative indexes management
+
+Indexes are declared by models `meta["indexes"]`. Rather than creating them
+on saves (`auto_create_index_on_save`), they are compared with the live collections
+and missing ones are built by `udata db indexes apply` (ex: on deployment).
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from mongoengine.document import includes_cls
+from pymongo.errors import OperationFailure
+
+from udata.mongo.document import get_all_models
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexDiff:
+    """Differences between the declared and the live indexes of a model collection"""
+
+    model: type
+    #: Declared specs (`fields` and options) without a matching live index
+    missing: list[dict] = field(default_factory=list)
+    #: Live indexes (by name) matching no declared spec
+    extra: dict[str, list] = field(default_factory=dict)
+    #: Live indexes (by name) without any access since their statistics were reset
+    unused: list[str] = field(default_factory=list)
+
+    @property
+    def collection(self) -> str:
+        return self.model._get_collection_name()
+
+
+def collection_models(names=None) -> list[type]:
+    """A model by collection (the root one for inherited models), sorted by collection name"""
+    models = {}
+    for model in get_all_models():
+        if model._meta.get("abstract") or (names and model.__name__ not in names):
+            continue
+        collection = model._get_collection_name()
+        current = models.get(collection)
+        if current is None or len(model._class_name) < len(current._class_name):
+            models[collection] = model
+    return [models[name] for name in sorted(models)]
+
+
+def _collection_classes(model) -> list[type]:
+    classes = [model]
+    for klass in classes:
+        classes.extend(
+            subclass
+            for subclass in klass.__subclasses__()
+            if subclass not in classes
+            and subclass._get_collection_name() == model._get_collection_name()
+        )
+    return classes
+
+
+def _key(fields) -> tuple:
+    """A comparable index key (text indexes are compared by fields regardless of their order)"""
+    fields = [(name, int(kind) if isinstance(kind, float) else kind) for name, kind in fields]
+    if any(kind == "text" for _, kind in fields):
+        return tuple(sorted(fields))
+    return tuple(fields)
+
+
+def _live_key(info) -> tuple:
+    if info["key"][0][0] == "_fts":
+        return _key([(name, "text") for name in info.get("weights", {})])
+    return _key(info["key"])
+
+
+def declared_indexes(model) -> list[dict]:
+    """Index specs declared by a model and its subclasses sharing its collection"""
+    specs = []
+    for klass in _collection_classes(model):
+        for spec in klass._meta["index_specs"] or []:
+            if spec not in specs:
+                specs.append(spec)
+    if (
+        model._meta.get("allow_inheritance")
+        and model._meta.get("index_cls", True)
+        and not any(includes_cls(spec["fields"]) for spec in specs)
+    ):
+        specs.append({"fields": [("_cls", 1)]})
+    return specs
+
+
+def index_stats(model) -> dict[str, int]:
+    """Accesses by index name since the statistics were reset (empty if not available)"""
+    try:
+        stats = model._get_collection().aggregate([{"$indexStats": {}}])
+        return {stat["name"]: stat["accesses"]["ops"] for stat in stats}
+    except OperationFailure as e:
+        log.warning(f"Unable to read {model.__name__} index statistics: {e}")
+        return {}
+
+
+def diff(model) -> IndexDiff:
+    """Compare the indexes declared by a model with its live collection ones"""
+    live = {
+        name: info
+        for name, info in model._get_collection().index_information().items()
+        if name != "_id_"
+    }
+    live_keys = {_live_key(info): name for name, info in live.items()}
+    declared = declared_indexes(model)
+    declared_keys = {_key(spec["fields"]) for spec in declared}
+    stats = index_stats(model)
+    return IndexDiff(
+        model=model,
+        missing=[spec for spec in declared if _key(spec["fields"]) not in live_keys],
+        extra={
+            name: live[name]["key"] for key, name in live_keys.items() if key not in declared_keys
+        },
+        unused=sorted(name for name in live if stats.get(name) == 0),
+    )
+
+
+def build(model, specs: list[dict]) -> list[str]:
+    """Build indexes in the background, returning their names"""
+    collection = model._get_collection()
+    names = []
+    for spec in specs:
+        options = dict(model._meta.get("index_opts") or {}, **spec)
+        fields = options.pop("fields")
+        options.pop("cls", None)
+        log.info(f"Building index {fields} on {collection.name}")
+        names.append(collection.create_index(fields, background=True, **options))
+    return names
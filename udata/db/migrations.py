@@ -8,6 +8,7 @@ import logging
 import os
 import queue
 import traceback
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from logging.handlers import QueueHandler
 
@@ -16,6 +17,9 @@ from pymongo import ReturnDocument
 
 log = logging.getLogger(__name__)
 
+#: The migration being executed (used to checkpoint its progress, see `udata.db.batch`)
+current_migration = ContextVar("current_migration", default=None)
+
 
 class MigrationError(Exception):
     """
@@ -65,14 +69,14 @@ class Record(dict):
         Will be `None` if the record doesn't exist.
         Returns "success" or "error".
         """
-        if not self.exists():
+        if not self.exists() or not self.ops:
             return None
         op = self.ops[-1]
         return "success" if op["success"] else "error"
 
     @property
     def last_date(self):
-        if not self.exists():
+        if not self.exists() or not self.ops:
             return
         op = self.ops[-1]
         return op["date"]
@@ -82,7 +86,7 @@ class Record(dict):
         """
         Is true if the migration is considered as successfully applied
         """
-        if not self.exists():
+        if not self.exists() or not self.ops:
             return False
         op = self.ops[-1]
         return op["success"] and op["type"] in ("migrate", "record")
@@ -172,6 +176,7 @@ class Migration:
 
         if not recordonly and not dryrun:
             db = get_db()
+            token = current_migration.set(self)
             try:
                 self.migrate(db)
                 out = _extract_output(q)
@@ -182,12 +187,29 @@ class Migration:
                 raise MigrationError(
                     "Error while executing migration", output=out, exc=e, traceback=tb
                 )
+            finally:
+                current_migration.reset(token)
 
         if not dryrun:
             self.add_record("migrate", out, True)
+            self.clear_checkpoints()
 
         return out
 
+    @property
+    def checkpoints(self):
+        """Progress saved by a partially applied migration, by name"""
+        data = self.collection.find_one(self.db_query, {"checkpoints": 1})
+        return (data or {}).get("checkpoints") or {}
+
+    def checkpoint(self, name, value):
+        self.collection.update_one(
+            self.db_query, {"$set": {f"checkpoints.{name}": value}}, upsert=True
+        )
+
+    def clear_checkpoints(self):
+        self.collection.update_one(self.db_query, {"$unset": {"checkpoints": True}})
+
     def add_record(self, type, output, success, traceback=None):
         script = inspect.getsource(self.module)
         return Record(
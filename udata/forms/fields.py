@@ -786,7 +786,7 @@ class PublishAsField(ModelFieldMixin, Field):
 
     @property
     def hidden(self):
-        return len(current_user.organizations) <= 0
+        return not current_user.organization_ids
 
     def pre_validate(self, form):
         if (
@@ -4,6 +4,7 @@ from urllib.parse import urlparse
 
 from udata.errors import ConfigError
 
+from . import monitoring
 from .engine import db
 
 log = logging.getLogger(__name__)
@@ -41,4 +42,6 @@ def init_app(app):
     validate_config(app.config)
     if app.config["TESTING"]:
         build_test_config(app.config)
+    # Register the commands listener before the connections are created
+    monitoring.init_app(app)
     db.init_app(app)
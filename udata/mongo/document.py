@@ -2,6 +2,7 @@ import logging
 from collections.abc import Iterable
 from typing import TYPE_CHECKING, ClassVar, Generic
 
+from mongoengine.errors import NotUniqueError
 from typing_extensions import TypeVar
 
 from udata.flask_mongoengine.document import Document
@@ -15,6 +16,9 @@ QS = TypeVar("QS", bound=UDataQuerySet, default=UDataQuerySet)
 
 log = logging.getLogger(__name__)
 
+#: Attempts to insert a document whose allocated slug is concurrently taken
+SLUG_ATTEMPTS = 5
+
 
 def serialize(value):
     if hasattr(value, "to_dict"):
@@ -52,6 +56,25 @@ class UDataDocument(Document, Generic[QS]):
     DoesNotExist: ClassVar[type[Exception]]
     id: "ObjectId"
 
+    def save(self, *args, **kwargs):
+        """Allocate another slug if the automatically allocated one has been taken meanwhile"""
+        for attempt in range(SLUG_ATTEMPTS):
+            try:
+                result = super().save(*args, **kwargs)
+                self.__dict__.pop("_allocated_slug", None)
+                return result
+            except NotUniqueError:
+                allocated = self.__dict__.pop("_allocated_slug", None)
+                if allocated is None or attempt == SLUG_ATTEMPTS - 1:
+                    raise
+                name, requested = allocated
+                slug = getattr(self, name)
+                if not self.__class__.objects(**{name: slug}).clear_cls_query().count():
+                    # Another unique index is concerned
+                    raise
+                log.info(f"Slug {slug} has been taken meanwhile, allocating another one")
+                setattr(self, name, requested)
+
     def to_dict(self, exclude=None):
         id_field = self._meta["id_field"]
         excluded_keys = set(exclude or [])
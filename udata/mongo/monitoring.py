@@ -0,0 +1,238 @@
+"""
+MongoDB commands monitoring
+
+A pymongo command listener counts and times the commands issued by each Flask request
+and each Celery task. Commands are grouped by query shape (the command, the collection
+and the filter keys, without values): an identical shape repeated `MONGO_N_PLUS_ONE_THRESHOLD`
+times is most likely an N+1 (ex: a reference dereferenced for each item of a page).
+
+Summaries are:
+
+- exposed as a `Server-Timing` header in debug mode,
+- logged by the `udata.mongo.monitoring` logger for a `MONGO_MONITORING_LOG_SAMPLE_RATE` ratio
+  of the requests and tasks (as warnings for likely N+1, always in debug mode),
+- added as Sentry breadcrumbs (if Sentry is configured) when an N+1 is detected.
+"""
+
+import logging
+import random
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from celery import signals
+from flask import current_app, g, request
+from pymongo import monitoring
+
+log = logging.getLogger(__name__)
+
+#: Handshake, authentication and sessions commands are not counted
+IGNORED_COMMANDS = {
+    "hello",
+    "ismaster",
+    "isMaster",
+    "ping",
+    "saslStart",
+    "saslContinue",
+    "endSessions",
+    "buildinfo",
+    "buildInfo",
+}
+#: Commands whose repetitions are expected (ex: a large cursor consumption)
+UNSHAPED_COMMANDS = {"getMore", "killCursors"}
+
+current_stats: ContextVar["CommandStats | None"] = ContextVar("mongo_stats", default=None)
+
+
+def _shape(value) -> str:
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key}: {_shape(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, (dict, list, tuple)) for item in value):
+            return "[" + ", ".join(_shape(item) for item in value) + "]"
+        return "[?]"
+    return "?"
+
+
+def query_shape(command_name: str, command: dict) -> str:
+    """The command, its collection and its filter without values (ex: `find user {_id: ?}`)"""
+    collection = command.get(command_name)
+    parts = [command_name, collection if isinstance(collection, str) else ""]
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        parts.append(" | ".join(next(iter(stage), "") for stage in pipeline))
+        query = pipeline[0].get("$match") if pipeline else None
+    elif command_name in ("update", "delete"):
+        statements = command.get(f"{command_name}s") or [{}]
+        query = statements[0].get("q")
+    else:
+        query = command.get("filter", command.get("query"))
+    if command_name == "distinct":
+        parts.append(command.get("key", ""))
+    if query is not None:
+        parts.append(_shape(query))
+    return " ".join(part for part in parts if part)
+
+
+@dataclass
+class CommandStats:
+    """The MongoDB commands issued by a request or a task"""
+
+    #: The request or task description
+    name: str
+    #: Identical shapes count from which they are reported as N+1 (`0` to disable)
+    threshold: int = 0
+    count: int = 0
+    #: Total duration in milliseconds
+    duration: float = 0
+    shapes: Counter = field(default_factory=Counter)
+    pending: dict = field(default_factory=dict)
+
+    def start(self, request_id, shape: str | None):
+        self.count += 1
+        self.pending[request_id] = shape
+        if shape is None:
+            return
+        self.shapes[shape] += 1
+        if self.threshold and self.shapes[shape] == self.threshold:
+            from udata import sentry
+
+            sentry.add_breadcrumb(
+                category="mongo",
+                message=f"Likely N+1: {shape}",
+                level="warning",
+                data={"scope": self.name},
+            )
+
+    def finish(self, request_id, duration: float):
+        self.pending.pop(request_id, None)
+        self.duration += duration
+
+    @property
+    def n_plus_one(self) -> dict[str, int]:
+        """The repeated shapes reported as N+1 with their counts"""
+        if not self.threshold:
+            return {}
+        return {
+            shape: count for shape, count in self.shapes.most_common() if count >= self.threshold
+        }
+
+    def summary(self) -> dict:
+        return {
+            "scope": self.name,
+            "commands": self.count,
+            "duration_ms": round(self.duration, 2),
+            "n_plus_one": self.n_plus_one,
+        }
+
+    def server_timing(self) -> str:
+        desc = f"{self.count} command(s)"
+        if n_plus_one := self.n_plus_one:
+            desc += f", {len(n_plus_one)} likely N+1"
+        return f'mongo;dur={self.duration:.2f};desc="{desc}"'
+
+
+class CommandListener(monitoring.CommandListener):
+    """Record the commands in the current request or task statistics"""
+
+    def started(self, event):
+        stats = current_stats.get()
+        if stats is None or event.command_name in IGNORED_COMMANDS:
+            return
+        shape = (
+            None
+            if event.command_name in UNSHAPED_COMMANDS
+            else query_shape(event.command_name, event.command)
+        )
+        stats.start(event.request_id, shape)
+
+    def succeeded(self, event):
+        stats = current_stats.get()
+        if stats is not None and event.request_id in stats.pending:
+            stats.finish(event.request_id, event.duration_micros / 1000)
+
+    failed = succeeded
+
+
+listener = CommandListener()
+_registered = False
+_task_tokens = {}
+
+
+def track(name: str, config) -> object:
+    """Start recording the commands, returning a token to give to `stop()`"""
+    return current_stats.set(
+        CommandStats(name, threshold=config["MONGO_N_PLUS_ONE_THRESHOLD"] or 0)
+    )
+
+
+def stop(token, config) -> "CommandStats | None":
+    """Stop recording the commands, report and return their statistics"""
+    stats = current_stats.get()
+    current_stats.reset(token)
+    if stats is not None:
+        report(stats, config)
+    return stats
+
+
+def report(stats: CommandStats, config):
+    sampled = config["DEBUG"] or random.random() < config["MONGO_MONITORING_LOG_SAMPLE_RATE"]
+    if not sampled:
+        return
+    n_plus_one = stats.n_plus_one
+    if n_plus_one:
+        shapes = ", ".join(f"{shape} (x{count})" for shape, count in n_plus_one.items())
+        log.warning(
+            f"{stats.name}: {stats.count} MongoDB command(s) in {stats.duration:.2f}ms, "
+            f"likely N+1: {shapes}",
+            extra={"mongo": stats.summary()},
+        )
+    else:
+        log.info(
+            f"{stats.name}: {stats.count} MongoDB command(s) in {stats.duration:.2f}ms",
+            extra={"mongo": stats.summary()},
+        )
+
+
+def before_request():
+    g.mongo_stats_token = track(f"{request.method} {request.path}", current_app.config)
+
+
+def after_request(response):
+    stats = current_stats.get()
+    if stats is not None and current_app.debug:
+        response.headers.add("Server-Timing", stats.server_timing())
+    return response
+
+
+def teardown_request(error=None):
+    token = g.pop("mongo_stats_token", None)
+    if token is not None:
+        stop(token, current_app.config)
+
+
+def track_task(task_id=None, task=None, **kwargs):
+    app = getattr(task, "current_app", None)
+    if app is not None and app.config["MONGO_MONITORING"]:
+        _task_tokens[task_id] = track(f"task {task.name}", app.config)
+
+
+def stop_task(task_id=None, task=None, **kwargs):
+    token = _task_tokens.pop(task_id, None)
+    if token is not None:
+        stop(token, task.current_app.config)
+
+
+def init_app(app):
+    if not app.config["MONGO_MONITORING"]:
+        return
+    global _registered
+    if not _registered:
+        # Only applies to the clients created afterward
+        monitoring.register(listener)
+        _registered = True
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+    signals.task_prerun.connect(track_task, dispatch_uid=f"{__name__}.track_task")
+    signals.task_postrun.connect(stop_task, dispatch_uid=f"{__name__}.stop_task")
@@ -0,0 +1,170 @@
+"""
+Batched reference prefetching.
+
+Marshalling a list of documents lazily dereferences each `ReferenceField`
+and `GenericReferenceField` it reads, issuing one query per reference per item.
+`prefetch()` collects all the references of a given set of documents
+for some dotted paths and loads them with a single `$in` query per target model.
+"""
+
+from collections import defaultdict
+
+from bson import DBRef
+from mongoengine.base import BaseDocument, get_document
+from mongoengine.fields import (
+    EmbeddedDocumentField,
+    GenericReferenceField,
+    ListField,
+    ReferenceField,
+)
+
+__all__ = ("prefetch", "reference_paths", "model_reference_paths")
+
+#: Maximum depth of references followed by `reference_paths()`
+MAX_DEPTH = 3
+
+
+def _inner(field):
+    """Unwrap list fields to their item field"""
+    while isinstance(field, ListField):
+        field = field.field
+    return field
+
+
+def _values(holder, name):
+    value = holder._data.get(name)
+    if isinstance(value, (list, tuple)):
+        return value
+    return [] if value is None else [value]
+
+
+def _target(field, value):
+    """The model referenced by `value` (if it's still a reference)"""
+    if isinstance(value, DBRef):
+        field = _inner(field)
+        if isinstance(field, ReferenceField):
+            return field.document_type
+    elif isinstance(value, dict) and "_ref" in value and "_cls" in value:
+        return get_document(value["_cls"])
+    return None
+
+
+def _ref_id(value):
+    return value.id if isinstance(value, DBRef) else value["_ref"].id
+
+
+def _prefetch_path(documents, segments):
+    holders = documents
+    for name in segments[:-1]:
+        holders = [
+            value
+            for holder in holders
+            for value in _values(holder, name)
+            if isinstance(value, BaseDocument)
+        ]
+    name = segments[-1]
+
+    ids = defaultdict(set)
+    for holder in holders:
+        field = holder._fields.get(name)
+        if field is None:
+            continue
+        for value in _values(holder, name):
+            model = _target(field, value)
+            if model is not None:
+                ids[model].add(_ref_id(value))
+    if not ids:
+        return
+
+    loaded = {}
+    for model, model_ids in ids.items():
+        for id, doc in model.objects.in_bulk(list(model_ids)).items():
+            loaded[(model, id)] = doc
+
+    for holder in holders:
+        field = holder._fields.get(name)
+        if field is None:
+            continue
+        value = holder._data.get(name)
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                model = _target(field, item)
+                doc = model and loaded.get((model, _ref_id(item)))
+                if doc is not None:
+                    # Bypass `BaseList` change tracking: the value is the same
+                    list.__setitem__(value, i, doc)
+        else:
+            model = _target(field, value)
+            doc = model and loaded.get((model, _ref_id(value)))
+            if doc is not None:
+                holder._data[name] = doc
+
+
+def prefetch(documents, *paths):
+    """
+    Dereference the given dotted `paths` on all `documents` in bulk.
+
+    Paths can go through embedded documents (`discussion.posted_by`)
+    and previously prefetched references (`organization`, `organization.owner`).
+    References to missing documents are left untouched.
+    """
+    documents = list(documents)
+    targets = [doc for doc in documents if isinstance(doc, BaseDocument)]
+    if targets:
+        # Sorted so that parents are resolved before their children
+        for path in sorted(set(paths)):
+            _prefetch_path(targets, path.split("."))
+    return documents
+
+
+def _nested_model(api_field):
+    """The nested marshalling model of a `Nested` or `List(Nested)` field, if any"""
+    container = getattr(api_field, "container", None)
+    if container is not None:
+        api_field = container
+    model = getattr(api_field, "nested", None)
+    return getattr(model, "resolved", model)
+
+
+def reference_paths(document_cls, model, depth=0):
+    """
+    Compute the reference paths of `document_cls` read by a `flask_restx` marshalling `model`.
+
+    Page models (see `udata.api.fields.pager`) are unwrapped to their item model.
+    """
+    model = getattr(model, "resolved", model)
+    paths = []
+    if depth == 0 and "data" in model and getattr(model["data"], "attribute", None) == "objects":
+        model = _nested_model(model["data"]) or {}
+    for key, api_field in model.items():
+        attribute = getattr(api_field, "attribute", None) or key
+        if not isinstance(attribute, str):
+            continue
+        name = attribute.split(".")[0]
+        field = document_cls._fields.get(name)
+        if field is None:
+            continue
+        inner = _inner(field)
+        nested = _nested_model(api_field)
+        if isinstance(inner, (ReferenceField, GenericReferenceField)):
+            paths.append(name)
+            if isinstance(inner, ReferenceField) and nested and depth + 1 < MAX_DEPTH:
+                target = inner.document_type
+                paths.extend(
+                    f"{name}.{path}" for path in reference_paths(target, nested, depth + 1)
+                )
+        elif isinstance(inner, EmbeddedDocumentField) and nested and depth + 1 < MAX_DEPTH:
+            target = inner.document_type
+            paths.extend(f"{name}.{path}" for path in reference_paths(target, nested, depth + 1))
+    return sorted(set(paths))
+
+
+_paths_cache = {}
+
+
+def model_reference_paths(document_cls, model):
+    """Cached `reference_paths()`: marshalling models are long-lived module globals"""
+    key = (document_cls, id(model))
+    if key not in _paths_cache:
+        _paths_cache[key] = reference_paths(document_cls, model)
+    return _paths_cache[key]
@@ -6,6 +6,8 @@ from mongoengine.signals import post_save
 from udata.flask_mongoengine.document import BaseQuerySet
 from udata.utils import Paginable
 
+from .prefetch import model_reference_paths, prefetch
+
 log = logging.getLogger(__name__)
 
 
@@ -37,8 +39,38 @@ class DBPaginator(Paginable):
     def objects(self):
         return self.queryset.items
 
+    def prefetch(self, *paths):
+        """Dereference `paths` on the current page items in bulk"""
+        prefetch(self.queryset.items, *paths)
+        return self
+
 
 class UDataQuerySet(BaseQuerySet):
+    _prefetch_paths = None
+
+    def _clone_into(self, new_qs):
+        new_qs = super(UDataQuerySet, self)._clone_into(new_qs)
+        new_qs._prefetch_paths = self._prefetch_paths
+        return new_qs
+
+    def prefetch(self, *paths):
+        """
+        Dereference the given reference paths in bulk once results are fetched
+        through `select_related()` (used by pagination) instead of lazily on access.
+        """
+        qs = self.clone()
+        qs._prefetch_paths = tuple(paths)
+        return qs
+
+    def prefetch_for(self, model):
+        """Prefetch references read by a `flask_restx` marshalling model"""
+        return self.prefetch(*model_reference_paths(self._document, model))
+
+    def select_related(self, max_depth=1):
+        if self._prefetch_paths is None:
+            return super(UDataQuerySet, self).select_related(max_depth=max_depth)
+        return prefetch(list(self), *self._prefetch_paths)
+
     def paginate(self, page, per_page, **kwargs):
         result = super(UDataQuerySet, self).paginate(page, per_page)
         return DBPaginator(result)
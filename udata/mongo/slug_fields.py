@@ -1,7 +1,8 @@
 import logging
+import re
 
 import slugify
-from mongoengine.fields import StringField
+from mongoengine.fields import IntField, StringField
 from mongoengine.signals import post_delete, pre_save
 
 from udata.mongo.document import UDataDocument
@@ -126,11 +127,128 @@ class SlugFollow(UDataDocument):
     }
 
 
+class SlugCounter(UDataDocument):
+    """
+    Keeps track of the last suffix allocated to a base slug for a given namespace
+    (the collection name), so that colliding slugs get the next suffix without scanning
+    the existing ones. Fields are:
+        * namespace - The collection of the slugged documents
+        * base_slug - The slug without suffix
+        * value - The last allocated suffix
+    """
+
+    namespace = StringField(required=True)
+    base_slug = StringField(required=True)
+    value = IntField(default=0)
+
+    meta = {
+        "indexes": [
+            {"fields": ("namespace", "base_slug"), "unique": True},
+        ],
+        "queryset_class": UDataQuerySet,
+    }
+
+    @classmethod
+    def next(cls, namespace, base_slug):
+        """Atomically allocate the next suffix of a base slug"""
+        counter = cls.objects(namespace=namespace, base_slug=base_slug).modify(
+            upsert=True, new=True, inc__value=1
+        )
+        return counter.value
+
+    @classmethod
+    def raise_to(cls, namespace, base_slug, value):
+        """Ensure the next allocated suffix is greater than `value`"""
+        cls.objects(namespace=namespace, base_slug=base_slug).update_one(
+            upsert=True, max__value=value
+        )
+
+
+def contiguous_suffix(suffixes) -> int:
+    """The last suffix before the first free one (ex: 2 for {1, 2, 2019})"""
+    index = 0
+    while index + 1 in suffixes:
+        index += 1
+    return index
+
+
+def slug_suffixes(queryset, field, base_slug) -> set[int]:
+    """The numeric suffixes taken for a base slug (scans all the suffixed slugs)"""
+    pattern = re.compile(rf"^{re.escape(base_slug)}-(\d+)$")
+    qs = queryset(**{f"{field.db_field}__regex": pattern.pattern}).clear_cls_query()
+    slugs = qs.only(field.db_field).as_pymongo()
+    return {int(pattern.match(doc[field.db_field]).group(1)) for doc in slugs}
+
+
+def allocate_slug(queryset, field, namespace, base_slug):
+    """
+    Allocate a free slug from `base_slug`, suffixing it with the next
+    value of its counter if it is already taken.
+    """
+
+    def exists(slug):
+        return queryset(**{field.db_field: slug}).clear_cls_query().limit(1).count(True) > 0
+
+    def suffixed(index):
+        # Keep space for index suffix, trim slug if needed
+        slug = "{0}-{1}".format(base_slug, index)
+        overflow = len(slug) - field.max_length if field.max_length else 0
+        if overflow >= 1:
+            slug = "{0}-{1}".format(base_slug[:-overflow], index)
+        return slug
+
+    if not exists(base_slug):
+        return base_slug
+
+    index = SlugCounter.next(namespace, base_slug)
+    if index == 1:
+        # The counter has just been created: start after the existing suffixes (once)
+        existing = contiguous_suffix(slug_suffixes(queryset, field, base_slug))
+        if existing:
+            SlugCounter.raise_to(namespace, base_slug, existing)
+            index = SlugCounter.next(namespace, base_slug)
+    # The counter may lag behind manually set or non contiguous slugs
+    while exists(suffixed(index)):
+        index = SlugCounter.next(namespace, base_slug)
+    return suffixed(index)
+
+
+def backfill_slug_counters(model) -> int:
+    """
+    Initialize the slug counters of a model from its existing suffixed slugs,
+    without lowering already allocated values. Return the number of counters.
+    """
+    fields = [f for f in model._fields.values() if isinstance(f, SlugField) and f.unique]
+    collection = model._get_collection()
+    pattern = re.compile(r"^(.+)-(\d+)$")
+    suffixes = {}
+    slugs = set()
+    for field in fields:
+        for doc in collection.find({field.db_field: {"$exists": True}}, {field.db_field: 1}):
+            slug = doc.get(field.db_field)
+            if not slug:
+                continue
+            slugs.add(slug)
+            match = pattern.match(slug)
+            if match:
+                suffixes.setdefault(match.group(1), set()).add(int(match.group(2)))
+    # Only colliding base slugs need a counter
+    counters = {
+        base_slug: contiguous_suffix(taken)
+        for base_slug, taken in suffixes.items()
+        if base_slug in slugs and 1 in taken
+    }
+    for base_slug, index in counters.items():
+        SlugCounter.raise_to(collection.name, base_slug, index)
+    return len(counters)
+
+
 def populate_slug(instance, field):
     """
     Populate a slug field if needed.
     """
     value = getattr(instance, field.db_field)
+    requested = value
 
     try:
         previous = instance.__class__.objects.get(id=instance.id)
@@ -171,39 +289,13 @@ def populate_slug(instance, field):
 
     # Ensure uniqueness
     if field.unique:
-        base_slug = slug
         qs = instance.__class__.objects.no_cache()
         if previous:
             qs = qs(id__ne=previous.id)
-
-        def exists(slug):
-            return qs(**{field.db_field: slug}).clear_cls_query().limit(1).count(True) > 0
-
-        def get_existing_slug_suffixes(slug):
-            qs_suffix = qs(slug__regex=rf"^{slug}-\d*$").clear_cls_query().only(field.db_field)
-            return [getattr(obj, field.db_field) for obj in qs_suffix]
-
-        def trim_base_slug(base_slug, index):
-            slug_overflow = len("{0}-{1}".format(base_slug, index)) - field.max_length
-            if slug_overflow >= 1:
-                base_slug = base_slug[:-slug_overflow]
-            return base_slug
-
-        if exists(base_slug):
-            # We'll iterate to get the first free slug suffix
-            index = 1
-            existing_slugs = None
-            while True:
-                # Keep space for index suffix, trim slug if needed
-                trimmed_slug = trim_base_slug(base_slug, index)
-                # Find all existing slugs with suffixes
-                if existing_slugs is None or trimmed_slug != base_slug:
-                    base_slug = trimmed_slug
-                    existing_slugs = set(sorted(get_existing_slug_suffixes(base_slug)))
-                slug = "{0}-{1}".format(base_slug, index)
-                if slug not in existing_slugs:
-                    break
-                index += 1
+        slug = allocate_slug(qs, field, instance._get_collection_name(), slug)
+        if not previous:
+            # Allow `UDataDocument.save()` to allocate another slug on a concurrent insertion
+            instance._allocated_slug = (field.name, requested)
 
         if is_uuid(slug):
             slug = "{0}-uuid".format(slug)
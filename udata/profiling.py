@@ -0,0 +1,269 @@
+"""
+Sampling profiler for slow requests and tasks
+
+When `PROFILING` is enabled, a thread samples the stacks of the requests and tasks being
+processed every `PROFILING_INTERVAL` seconds. Profiles are kept in the `profiles` storage when:
+
+- a request lasts more than `PROFILING_REQUESTS_THRESHOLD` seconds,
+- a task lasts more than `PROFILING_TASKS_THRESHOLD` seconds,
+- a request has a `X-Udata-Profile` header from a sysadmin or with the `PROFILING_TOKEN` value
+  (the stored profile filename is returned in the same response header).
+
+They are stored as speedscope JSON (https://www.speedscope.app) or as collapsed stacks
+(for flamegraph tools) depending on `PROFILING_FORMAT`,
+and can be listed and downloaded with the `udata profiles` commands.
+"""
+
+import hmac
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from celery import signals
+from flask import current_app, g, request
+
+log = logging.getLogger(__name__)
+
+HEADER = "X-Udata-Profile"
+
+#: Stored profiles extension by format
+EXTENSIONS = {"speedscope": "speedscope.json", "collapsed": "txt"}
+
+
+@dataclass
+class Profile:
+    """The sampled stacks of a request or a task"""
+
+    #: `request` or `task`
+    kind: str
+    #: The request endpoint or the task name
+    name: str
+    thread_id: int = field(default_factory=threading.get_ident)
+    started: datetime = field(default_factory=lambda: datetime.now(UTC))
+    start: float = field(default_factory=time.perf_counter)
+    #: Duration in seconds
+    duration: float = 0
+    #: Samples count by collapsed stack (frames from the outermost, separated by `;`)
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def speedscope(self, interval: float) -> dict:
+        frames = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.most_common():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack.split(";")])
+            weights.append(count * interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.kind} {self.name}",
+            "exporter": "udata",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{self.kind} {self.name}",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+_labels = {}
+
+
+def frame_label(code) -> str:
+    """A function label: its qualified name and its location relative to the import path"""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for path in sorted(sys.path, key=len, reverse=True):
+            if path and filename.startswith(path.rstrip("/") + "/"):
+                filename = filename[len(path.rstrip("/")) + 1 :]
+                break
+        label = _labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+def collapse(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """
+    A thread sampling the stacks of the profiled threads.
+
+    It only runs while there are profiles (and is restarted in forked processes).
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.profiles: dict[int, list[Profile]] = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, profile: Profile):
+        with self.lock:
+            self.profiles.setdefault(profile.thread_id, []).append(profile)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="udata-profiler", daemon=True)
+                self.thread.start()
+
+    def remove(self, profile: Profile):
+        with self.lock:
+            profiles = self.profiles.get(profile.thread_id, [])
+            if profile in profiles:
+                profiles.remove(profile)
+            if not profiles:
+                self.profiles.pop(profile.thread_id, None)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.profiles:
+                    self.thread = None
+                    return
+                thread_ids = list(self.profiles)
+            frames = sys._current_frames()
+            stacks = {
+                thread_id: collapse(frame)
+                for thread_id in thread_ids
+                if (frame := frames.get(thread_id))
+            }
+            # Only count for the profiles still running: stopped ones may be serialized
+            with self.lock:
+                for thread_id, stack in stacks.items():
+                    for profile in self.profiles.get(thread_id, ()):
+                        profile.stacks[stack] += 1
+
+
+sampler = Sampler()
+_task_profiles = {}
+
+
+def start(kind: str, name: str) -> Profile:
+    profile = Profile(kind, name)
+    sampler.add(profile)
+    return profile
+
+
+def stop(profile: Profile) -> Profile:
+    sampler.remove(profile)
+    profile.duration = time.perf_counter() - profile.start
+    return profile
+
+
+def store(profile: Profile, config) -> str | None:
+    """Store a profile, returning its filename in the `profiles` storage"""
+    from udata.core.storages import profiles
+
+    fmt = config["PROFILING_FORMAT"]
+    filename = "/".join(
+        (
+            f"{profile.kind}s",
+            profile.name,
+            "{0:%Y%m%dT%H%M%S}-{1}ms-{2}.{3}".format(
+                profile.started,
+                int(profile.duration * 1000),
+                uuid4().hex[:8],
+                EXTENSIONS[fmt],
+            ),
+        )
+    )
+    if fmt == "speedscope":
+        content = json.dumps(profile.speedscope(config["PROFILING_INTERVAL"]))
+    else:
+        content = profile.collapsed()
+    try:
+        profiles.write(filename, content.encode())
+    except Exception as e:
+        log.warning(f"Unable to store the {profile.kind} {profile.name} profile: {e}")
+        return None
+    log.info(f"Stored {profile.kind} {profile.name} profile ({profile.duration:.2f}s): {filename}")
+    return filename
+
+
+def is_requested() -> bool:
+    """Whether the current request profile has been requested by a sysadmin or with the token"""
+    from udata.auth import current_user
+
+    value = request.headers.get(HEADER)
+    if value is None:
+        return False
+    token = current_app.config["PROFILING_TOKEN"]
+    if token and hmac.compare_digest(value, token):
+        return True
+    return current_user.is_authenticated and current_user.sysadmin
+
+
+def before_request():
+    if HEADER in request.headers or current_app.config["PROFILING_REQUESTS_THRESHOLD"] is not None:
+        g.profile = start("request", request.endpoint or "none")
+
+
+def after_request(response):
+    profile = g.pop("profile", None)
+    if profile is None:
+        return response
+    stop(profile)
+    threshold = current_app.config["PROFILING_REQUESTS_THRESHOLD"]
+    requested = is_requested()
+    if requested or (threshold is not None and profile.duration >= threshold):
+        filename = store(profile, current_app.config)
+        if requested and filename:
+            response.headers[HEADER] = filename
+    return response
+
+
+def teardown_request(error=None):
+    profile = g.pop("profile", None)
+    if profile is not None:
+        stop(profile)
+
+
+def start_task(task_id=None, task=None, **kwargs):
+    app = getattr(task, "current_app", None)
+    if (
+        app is not None
+        and app.config["PROFILING"]
+        and app.config["PROFILING_TASKS_THRESHOLD"] is not None
+    ):
+        _task_profiles[task_id] = start("task", task.name)
+
+
+def stop_task(task_id=None, task=None, **kwargs):
+    profile = _task_profiles.pop(task_id, None)
+    if profile is None:
+        return
+    stop(profile)
+    config = task.current_app.config
+    if profile.duration >= config["PROFILING_TASKS_THRESHOLD"]:
+        store(profile, config)
+
+
+def init_app(app):
+    if not app.config["PROFILING"]:
+        return
+    sampler.interval = app.config["PROFILING_INTERVAL"]
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+    signals.task_prerun.connect(start_task, dispatch_uid=f"{__name__}.start_task")
+    signals.task_postrun.connect(stop_task, dispatch_uid=f"{__name__}.stop_task")
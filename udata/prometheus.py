@@ -0,0 +1,263 @@
+"""
+Prometheus text exposition format helpers
+
+A metric is rendered from its samples, `(suffix, labels, value)` tuples:
+
+    render([
+        metric("udata_task_runs_total", "counter", "Executed tasks", [
+            ("", {"task": "purge-datasets"}, 12),
+        ]),
+    ])
+
+A `Registry` keeps the values updated by the application processes.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def metric(name: str, kind: str, help: str, samples) -> list[str]:
+    """The exposition lines of a metric (`kind` is `counter`, `gauge` or `histogram`)"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+    return lines
+
+
+def histogram_samples(labels: dict, histogram: dict, total: float) -> list[tuple]:
+    """
+    The samples of a histogram given its counts by bucket upper bound
+    (`None` for the last one) and the sum of the observed values.
+    """
+    samples = []
+    count = 0
+    for bound, bucket_count in histogram.items():
+        count += bucket_count
+        le = math.inf if bound is None else bound
+        samples.append(("_bucket", {**labels, "le": format_value(le)}, count))
+    samples.append(("_sum", labels, total))
+    samples.append(("_count", labels, count))
+    return samples
+
+
+def render(metrics: list[list[str]]) -> str:
+    return "\n".join(line for lines in metrics for line in lines) + "\n"
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MemoryValues(dict):
+    """Values by key of the current process"""
+
+    def inc(self, key: str, amount: float):
+        self[key] = self.get(key, 0) + amount
+
+
+class MmapValues:
+    """
+    Values by key in a memory-mapped file, readable by the other processes.
+
+    The file starts with the used size (8 bytes) followed by the entries:
+    the key length (4 bytes), the UTF-8 key padded to 8 bytes and the value (double).
+    Entries are appended before the used size is updated so readers never see partial ones.
+    """
+
+    INITIAL_SIZE = 64 * 1024
+
+    def __init__(self, path: str):
+        self.fd = os.open(path, os.O_CREAT | os.O_RDWR)
+        self.size = os.fstat(self.fd).st_size
+        if self.size < self.INITIAL_SIZE:
+            self.size = self.INITIAL_SIZE
+            os.ftruncate(self.fd, self.size)
+        self.map = mmap.mmap(self.fd, self.size)
+        self.used = struct.unpack_from("q", self.map, 0)[0] or 8
+        # A recycled pid continues the values of the previous process
+        self.positions = {key: position for key, _, position in self._entries(self.map, self.used)}
+
+    @staticmethod
+    def _entries(data, used: int):
+        offset = 8
+        while offset < used:
+            (length,) = struct.unpack_from("i", data, offset)
+            key = bytes(data[offset + 4 : offset + 4 + length]).decode()
+            position = offset + 4 + length
+            position += -position % 8
+            yield key, struct.unpack_from("d", data, position)[0], position
+            offset = position + 8
+
+    @classmethod
+    def read(cls, path: str):
+        """The values by key of a file"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < 8:
+            return {}
+        used = struct.unpack_from("q", data, 0)[0]
+        return {key: value for key, value, _ in cls._entries(data, used)}
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode()
+        position = self.used + 4 + len(encoded)
+        position += -position % 8
+        if position + 8 > self.size:
+            while position + 8 > self.size:
+                self.size *= 2
+            os.ftruncate(self.fd, self.size)
+            self.map.close()
+            self.map = mmap.mmap(self.fd, self.size)
+        struct.pack_into(f"i{len(encoded)}s", self.map, self.used, len(encoded), encoded)
+        struct.pack_into("d", self.map, position, 0.0)
+        self.used = position + 8
+        struct.pack_into("q", self.map, 0, self.used)
+        self.positions[key] = position
+        return position
+
+    def inc(self, key: str, amount: float):
+        position = self.positions.get(key)
+        if position is None:
+            position = self._append(key)
+        (value,) = struct.unpack_from("d", self.map, position)
+        struct.pack_into("d", self.map, position, value + amount)
+
+
+class Registry:
+    """
+    Counters, gauges and histograms updated by the current process.
+
+    With a `directory`, each process stores its values in its own memory-mapped file
+    so they are aggregated whichever process renders them (ex: gunicorn workers).
+    The directory should be emptied before the processes start.
+    Gauges of the processes which are not running anymore are ignored.
+    """
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.pid = None
+        self.values = None
+        self.keys = {}
+
+    def counter(self, name: str, help: str):
+        self.metrics[name] = ("counter", help, None)
+
+    def gauge(self, name: str, help: str):
+        self.metrics[name] = ("gauge", help, None)
+
+    def histogram(self, name: str, help: str, buckets: tuple):
+        self.metrics[name] = ("histogram", help, buckets)
+
+    def _current_values(self):
+        pid = os.getpid()
+        if pid != self.pid:  # First use or forked process
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                self.values = MmapValues(os.path.join(self.directory, f"{pid}.db"))
+            else:
+                self.values = MemoryValues()
+            self.pid = pid
+        return self.values
+
+    def _key(self, name: str, labels: dict) -> str:
+        """The values key of a metric and its labels (encodings are memoized)"""
+        memo = (name, *labels.items())
+        key = self.keys.get(memo)
+        if key is None:
+            key = self.keys[memo] = json.dumps([name, labels])
+        return key
+
+    def inc(self, name: str, labels: dict | None = None, amount: float = 1):
+        key = self._key(name, labels or {})
+        with self.lock:
+            self._current_values().inc(key, amount)
+
+    def observe(self, name: str, value: float, labels: dict | None = None):
+        buckets = self.metrics[name][2]
+        bound = next((bound for bound in buckets if value <= bound), None)
+        labels = labels or {}
+        with self.lock:
+            values = self._current_values()
+            values.inc(self._key(name, {**labels, "le": bound}), 1)
+            values.inc(self._key(f"{name}_sum", labels), value)
+
+    def collect(self) -> dict[str, float]:
+        """The values by key of all the processes"""
+        if not self.directory:
+            with self.lock:
+                return dict(self._current_values())
+        gauges = {name for name, (kind, _, _) in self.metrics.items() if kind == "gauge"}
+        values = {}
+        for filename in os.listdir(self.directory):
+            pid, ext = os.path.splitext(filename)
+            if ext != ".db" or not pid.isdigit():
+                continue
+            alive = _alive(int(pid))
+            for key, value in MmapValues.read(os.path.join(self.directory, filename)).items():
+                if alive or json.loads(key)[0] not in gauges:
+                    values[key] = values.get(key, 0) + value
+        return values
+
+    def render(self) -> str:
+        samples = {}
+        for key, value in self.collect().items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((labels, value))
+        metrics = []
+        for name, (kind, help, buckets) in self.metrics.items():
+            if kind != "histogram":
+                values = [
+                    ("", labels, value)
+                    for labels, value in sorted(
+                        samples.get(name, []), key=lambda s: format_labels(s[0])
+                    )
+                ]
+                metrics.append(metric(name, kind, help, values))
+                continue
+            histograms = {}
+            for labels, value in samples.get(name, []):
+                bound = labels.pop("le")
+                histogram = histograms.setdefault(
+                    format_labels(labels), (labels, dict.fromkeys((*buckets, None), 0))
+                )[1]
+                histogram[bound] = value
+            totals = {
+                format_labels(labels): value for labels, value in samples.get(f"{name}_sum", [])
+            }
+            values = []
+            for key, (labels, histogram) in sorted(histograms.items()):
+                values += histogram_samples(labels, histogram, totals.get(key, 0))
+            metrics.append(metric(name, kind, help, values))
+        return render(metrics)
@@ -2,7 +2,7 @@ from urllib.parse import quote
 from uuid import UUID
 
 from bson import ObjectId
-from flask import redirect, request, url_for
+from flask import current_app, has_request_context, redirect, request, url_for
 from mongoengine import Q
 from mongoengine.errors import InvalidQueryError, ValidationError
 from werkzeug.exceptions import NotFound
@@ -26,6 +26,42 @@ class LazyRedirect(object):
         self.arg = arg
 
 
+class LazyDocument(object):
+    """
+    Defer the loading of a document for conditional requests.
+
+    Endpoints handling conditional requests (see `udata.core.conditional`) may answer
+    without loading it, others get it resolved before the view is called.
+    """
+
+    def __init__(self, converter, value):
+        self.converter = converter
+        self.value = value
+
+    @property
+    def model(self):
+        return self.converter.model
+
+    def queryset(self):
+        """Match the document by id or current slug (other cases are left to `resolve()`)"""
+        if ObjectId.is_valid(self.value):
+            return self.model.objects(id=self.value)
+        elif self.converter.has_slug:
+            return self.model.objects(slug=self.value)
+        return self.model.objects.none()
+
+    def resolve(self):
+        return self.converter.load(self.value)
+
+
+def is_conditional_request():
+    return (
+        has_request_context()
+        and request.method in ("GET", "HEAD")
+        and bool(request.if_none_match or request.if_modified_since)
+    )
+
+
 class ListConverter(BaseConverter):
     def to_python(self, value):
         return value.split(",")
@@ -86,6 +122,11 @@ class ModelConverter(BaseConverter):
             return quote(value)
 
     def to_python(self, value):
+        if is_conditional_request():
+            return LazyDocument(self, value)
+        return self.load(value)
+
+    def load(self, value):
         try:
             return self.model.objects.exclude(*self.get_excludes()).get_or_404(id=value)
         except (NotFound, ValidationError):
@@ -226,24 +267,47 @@ class TerritoryConverter(PathConverter):
             raise ValueError('Unable to serialize "%s" to url' % obj)
 
 
-def lazy_raise_or_redirect():
+def defers_documents():
+    """Whether the current endpoint resolves `LazyDocument` by itself"""
+    view = current_app.view_functions.get(request.endpoint)
+    view_class = getattr(view, "view_class", None)
+    method = getattr(view_class, request.method.lower(), None) or getattr(view_class, "get", None)
+    return getattr(method, "__defers_documents__", False)
+
+
+def resolve_view_args(view_args, defer=False):
     """
-    Raise exception lazily to ensure request.endpoint is set
-    Also perform redirect if needed
+    Resolve lazy view arguments in place.
+
+    Return the `NotFound` exception or the redirection to perform if any.
     """
-    if not request.view_args:
-        return
-    for name, value in request.view_args.items():
+    for name, value in list(view_args.items()):
+        if isinstance(value, LazyDocument) and not defer:
+            view_args[name] = value.resolve()
+    for name, value in view_args.items():
         if isinstance(value, NotFound):
-            request.routing_exception = value
-            break
+            return value
         elif isinstance(value, LazyRedirect):
-            new_args = request.view_args
+            new_args = view_args
             new_args[name] = value.arg
             new_url = url_for(request.endpoint, **new_args)
             return redirect(new_url, 308)
 
 
+def lazy_raise_or_redirect():
+    """
+    Raise exception lazily to ensure request.endpoint is set
+    Also perform redirect if needed
+    """
+    if not request.view_args:
+        return
+    result = resolve_view_args(request.view_args, defer=defers_documents())
+    if isinstance(result, NotFound):
+        request.routing_exception = result
+    else:
+        return result
+
+
 def init_app(app):
     app.before_request(lazy_raise_or_redirect)
     app.url_map.converters["list"] = ListConverter
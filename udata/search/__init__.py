@@ -4,6 +4,7 @@ from flask import current_app
 from mongoengine.signals import post_delete, post_save
 
 from udata.mongo import db
+from udata.search.cache import bump_index_generation
 from udata.tasks import as_task_param, task
 
 log = logging.getLogger(__name__)
@@ -39,6 +40,7 @@ def reindex(classname, id):
             entity = adapter_class.consumer_class.load_from_dict(document)
             service = adapter_class.service_class(get_elastic_client())
             service.feed(entity)
+            bump_index_generation(model.__name__.lower())
         except Exception:
             log.exception('Unable to index %s "%s"', model.__name__, str(obj.id))
     else:
@@ -46,6 +48,7 @@ def reindex(classname, id):
         try:
             service = adapter_class.service_class(get_elastic_client())
             service.delete_one(str(obj.id))
+            bump_index_generation(model.__name__.lower())
         except Exception:
             log.exception('Unable to unindex %s "%s"', model.__name__, str(obj.id))
 
@@ -60,6 +63,7 @@ def unindex(classname, id):
     try:
         service = adapter_class.service_class(get_elastic_client())
         service.delete_one(str(id))
+        bump_index_generation(model.__name__.lower())
     except Exception:
         log.exception('Unable to unindex %s "%s"', model.__name__, id)
 
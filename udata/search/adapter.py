@@ -1,5 +1,6 @@
 import logging
 
+from flask_restx.inputs import boolean
 from flask_restx.reqparse import RequestParser
 
 from udata.search.query import SearchQuery
@@ -15,6 +16,9 @@ class ModelSearchAdapter:
     filters = {}
     service_class = None
     consumer_class = None
+    #: Indexed fields of the search service entity needed by `lean_object()`.
+    #: Adapters without lean fields don't support lean searches.
+    lean_fields = ()
 
     @classmethod
     def serialize(cls, document):
@@ -27,6 +31,27 @@ class ModelSearchAdapter:
     def is_indexable(cls, document):
         return True
 
+    @classmethod
+    def lean_source(cls, entity):
+        """The lean fields of a search service entity"""
+        return {name: getattr(entity, name, None) for name in ("id",) + tuple(cls.lean_fields)}
+
+    @classmethod
+    def lean_source_from_document(cls, document):
+        """The lean fields of a document, as they would be indexed"""
+        return cls.lean_source(cls.consumer_class.load_from_dict(cls.serialize(document)))
+
+    @classmethod
+    def lean_object(cls, source):
+        """
+        Build a lean search result from its indexed `source`.
+
+        Returns `None` if some fields are missing from the index
+        (ie. the document was indexed before they were added)
+        or if the adapter doesn't support lean results (the default).
+        """
+        return None
+
     @classmethod
     def as_request_parser(cls, paginate=True, store_missing: bool = True):
         parser = RequestParser()
@@ -38,6 +63,21 @@ class ModelSearchAdapter:
         for name, type in cls.filters.items():
             kwargs = type.as_request_parser_kwargs()
             parser.add_argument(name, location="args", store_missing=store_missing, **kwargs)
+        parser.add_argument(
+            "facets",
+            type=str,
+            location="args",
+            help="Comma-separated facets to compute, or `none`. All facets are computed by default",
+            store_missing=store_missing,
+        )
+        if cls.lean_fields:
+            parser.add_argument(
+                "lean",
+                type=boolean,
+                location="args",
+                help="Serve a lighter representation straight from the search index",
+                store_missing=store_missing,
+            )
         # Sort arguments
         keys = list(cls.sorts)
         choices = keys + ["-" + k for k in keys]
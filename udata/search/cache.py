@@ -0,0 +1,112 @@
+"""
+Caching of search results.
+
+Cache keys include the generation of the model index which is bumped
+each time the index is written to (a new index swapped in or a document (un)indexed),
+so writes are visible as soon as they are indexed.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from uuid import uuid4
+
+from flask import current_app
+
+from udata.app import cache
+
+log = logging.getLogger(__name__)
+
+GENERATION_KEY = "search:generation:{0}"
+FACETS_KEY = "search:facets:{0}:{1}:{2}"
+RESULTS_KEY = "search:results:{0}:{1}:{2}"
+LOCK_SUFFIX = ":lock"
+#: Delay between two cache reads while waiting for a concurrent computation
+WAIT_INTERVAL = 0.05
+
+
+def index_generation(model_name: str) -> str:
+    return cache.get(GENERATION_KEY.format(model_name)) or "0"
+
+
+def bump_index_generation(model_name: str) -> None:
+    """Invalidate all cached search results of a model"""
+    cache.set(GENERATION_KEY.format(model_name), uuid4().hex, timeout=0)
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(item) for item in value)
+    return str(value)
+
+
+def params_digest(params: dict) -> str:
+    """A stable digest of search parameters, regardless of their order"""
+    normalized = {key: _normalize(value) for key, value in params.items() if value is not None}
+    dumped = json.dumps(normalized, sort_keys=True)
+    return hashlib.sha1(dumped.encode()).hexdigest()
+
+
+def facets_cache_key(model_name: str, params: dict) -> str:
+    """
+    The facets cache key of a search.
+
+    `params` should only contain parameters affecting facets:
+    the query, the filters and the requested facets but not the page or sort.
+    """
+    return FACETS_KEY.format(model_name, index_generation(model_name), params_digest(params))
+
+
+def results_cache_key(model_name: str, params: dict) -> str:
+    """The results cache key of a search given all its parameters"""
+    return RESULTS_KEY.format(model_name, index_generation(model_name), params_digest(params))
+
+
+def _compute_and_store(key, compute, timeout):
+    value = compute()
+    cache.set(key, {"at": time.time(), "value": value}, timeout=timeout)
+    return value
+
+
+def cached_search(key: str, compute):
+    """
+    Get the value of `compute()` from cache or compute and store it.
+
+    - entries are fresh for `SEARCH_CACHE_TTL` seconds, then stale for `SEARCH_CACHE_STALE_TTL` seconds:
+      a single request refreshes a stale entry while concurrent ones are served the stale value.
+    - on a miss, concurrent identical requests wait for the first one to store its result
+      (for at most `SEARCH_CACHE_LOCK_TIMEOUT` seconds) instead of all querying the index.
+    """
+    ttl = current_app.config["SEARCH_CACHE_TTL"]
+    stale_ttl = current_app.config["SEARCH_CACHE_STALE_TTL"]
+    lock_timeout = current_app.config["SEARCH_CACHE_LOCK_TIMEOUT"]
+    timeout = ttl + stale_ttl
+    lock = key + LOCK_SUFFIX
+
+    entry = cache.get(key)
+    if entry is not None:
+        if time.time() - entry["at"] < ttl or not cache.add(lock, 1, timeout=lock_timeout):
+            return entry["value"]
+        try:
+            return _compute_and_store(key, compute, timeout)
+        except Exception:
+            log.exception("Unable to refresh search results %s, serving stale ones", key)
+            return entry["value"]
+        finally:
+            cache.delete(lock)
+
+    if cache.add(lock, 1, timeout=lock_timeout):
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            cache.delete(lock)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+    log.warning("Timed out waiting for a concurrent search on %s", key)
+    return compute()
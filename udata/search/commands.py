@@ -7,6 +7,7 @@ from flask import current_app
 
 from udata.commands import cli
 from udata.search import adapter_catalog, get_elastic_client
+from udata.search.cache import bump_index_generation
 from udata_search_service.search_clients import ALL_DOCUMENT_CLASSES
 
 log = logging.getLogger(__name__)
@@ -118,6 +119,7 @@ def finalize_reindex(models, start):
                 pass
             actions.append({"add": {"index": new_index, "alias": alias}})
             es.indices.update_aliases(body={"actions": actions})
+            bump_index_generation(model_name)
 
             for old_index in previous_indices:
                 if old_index != new_index:
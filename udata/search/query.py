@@ -6,6 +6,8 @@ import urllib.parse
 from elasticsearch.exceptions import BadRequestError
 from flask import abort, current_app, request
 
+from udata.app import cache
+from udata.search.cache import cached_search, facets_cache_key, results_cache_key
 from udata.search.result import SearchResult
 
 DEFAULT_PAGE_SIZE = 20
@@ -32,9 +34,26 @@ class SearchQuery:
             )
         self._query = params.pop("q", "")
         self.sort = params.pop("sort", None)
+        self.facets = self.parse_facets(params.pop("facets", None))
+        # Only adapters with lean fields support lean searches
+        self.lean = bool(params.pop("lean", False)) and bool(self.adapter.lean_fields)
         self._filters = {}
         self.extract_filters(params)
 
+    @staticmethod
+    def parse_facets(value):
+        """
+        Parse the requested facets names (`None` means all facets).
+
+        Facets are given as a comma-separated list of names, `none` disables them.
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.split(",")
+        names = sorted(set(name.strip() for name in value) - {"", "none"})
+        return names
+
     def extract_filters(self, params):
         for key, value in params.items():
             if key in self._filters:
@@ -47,26 +66,16 @@ class SearchQuery:
 
     def execute_search(self):
         if current_app.config["ELASTICSEARCH_URL"]:
-            from udata.search import get_elastic_client
-
-            service = self.adapter.service_class(get_elastic_client())
-            try:
-                results, total, total_pages, facets = service.search(self.to_search_params())
-            except BadRequestError as e:
-                log.error(
-                    "Elasticsearch BadRequestError for %s: %s",
-                    self.adapter.__name__,
-                    json.dumps(e.body, indent=2, default=str),
-                )
-                raise
-            result_dicts = [{"id": r.id} for r in results]
+            key = self.results_cache_key()
+            data = cached_search(key, self.search_elastic) if key else self.search_elastic()
             return SearchResult(
                 query=self,
-                result=result_dicts,
+                result=[{"id": id} for id in data["ids"]],
+                sources=data.get("sources"),
                 page=self.page,
                 page_size=self.page_size,
-                total=total,
-                facets=facets,
+                total=data["total"],
+                facets=data["facets"],
             )
         else:
             params = self.to_search_params()
@@ -75,6 +84,35 @@ class SearchQuery:
                 query=self, mongo_objects=list(result), total=result.total, **params
             )
 
+    def search_elastic(self):
+        """Query the search service for result ids, total, facets and lean sources if needed"""
+        from udata.search import get_elastic_client
+
+        service = self.adapter.service_class(get_elastic_client())
+        params = self.to_search_params()
+        facets_key = self.facets_cache_key()
+        cached_facets = cache.get(facets_key) if facets_key else None
+        # Facets aggregations are skipped when cached
+        params["facets"] = [] if cached_facets is not None else self.facets
+        try:
+            results, total, total_pages, facets = service.search(params)
+        except BadRequestError as e:
+            log.error(
+                "Elasticsearch BadRequestError for %s: %s",
+                self.adapter.__name__,
+                json.dumps(e.body, indent=2, default=str),
+            )
+            raise
+        if cached_facets is not None:
+            facets = cached_facets
+        elif facets_key:
+            timeout = current_app.config["SEARCH_FACETS_CACHE_TTL"]
+            cache.set(facets_key, facets, timeout=timeout)
+        data = {"ids": [r.id for r in results], "total": total, "facets": facets}
+        if self.lean:
+            data["sources"] = [self.adapter.lean_source(r) for r in results]
+        return data
+
     def to_search_params(self):
         params = {
             "q": self._query,
@@ -85,6 +123,20 @@ class SearchQuery:
         params.update(self._filters)
         return params
 
+    def facets_cache_key(self):
+        """The facets cache key, `None` if no facet is computed or facets caching is disabled"""
+        if self.facets == [] or not current_app.config["SEARCH_FACETS_CACHE_TTL"]:
+            return None
+        params = {"q": self._query, "facets": self.facets, **self._filters}
+        return facets_cache_key(self.adapter.model.__name__.lower(), params)
+
+    def results_cache_key(self):
+        """The results cache key, `None` if results caching is disabled"""
+        if not current_app.config["SEARCH_CACHE_TTL"]:
+            return None
+        params = {**self.to_search_params(), "facets": self.facets, "lean": self.lean}
+        return results_cache_key(self.adapter.model.__name__.lower(), params)
+
     # FIXME: unused?
     def to_url(self, url=None, replace=False, **kwargs):
         """Serialize the query into an URL"""
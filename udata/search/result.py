@@ -14,6 +14,8 @@ class SearchResult(Paginable):
         self.query = query
         self.result = kwargs.get("result", None)
         self.mongo_objects = kwargs.get("mongo_objects", None)
+        self.sources = kwargs.get("sources", None)
+        self.lean_objects = None
         self._page = kwargs.pop("page")
         self._page_size = kwargs.pop("page_size")
         self._total = kwargs.pop("total")
@@ -52,7 +54,38 @@ class SearchResult(Paginable):
         except (KeyError, TypeError):
             return []
 
+    def get_lean_objects(self):
+        """
+        Lean results built from the indexed sources.
+
+        Only results missing from the index (or without indexed sources) are loaded from Mongo.
+        """
+        if self.lean_objects is None:
+            adapter = self.query.adapter
+            if self.sources is None:
+                # Mongo search: there is no indexed source
+                objects = [
+                    adapter.lean_object(adapter.lean_source_from_document(document))
+                    for document in self.get_mongo_objects()
+                ]
+            else:
+                objects = [adapter.lean_object(source) for source in self.sources]
+                missing = [ObjectId(s["id"]) for s, o in zip(self.sources, objects) if o is None]
+                documents = self.query.model.objects.in_bulk(missing) if missing else {}
+                for i, source in enumerate(self.sources):
+                    document = documents.get(ObjectId(source["id"]))
+                    if objects[i] is None and isinstance(document, self.query.model):
+                        source = adapter.lean_source_from_document(document)
+                        objects[i] = adapter.lean_object(source)
+            self.lean_objects = [o for o in objects if o is not None]
+        return self.lean_objects
+
     def get_objects(self):
+        if self.query.lean:
+            return self.get_lean_objects()
+        return self.get_mongo_objects()
+
+    def get_mongo_objects(self):
         if not self.mongo_objects:
             ids = [ObjectId(id) for id in self.get_ids()]
             objects = self.query.model.objects.in_bulk(ids)
@@ -41,6 +41,15 @@ def public_dsn(dsn: str) -> str | None:
     return public
 
 
+def add_breadcrumb(**kwargs):
+    """Add a breadcrumb to the current Sentry scope, ignored if Sentry is not available"""
+    try:
+        import sentry_sdk
+    except ImportError:
+        return
+    sentry_sdk.add_breadcrumb(**kwargs)
+
+
 def init_app(app: UDataApp):
     if app.config["SENTRY_DSN"]:
         try:
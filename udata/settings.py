@@ -28,9 +28,21 @@ class Defaults(object):
     MONGODB_HOST = "mongodb://localhost:27017/udata"
     MONGODB_CONNECT = False  # Lazy connexion for Fork-safe usage
 
+    # Count and time the MongoDB commands of each request and task (see `udata.mongo.monitoring`)
+    MONGO_MONITORING = True
+    # Identical query shapes repeated this many times in a request or a task are reported
+    # as a likely N+1 (None to disable)
+    MONGO_N_PLUS_ONE_THRESHOLD = 10
+    # Ratio of the requests and tasks commands summaries to log
+    MONGO_MONITORING_LOG_SAMPLE_RATE = 0.01
+
     # Search configuration
     ELASTICSEARCH_URL = None
     ELASTICSEARCH_INDEX_BASENAME = None
+    SEARCH_FACETS_CACHE_TTL = 60  # in seconds, 0 to disable
+    SEARCH_CACHE_TTL = 30  # in seconds, 0 to disable
+    SEARCH_CACHE_STALE_TTL = 120  # in seconds
+    SEARCH_CACHE_LOCK_TIMEOUT = 5  # in seconds
 
     # BROKER_TRANSPORT = 'redis'
     CELERY_BROKER_URL = "redis://localhost:6379"
@@ -64,8 +76,20 @@ class Defaults(object):
     CELERY_TASK_DEFAULT_ROUTING_KEY = "task.default"
     CELERY_TASK_ROUTES = "udata.tasks.router"
 
+    # Record tasks serialized arguments size (see `udata worker payloads`).
+    # Each dispatch costs a cache round trip, enable it while investigating.
+    TASKS_PAYLOAD_STATS = False
+    # Maximum serialized arguments size of a task in bytes (None to disable).
+    # Oversized tasks are rejected in debug and testing modes, only logged otherwise.
+    TASKS_PAYLOAD_MAX_SIZE = None
+    # Record tasks wait and run times, failures and retries (see `udata worker metrics`).
+    # Each execution costs a cache round trip.
+    TASKS_METRICS = False
+
     CACHE_KEY_PREFIX = "udata-cache"
     CACHE_TYPE = "flask_caching.backends.redis"
+    # Seconds during which the users organizations and roles are cached
+    MEMBERSHIPS_CACHE_TIMEOUT = 60
 
     # Flask mail settings
 
@@ -172,6 +196,18 @@ class Defaults(object):
     SENTRY_IGNORE_EXCEPTIONS = []
     SENTRY_SAMPLE_RATE: float = 1.0
 
+    # Sampling profiler configuration
+    PROFILING = False
+    # Seconds between two stacks samples
+    PROFILING_INTERVAL = 0.01
+    # Duration in seconds from which requests and tasks profiles are stored (None to disable)
+    PROFILING_REQUESTS_THRESHOLD = 5
+    PROFILING_TASKS_THRESHOLD = 600
+    # Token allowing to request a profile with the `X-Udata-Profile` header (sysadmins always can)
+    PROFILING_TOKEN = None
+    # Stored profiles format: `speedscope` or `collapsed`
+    PROFILING_FORMAT = "speedscope"
+
     # Flask WTF settings
     CSRF_SESSION_KEY = "Default uData csrf key"
 
@@ -311,6 +347,11 @@ class Defaults(object):
     DELAY_BEFORE_REMINDER_NOTIFICATION = 30  # Days
 
     DELAY_BEFORE_APPEARING_IN_RSS_FEED = 10  # Hours
+    # Cache duration of rendered Atom feeds (in seconds, 0 to disable)
+    FEED_CACHE_TTL = 10 * 60
+
+    # Maximum lifetime of the in-memory GeoZones index (in seconds, 0 to disable)
+    SPATIAL_ZONES_INDEX_TTL = 1 * HOUR
 
     # Harvest settings
     ###########################################################################
@@ -585,6 +626,22 @@ class Defaults(object):
         "https://guides.data.gouv.fr/publier-des-donnees/guide-data.gouv.fr/api/reference"
     )
 
+    # Function serializing API responses to JSON bytes (None to use the Flask JSON provider)
+    API_JSON_ENCODER = "udata.api.encoding.dumps"
+
+    # Cache-Control of API object details (revalidated with their ETag by default)
+    API_CACHE_CONTROL = "no-cache"
+    # Cache-Control overrides by API endpoint (ex: `{"api.organization": "max-age=60"}`)
+    API_CACHE_CONTROL_ENDPOINTS = {}
+
+    # Record the requests count, duration and response size by endpoint
+    REQUESTS_METRICS = True
+    # Directory shared by the application processes (ex: gunicorn workers) to store the metrics
+    # (None to keep them in memory). It should be emptied before the processes start.
+    REQUESTS_METRICS_DIR = None
+    # Bearer token required to scrape the `/metrics` endpoint (None to disable the endpoint)
+    REQUESTS_METRICS_TOKEN = None
+
     # Dataset recommendations
     #########################
     RECOMMENDATIONS_SOURCES = {}
@@ -624,6 +681,11 @@ class Defaults(object):
     PUBLISH_ON_RESOURCE_EVENTS = False
     RESOURCES_ANALYSER_URI = "http://localhost:8000"
     RESOURCES_ANALYSER_API_KEY = None
+    # Delay (in seconds) during which events on a resource are coalesced before being published
+    RESOURCES_ANALYSER_EVENTS_DELAY = 5
+    RESOURCES_ANALYSER_BATCH_SIZE = 100
+    RESOURCES_ANALYSER_RETRIES = 3
+    RESOURCES_ANALYSER_TIMEOUT = 30
 
     # Datasets quality settings
     ###########################################################################
@@ -1,13 +1,258 @@
 import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
 from importlib.metadata import entry_points
 from urllib.parse import urlparse
 
-from celery import Celery, Task
+from celery import Celery, Task, signals
+from celery.exceptions import Retry
 from celery.utils.log import get_task_logger
 from celerybeatmongo.schedulers import MongoScheduler
+from kombu.serialization import dumps
+from kombu.utils.json import register_type
 
 log = logging.getLogger(__name__)
 
+#: Upper bounds (in bytes) of the task payload size histogram buckets
+PAYLOAD_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PAYLOAD_STATS_KEY = "tasks:payloads:{0}:{1}"
+#: Upper bounds (in seconds) of the task wait and run time histograms buckets
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60, 300, 1800)
+TASK_METRICS_KEY = "tasks:metrics:{0}:{1}"
+#: Message header storing the publication timestamp
+SENT_AT_HEADER = "udata_sent_at"
+
+
+class TaskPayloadTooLarge(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class DocumentReference:
+    """
+    A document passed by reference as a task argument.
+
+    Workers load all the references of a task call in bulk (one query per model)
+    and call the task with the documents (`None` for missing ones).
+    """
+
+    model: str
+    id: str
+
+    @classmethod
+    def of(cls, document):
+        return cls(*as_task_param(document))
+
+
+# Keep references as such with the JSON serializer too
+register_type(
+    DocumentReference,
+    "document_reference",
+    lambda ref: [ref.model, ref.id],
+    lambda value: DocumentReference(*value),
+)
+
+
+def _references(value):
+    if isinstance(value, DocumentReference):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            if isinstance(item, DocumentReference):
+                yield item
+
+
+def _replace_references(value, documents):
+    if isinstance(value, DocumentReference):
+        return documents.get(value)
+    elif isinstance(value, (list, tuple)) and any(isinstance(v, DocumentReference) for v in value):
+        return type(value)(
+            documents.get(v) if isinstance(v, DocumentReference) else v for v in value
+        )
+    return value
+
+
+def load_references(args, kwargs):
+    """Replace the `DocumentReference` arguments (or lists of) by their documents"""
+    from udata.mongo import db
+
+    ids = defaultdict(set)
+    for value in list(args) + list(kwargs.values()):
+        for ref in _references(value):
+            ids[ref.model].add(ref.id)
+    if not ids:
+        return args, kwargs
+    documents = {}
+    for model_name, model_ids in ids.items():
+        model = db.resolve_model(model_name)
+        for document in model.objects(pk__in=list(model_ids)):
+            documents[DocumentReference(model_name, str(document.pk))] = document
+    args = tuple(_replace_references(value, documents) for value in args)
+    kwargs = {key: _replace_references(value, documents) for key, value in kwargs.items()}
+    return args, kwargs
+
+
+def payload_size(task, args, kwargs, serializer=None):
+    """The size in bytes of the serialized task arguments, `None` if they can't be serialized"""
+    try:
+        _, _, data = dumps((args or (), kwargs or {}), serializer=serializer or task.serializer)
+    except Exception:
+        return None
+    return len(data)
+
+
+def increment_many(counters):
+    """Increment some cache counters, in a single round trip with Redis"""
+    from udata.app import cache
+
+    backend = cache.cache
+    client = getattr(backend, "_write_client", None)
+    if client is None:
+        for key, value in counters.items():
+            backend.inc(key, value)
+        return
+    prefix = backend._get_prefix()
+    with client.pipeline(transaction=False) as pipe:
+        for key, value in counters.items():
+            pipe.incrby(f"{prefix}{key}", value)
+        pipe.execute()
+
+
+def record_payload_size(name, size):
+    bucket = bisect_left(PAYLOAD_SIZE_BUCKETS, size)
+    try:
+        increment_many(
+            {
+                PAYLOAD_STATS_KEY.format(name, bucket): 1,
+                PAYLOAD_STATS_KEY.format(name, "bytes"): size,
+            }
+        )
+    except Exception as e:
+        log.warning(f"Unable to record {name} payload size: {e}")
+
+
+def payload_stats(names):
+    """
+    Recorded payload sizes by task name: a `count`, a `mean` size in bytes
+    and a `histogram`, the counts by bucket upper bound (`None` for the last one).
+    """
+    from udata.app import cache
+
+    bounds = list(PAYLOAD_SIZE_BUCKETS) + [None]
+    stats = {}
+    for name in names:
+        keys = [PAYLOAD_STATS_KEY.format(name, i) for i in range(len(bounds))]
+        values = cache.get_many(*keys, PAYLOAD_STATS_KEY.format(name, "bytes"))
+        counts = [int(v or 0) for v in values[:-1]]
+        count = sum(counts)
+        if count:
+            stats[name] = {
+                "count": count,
+                "mean": int(values[-1] or 0) // count,
+                "histogram": dict(zip(bounds, counts)),
+            }
+    return stats
+
+
+def reset_payload_stats(names):
+    from udata.app import cache
+
+    for name in names:
+        for key in list(range(len(PAYLOAD_SIZE_BUCKETS) + 1)) + ["bytes"]:
+            # Not `delete_many()`: some backends stop on the first missing key
+            cache.delete(PAYLOAD_STATS_KEY.format(name, key))
+
+
+def record_task_metrics(name, run, wait=None, failed=False, retried=False):
+    """Record a task execution run time (and wait time) in seconds"""
+    counters = {"runs": 1, f"run:{bisect_left(DURATION_BUCKETS, run)}": 1, "run:ms": run * 1000}
+    if wait is not None:
+        counters[f"wait:{bisect_left(DURATION_BUCKETS, wait)}"] = 1
+        counters["wait:ms"] = wait * 1000
+    if failed:
+        counters["failures"] = 1
+    if retried:
+        counters["retries"] = 1
+    try:
+        increment_many(
+            {TASK_METRICS_KEY.format(name, key): int(value) for key, value in counters.items()}
+        )
+    except Exception as e:
+        log.warning(f"Unable to record {name} metrics: {e}")
+
+
+def _histogram(values, bounds):
+    counts = [int(v or 0) for v in values[:-1]]
+    return {
+        "count": sum(counts),
+        "sum": int(values[-1] or 0) / 1000,
+        "histogram": dict(zip(bounds, counts)),
+    }
+
+
+def task_metrics(names):
+    """
+    Recorded executions by task name: `runs`, `failures` and `retries` counts,
+    the `run` and `wait` (from publication to start) times histograms in seconds.
+    A histogram has a `count`, a `sum` and the counts by bucket upper bound (`None` for the last one).
+    """
+    from udata.app import cache
+
+    bounds = list(DURATION_BUCKETS) + [None]
+    keys = ["runs", "failures", "retries"]
+    for kind in "run", "wait":
+        keys += [f"{kind}:{i}" for i in range(len(bounds))] + [f"{kind}:ms"]
+    metrics = {}
+    for name in names:
+        values = cache.get_many(*(TASK_METRICS_KEY.format(name, key) for key in keys))
+        runs, failures, retries = (int(v or 0) for v in values[:3])
+        if not runs:
+            continue
+        size = len(bounds) + 1
+        metrics[name] = {
+            "runs": runs,
+            "failures": failures,
+            "retries": retries,
+            "run": _histogram(values[3 : 3 + size], bounds),
+            "wait": _histogram(values[3 + size :], bounds),
+        }
+    return metrics
+
+
+def reset_task_metrics(names):
+    from udata.app import cache
+
+    keys = ["runs", "failures", "retries", "run:ms", "wait:ms"]
+    for i in range(len(DURATION_BUCKETS) + 1):
+        keys += [f"run:{i}", f"wait:{i}"]
+    for name in names:
+        for key in keys:
+            cache.delete(TASK_METRICS_KEY.format(name, key))
+
+
+def wait_time(request):
+    """The time in seconds between a task publication (or its ETA) and now"""
+    sent_at = request.get(SENT_AT_HEADER)
+    if sent_at is None:
+        return None
+    if request.eta:
+        eta = (
+            request.eta
+            if isinstance(request.eta, datetime)
+            else datetime.fromisoformat(request.eta)
+        )
+        sent_at = max(sent_at, eta.timestamp())
+    return max(time.time() - sent_at, 0)
+
+
+@signals.before_task_publish.connect
+def stamp_sent_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(SENT_AT_HEADER, time.time())
+
 
 class ContextTask(Task):
     abstract = True
@@ -19,7 +264,46 @@ class ContextTask(Task):
 
     def __call__(self, *args, **kwargs):
         with self.current_app.app_context():
-            return super(ContextTask, self).__call__(*args, **kwargs)
+            args, kwargs = load_references(args, kwargs)
+            if self.request.called_directly or not self.current_app.config["TASKS_METRICS"]:
+                return super(ContextTask, self).__call__(*args, **kwargs)
+            wait = wait_time(self.request)
+            start = time.perf_counter()
+            failed = retried = False
+            try:
+                return super(ContextTask, self).__call__(*args, **kwargs)
+            except Retry:
+                retried = True
+                raise
+            except Exception:
+                failed = True
+                raise
+            finally:
+                record_task_metrics(
+                    self.name, time.perf_counter() - start, wait, failed=failed, retried=retried
+                )
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        if self.current_app is not None:
+            self.check_payload(args, kwargs, options.get("serializer"))
+        return super(ContextTask, self).apply_async(args, kwargs, **options)
+
+    def check_payload(self, args, kwargs, serializer=None):
+        """Record the serialized arguments size and enforce `TASKS_PAYLOAD_MAX_SIZE`"""
+        config = self.current_app.config
+        max_size = config["TASKS_PAYLOAD_MAX_SIZE"]
+        if not config["TASKS_PAYLOAD_STATS"] and not max_size:
+            return
+        size = payload_size(self, args, kwargs, serializer)
+        if size is None:
+            return
+        if config["TASKS_PAYLOAD_STATS"]:
+            record_payload_size(self.name, size)
+        if max_size and size > max_size:
+            msg = f"Task {self.name} payload is {size} bytes (max: {max_size} bytes)"
+            if self.current_app.debug or config["TESTING"]:
+                raise TaskPayloadTooLarge(msg)
+            log.warning(msg)
 
 
 class JobTask(ContextTask):
@@ -88,13 +372,19 @@ def get_logger(name):
 
 
 def connect(signal, *args, **kwargs):
+    """
+    Connect a task to a signal.
+
+    The task is given the sender document (loaded back from a `DocumentReference`)
+    or its id as a string if `by_id` is set.
+    """
     by_id = kwargs.pop("by_id", False)
 
     def wrapper(func):
         t = task(func, *args, **kwargs)
 
         def call_task(item, **kwargs):
-            t.delay(str(item.pk) if by_id else item, **kwargs)
+            t.delay(str(item.pk) if by_id else DocumentReference.of(item), **kwargs)
 
         signal.connect(call_task, weak=False)
         return t
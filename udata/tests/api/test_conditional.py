@@ -0,0 +1,190 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from flask import url_for
+from werkzeug.http import http_date
+
+from udata.core import conditional
+from udata.core.conditional import touch_models
+from udata.core.dataset.factories import DatasetFactory, ResourceFactory
+from udata.core.organization.factories import OrganizationFactory
+from udata.core.organization.models import Member
+from udata.core.reuse.factories import ReuseFactory
+from udata.core.user.factories import UserFactory
+from udata.routing import ModelConverter
+from udata.tests.api import PytestOnlyAPITestCase
+from udata.tests.helpers import assert200, assert404
+
+
+class ConditionalAPITest(PytestOnlyAPITestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, simple_cache):
+        return simple_cache(conditional)
+
+    def test_validators(self):
+        dataset = DatasetFactory()
+
+        response = self.get(url_for("api.dataset", dataset=dataset))
+
+        assert200(response)
+        assert response.headers["ETag"].startswith('W/"')
+        assert response.headers["Last-Modified"]
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "X-Fields" in response.headers["Vary"]
+
+    def test_not_modified_without_loading_the_document(self):
+        dataset = DatasetFactory(resources=ResourceFactory.build_batch(2))
+        url = url_for("api.dataset", dataset=dataset)
+        etag = self.get(url).headers["ETag"]
+
+        with patch.object(ModelConverter, "load", wraps=ModelConverter.load) as load:
+            response = self.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        load.assert_not_called()
+
+    def test_slug_and_id_share_validators(self):
+        dataset = DatasetFactory()
+        etag = self.get(url_for("api.dataset", dataset=dataset.slug)).headers["ETag"]
+
+        response = self.get(
+            url_for("api.dataset", dataset=dataset.id), headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+
+    def test_if_modified_since(self):
+        dataset = DatasetFactory()
+        url = url_for("api.dataset", dataset=dataset)
+        last_modified = self.get(url).headers["Last-Modified"]
+
+        assert self.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+        past = http_date(datetime.now(UTC) - timedelta(days=1))
+        assert200(self.get(url, headers={"If-Modified-Since": past}))
+
+    def test_modified_by_save(self):
+        """Saves not updating the timestamp (ex: metrics) still change the version"""
+        dataset = DatasetFactory()
+        url = url_for("api.dataset", dataset=dataset)
+        etag = self.get(url).headers["ETag"]
+
+        dataset.metrics["followers"] = 42
+        dataset.save(signal_kwargs={"ignores": ["post_save"]})
+        response = self.get(url, headers={"If-None-Match": etag})
+
+        assert200(response)
+        assert response.json["metrics"]["followers"] == 42
+        assert response.headers["ETag"] != etag
+
+    def test_modified_by_bulk_metrics(self):
+        reuse = ReuseFactory()
+        url = url_for("api.reuse", reuse=reuse)
+        etag = self.get(url).headers["ETag"]
+
+        touch_models("Reuse")
+
+        assert200(self.get(url, headers={"If-None-Match": etag}))
+
+    def test_variants(self):
+        org = OrganizationFactory()
+        url = url_for("api.organization", org=org)
+        etag = self.get(url).headers["ETag"]
+
+        assert200(self.get(url, headers={"If-None-Match": etag, "X-Fields": "id,name"}))
+        assert200(self.get(url + "?lang=fr", headers={"If-None-Match": etag}))
+        self.login()
+        response = self.get(url, headers={"If-None-Match": etag})
+        assert200(response)
+        assert response.headers["Cache-Control"] == "no-cache, private"
+
+    def test_organization_with_members(self):
+        org = OrganizationFactory(members=[Member(user=UserFactory(), role="admin")])
+        url = url_for("api.organization", org=org)
+        headers = {"If-None-Match": 'W/"stale"'}
+
+        response = self.get(url, headers=headers)
+        assert200(response)
+        assert response.json["members"][0]["user"]["id"]
+
+        self.login()
+        assert200(self.get(url, headers=headers))
+
+    def test_private_document(self):
+        dataset = DatasetFactory(private=True)
+        url = url_for("api.dataset", dataset=dataset)
+
+        response = self.get(url, headers={"If-None-Match": 'W/"unknown"'})
+
+        assert404(response)
+        assert "ETag" not in response.headers
+
+    def test_private_document_if_modified_since(self):
+        dataset = DatasetFactory(private=True)
+        url = url_for("api.dataset", dataset=dataset)
+        since = http_date(datetime.now(UTC) + timedelta(days=1))
+
+        response = self.get(url, headers={"If-Modified-Since": since})
+
+        assert404(response)
+        assert "ETag" not in response.headers
+
+    def test_deleted_document_if_modified_since(self):
+        reuse = ReuseFactory(deleted=datetime.now(UTC))
+        url = url_for("api.reuse", reuse=reuse)
+        since = http_date(datetime.now(UTC) + timedelta(days=1))
+
+        response = self.get(url, headers={"If-Modified-Since": since})
+
+        assert response.status_code == 410
+        assert "ETag" not in response.headers
+
+    def test_old_slug_redirect(self):
+        dataset = DatasetFactory(title="Old title")
+        old_slug = dataset.slug
+        dataset.title = "New title"
+        dataset.save()
+
+        response = self.get(
+            url_for("api.dataset", dataset=old_slug), headers={"If-None-Match": 'W/"unknown"'}
+        )
+
+        assert response.status_code == 308
+        assert response.location.endswith(url_for("api.dataset", dataset=dataset.slug))
+
+    @pytest.mark.options(API_CACHE_CONTROL_ENDPOINTS={"apiv2.dataset": "public, max-age=60"})
+    def test_cache_control_by_endpoint(self):
+        dataset = DatasetFactory()
+
+        response = self.get(url_for("apiv2.dataset", dataset=dataset))
+
+        assert200(response)
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+        assert self.get(url_for("api.dataset", dataset=dataset)).headers["Cache-Control"] == (
+            "no-cache"
+        )
+
+    def test_apiv2_resources(self):
+        dataset = DatasetFactory(resources=ResourceFactory.build_batch(3))
+        url = url_for("apiv2.resources", dataset=dataset, page_size=2)
+        etag = self.get(url).headers["ETag"]
+
+        assert self.get(url, headers={"If-None-Match": etag}).status_code == 304
+        response = self.get(
+            url_for("apiv2.resources", dataset=dataset, page=2, page_size=2),
+            headers={"If-None-Match": etag},
+        )
+        assert200(response)
+        assert len(response.json["data"]) == 1
+
+    def test_other_endpoints_resolve_the_document(self):
+        dataset = DatasetFactory()
+
+        response = self.get(
+            url_for("apiv2.dataset_schemas", dataset=dataset),
+            headers={"If-None-Match": 'W/"unknown"'},
+        )
+
+        assert200(response)
+        assert "ETag" not in response.headers
@@ -339,7 +339,6 @@ class DataserviceAPITest(APITestCase):
         member = Member(user=owner, role="editor")
         org.members = [member]
         org.save()
-        del owner.organizations  # clear user.organizations cached property
         owner.reload()
 
         # Public and 2 private dataservices for the owner + organization member
@@ -1,6 +1,7 @@
 import json
 from datetime import UTC, datetime, timedelta
 from io import BytesIO
+from unittest.mock import patch
 from uuid import uuid4
 
 import feedparser
@@ -14,7 +15,7 @@ import udata.core.organization.constants as org_constants
 from udata import uris
 from udata.api import fields
 from udata.app import cache
-from udata.core import storages
+from udata.core import feeds, storages
 from udata.core.access_type.constants import (
     AccessAudienceCondition,
     AccessAudienceType,
@@ -50,8 +51,8 @@ from udata.i18n import gettext as _
 from udata.models import CommunityResource, Dataset, Follow, Member
 from udata.mongo.datetime_fields import DateRange
 from udata.tags import TAG_MAX_LENGTH, TAG_MIN_LENGTH
-from udata.tests.helpers import assert200, assert404, create_geozones_fixtures
-from udata.utils import faker, unique_string
+from udata.tests.helpers import assert200, assert404, assert_emit, create_geozones_fixtures
+from udata.utils import faker, get_rss_feed_list, unique_string
 
 from . import APITestCase, PytestOnlyAPITestCase
 
@@ -474,7 +475,6 @@ class DatasetAPITest(APITestCase):
         member = Member(user=owner, role="editor")
         org.members = [member]
         org.save()
-        del owner.organizations  # clear user.organizations cached property
         owner.reload()
 
         # Public and 2 private dataset for the owner + organization member
@@ -1667,6 +1667,54 @@ class DatasetsFeedAPItest(APITestCase):
         self.assert200(response)
 
 
+class DatasetsFeedCacheAPITest(PytestOnlyAPITestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, simple_cache):
+        return simple_cache(feeds)
+
+    @pytest.mark.options(DELAY_BEFORE_APPEARING_IN_RSS_FEED=0)
+    def test_recent_feed_is_cached_until_a_dataset_is_saved(self):
+        dataset = DatasetFactory(title="Before")
+
+        with patch("udata.core.dataset.api.get_rss_feed_list", wraps=get_rss_feed_list) as render:
+            response = self.get(url_for("api.recent_datasets_atom_feed", tag=["b", "a"]))
+            self.assert200(response)
+            # Same filters in another order
+            cached = self.get(url_for("api.recent_datasets_atom_feed", tag=["a", "b"]))
+            assert cached.data == response.data
+            assert render.call_count == 1
+
+            dataset.title = "After"
+            dataset.save()
+            response = self.get(url_for("api.recent_datasets_atom_feed"))
+            assert render.call_count == 2
+
+        feed = feedparser.parse(response.data)
+        assert feed.entries[0].title == "After"
+
+    @pytest.mark.options(DELAY_BEFORE_APPEARING_IN_RSS_FEED=0)
+    def test_recent_feed_conditional_get(self):
+        DatasetFactory()
+        url = url_for("api.recent_datasets_atom_feed")
+
+        response = self.get(url)
+        self.assert200(response)
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.get(url, headers={"If-None-Match": etag})
+        self.assertStatus(response, 304)
+        assert response.data == b""
+
+        response = self.get(url, headers={"If-Modified-Since": last_modified})
+        self.assertStatus(response, 304)
+
+        DatasetFactory()
+        response = self.get(url, headers={"If-None-Match": etag})
+        self.assert200(response)
+        assert response.headers["ETag"] != etag
+
+
 class DatasetBadgeAPITest(APITestCase):
     @classmethod
     def setUpClass(cls):
@@ -2080,6 +2128,62 @@ class DatasetResourceAPITest(APITestCase):
             self.assertEqual(resource.description, rdata["description"])
             self.assertIsNotNone(resource.url)
 
+    def test_bulk_create_resources(self):
+        self.dataset.add_resource(ResourceFactory())
+        data = [ResourceFactory.as_dict() for _ in range(3)]
+        for rdata in data:
+            rdata["filetype"] = "remote"
+        with assert_emit(Dataset.on_resources_added):
+            response = self.post(url_for("api.resources_bulk", dataset=self.dataset), data)
+        self.assert201(response)
+        assert [r["title"] for r in response.json] == [r["title"] for r in data]
+        self.dataset.reload()
+        assert len(self.dataset.resources) == 4
+        assert [r.title for r in self.dataset.resources[:3]] == [r["title"] for r in data]
+
+    def test_bulk_create_resources_invalid(self):
+        data = [ResourceFactory.as_dict() for _ in range(3)]
+        data[0]["filetype"] = "remote"
+        data[1]["filetype"] = "file"
+        data[2]["filetype"] = "remote"
+        data[2]["title"] = ""
+        response = self.post(url_for("api.resources_bulk", dataset=self.dataset), data)
+        self.assert400(response)
+        assert set(response.json["errors"]) == {"1", "2"}
+        self.dataset.reload()
+        assert len(self.dataset.resources) == 0
+
+    def test_bulk_update_resources(self):
+        resources = ResourceFactory.build_batch(3)
+        self.dataset.resources.extend(resources)
+        self.dataset.save()
+        data = [
+            {"id": str(resources[2].id), "title": faker.sentence()},
+            {"id": str(resources[0].id), "title": faker.sentence(), "description": "new"},
+        ]
+        with assert_emit(Dataset.on_resources_updated):
+            response = self.put(url_for("api.resources_bulk", dataset=self.dataset), data)
+        self.assert200(response)
+        self.dataset.reload()
+        assert [str(r.id) for r in self.dataset.resources] == [str(r.id) for r in resources]
+        assert self.dataset.resources[0].title == data[1]["title"]
+        assert self.dataset.resources[0].description == "new"
+        assert self.dataset.resources[1].title == resources[1].title
+        assert self.dataset.resources[2].title == data[0]["title"]
+
+    def test_bulk_update_unknown_resource(self):
+        resource = ResourceFactory()
+        self.dataset.resources.append(resource)
+        self.dataset.save()
+        data = [
+            {"id": str(resource.id), "title": faker.sentence()},
+            {"id": str(ResourceFactory().id), "title": faker.sentence()},
+        ]
+        response = self.put(url_for("api.resources_bulk", dataset=self.dataset), data)
+        self.assert400(response)
+        self.dataset.reload()
+        assert self.dataset.resources[0].title == resource.title
+
     def test_update_404(self):
         data = {
             "title": faker.sentence(),
@@ -0,0 +1,69 @@
+import json
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from bson import ObjectId
+from flask import json as flask_json
+from flask import url_for
+
+from udata.api import encoding
+from udata.core.dataset.factories import DatasetFactory, ResourceFactory
+from udata.i18n import lazy_gettext
+from udata.tests import PytestOnlyTestCase
+from udata.tests.api import PytestOnlyAPITestCase
+from udata.tests.helpers import assert200
+
+
+class EncodingTest(PytestOnlyTestCase):
+    def assert_same_as_flask(self, data):
+        assert json.loads(encoding.dumps(data)) == json.loads(flask_json.dumps(data))
+
+    @pytest.mark.skipif(encoding.orjson is None, reason="orjson is not installed")
+    def test_fast_path(self):
+        assert isinstance(encoding.dumps({"a": 1}), bytes)
+        assert encoding.dumps({"b": [1, None], "a": "é"}) == '{"a":"é","b":[1,null]}'.encode()
+
+    def test_types(self):
+        self.assert_same_as_flask(
+            {
+                "id": ObjectId(),
+                "uuid": uuid4(),
+                "aware": datetime.now(UTC),
+                "naive": datetime(2024, 1, 2, 3, 4, 5, 6),
+                "date": date(2024, 1, 2),
+                "decimal": Decimal("1.50"),
+                "lazy": lazy_gettext("Latest datasets"),
+            }
+        )
+
+    def test_non_string_keys(self):
+        self.assert_same_as_flask({1: "one", 2: "two"})
+
+    def test_document(self):
+        self.assert_same_as_flask({"resource": ResourceFactory.build()})
+
+    def test_fallback_on_flask(self):
+        self.assert_same_as_flask({"big": 2**70})
+
+    def test_unknown_type(self):
+        with pytest.raises(TypeError):
+            encoding.dumps({"set": {1, 2}})
+
+
+class EncodingAPITest(PytestOnlyAPITestCase):
+    def test_same_response_with_flask_encoder(self, app):
+        DatasetFactory.create_batch(3, resources=ResourceFactory.build_batch(2))
+
+        response = self.get(url_for("api.datasets"))
+        assert200(response)
+        app.config["API_JSON_ENCODER"] = None
+        expected = self.get(url_for("api.datasets"))
+
+        assert response.json == expected.json
+
+    def test_describe_encoder(self, app):
+        assert encoding.describe_encoder(app) == "orjson"
+        app.config["API_JSON_ENCODER"] = None
+        assert encoding.describe_encoder(app) == "Flask JSON provider"
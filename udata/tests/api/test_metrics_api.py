@@ -0,0 +1,106 @@
+import multiprocessing
+
+import pytest
+from flask import url_for
+
+from udata.api.metrics import DURATION, IN_FLIGHT, REQUESTS, SIZE, create_registry
+from udata.core.dataset.factories import DatasetFactory
+from udata.prometheus import Registry
+from udata.tests.api import PytestOnlyAPITestCase
+from udata.tests.helpers import assert200, assert401, assert404
+
+TOKEN = "metrics-token"
+
+
+def handle_request(registry):
+    registry.inc(IN_FLIGHT)
+    registry.inc(REQUESTS, {"endpoint": "api.dataset", "method": "GET", "status": "200"})
+    registry.observe(DURATION, 0.2, {"endpoint": "api.dataset", "method": "GET"})
+
+
+class RegistryTest:
+    def test_render_histogram(self):
+        registry = Registry()
+        registry.histogram("latency", "Latency", (0.1, 1))
+        registry.observe("latency", 0.05, {"endpoint": "a"})
+        registry.observe("latency", 0.5, {"endpoint": "a"})
+        registry.observe("latency", 3, {"endpoint": "a"})
+
+        assert registry.render().splitlines() == [
+            "# HELP latency Latency",
+            "# TYPE latency histogram",
+            'latency_bucket{endpoint="a",le="0.1"} 1',
+            'latency_bucket{endpoint="a",le="1"} 2',
+            'latency_bucket{endpoint="a",le="+Inf"} 3',
+            'latency_sum{endpoint="a"} 3.55',
+            'latency_count{endpoint="a"} 3',
+        ]
+
+    def test_aggregate_processes(self, tmp_path):
+        registry = create_registry(str(tmp_path))
+        handle_request(registry)
+        # A process which is not running anymore
+        process = multiprocessing.get_context("fork").Process(
+            target=handle_request, args=(registry,)
+        )
+        process.start()
+        process.join()
+
+        exposition = registry.render()
+
+        assert len(list(tmp_path.iterdir())) == 2
+        assert (
+            'udata_http_requests_total{endpoint="api.dataset",method="GET",status="200"} 2'
+            in exposition
+        )
+        assert (
+            'udata_http_request_duration_seconds_bucket{endpoint="api.dataset",method="GET",le="0.25"} 2'
+            in exposition
+        )
+        # Gauges of the processes which are not running anymore are ignored
+        assert "udata_http_requests_in_flight 1" in exposition
+
+    def test_grow_file(self, tmp_path):
+        registry = create_registry(str(tmp_path))
+        for index in range(2000):
+            registry.inc(
+                REQUESTS, {"endpoint": f"endpoint-{index}", "method": "GET", "status": "200"}
+            )
+
+        exposition = create_registry(str(tmp_path)).render()
+
+        assert exposition.count("udata_http_requests_total{") == 2000
+
+
+class MetricsAPITest(PytestOnlyAPITestCase):
+    def test_disabled_without_token(self):
+        assert404(self.get("/metrics"))
+
+    @pytest.mark.options(REQUESTS_METRICS_TOKEN=TOKEN)
+    def test_requires_token(self):
+        assert401(self.get("/metrics"))
+        assert401(self.get("/metrics", headers={"Authorization": "Bearer wrong"}))
+
+    @pytest.mark.options(REQUESTS_METRICS_TOKEN=TOKEN)
+    def test_requests_metrics(self):
+        dataset = DatasetFactory()
+        self.get(url_for("api.dataset", dataset=dataset))
+        self.get(url_for("api.dataset", dataset="unknown"))
+
+        response = self.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+
+        assert200(response)
+        assert response.content_type.startswith("text/plain")
+        exposition = response.data.decode()
+        assert (
+            'udata_http_requests_total{endpoint="api.dataset",method="GET",status="200"} 1'
+            in exposition
+        )
+        assert (
+            'udata_http_requests_total{endpoint="api.dataset",method="GET",status="404"} 1'
+            in exposition
+        )
+        assert f'{DURATION}_count{{endpoint="api.dataset",method="GET"}} 2' in exposition
+        assert f'{SIZE}_count{{endpoint="api.dataset",method="GET"}} 2' in exposition
+        # The scrape itself is in flight
+        assert f"{IN_FLIGHT} 1" in exposition
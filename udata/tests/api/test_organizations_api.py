@@ -1,9 +1,11 @@
 from datetime import UTC, datetime
 from io import StringIO
+from unittest.mock import patch
 
 import pytest
 from flask import url_for
 
+import udata.api
 import udata.core.organization.constants as org_constants
 from udata.core import csv
 from udata.core.badges.factories import badge_factory
@@ -1268,6 +1270,27 @@ class OrganizationReusesAPITest(PytestOnlyAPITestCase):
         assert200(response)
         assert len(response.json) == len(reuses)
 
+    def test_list_org_reuses_streamed_by_chunks(self):
+        """Should stream all organization reuses by chunks, honoring the fields mask"""
+        org = OrganizationFactory()
+        reuses = ReuseFactory.create_batch(5, organization=org)
+
+        with patch.object(udata.api, "STREAM_CHUNK_SIZE", 2):
+            response = self.get(
+                url_for("api.org_reuses", org=org), headers={"X-Fields": "id,title"}
+            )
+
+        assert response.is_streamed  # Checked first as reading the body buffers it
+        assert200(response)
+        assert sorted(r["id"] for r in response.json) == sorted(str(r.id) for r in reuses)
+        assert all(set(r) == {"id", "title"} for r in response.json)
+
+    def test_list_org_reuses_empty(self):
+        response = self.get(url_for("api.org_reuses", org=OrganizationFactory()))
+
+        assert200(response)
+        assert response.json == []
+
 
 class OrganizationDiscussionsAPITest(PytestOnlyAPITestCase):
     def test_list_org_discussions(self):
@@ -1290,6 +1313,20 @@ class OrganizationDiscussionsAPITest(PytestOnlyAPITestCase):
         for discussion in response.json:
             assert discussion["id"] in discussions_ids
 
+    def test_list_org_discussions_only_about_org_subjects(self):
+        user = UserFactory()
+        org = OrganizationFactory()
+        dataset = DatasetFactory(organization=org)
+        discussion = Discussion.objects.create(subject=dataset, title="", user=user)
+        Discussion.objects.create(subject=DatasetFactory(), title="", user=user)
+        Discussion.objects.create(subject=ReuseFactory(), title="", user=user)
+
+        response = self.get(url_for("api.org_discussions", org=org))
+
+        assert200(response)
+        assert [d["id"] for d in response.json] == [str(discussion.id)]
+        assert response.json[0]["subject"]["id"] == str(dataset.id)
+
 
 class OrganizationBadgeAPITest(PytestOnlyAPITestCase):
     @pytest.fixture(autouse=True)
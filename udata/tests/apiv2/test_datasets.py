@@ -135,6 +135,23 @@ class DatasetAPIV2Test(APITestCase):
         assert len(data) == 1
         assert data[0]["id"] == str(test_dataset.id)
 
+    def test_search_dataset_lean(self):
+        org = OrganizationFactory()
+        dataset = DatasetFactory(organization=org, tags=["lean"], metrics={"views": 42})
+
+        response = self.get(url_for("apiv2.dataset_search", lean=True))
+        self.assert200(response)
+        assert response.json["total"] == 1
+        data = response.json["data"][0]
+        assert data["id"] == str(dataset.id)
+        assert data["slug"] == dataset.slug
+        assert data["tags"] == ["lean"]
+        assert data["metrics"]["views"] == 42
+        assert data["organization"]["slug"] == org.slug
+        assert data["uri"] == url_for("api.dataset", dataset=dataset.slug, _external=True)
+        assert "resources" not in data
+        assert "facets" in response.json
+
 
 class DatasetResourceAPIV2Test(APITestCase):
     def test_get_specific(self):
@@ -1,6 +1,10 @@
 from flask import url_for
 
+from udata.core.dataset.factories import DatasetFactory
 from udata.core.organization.factories import Member, OrganizationFactory
+from udata.core.reuse.factories import ReuseFactory
+from udata.core.user.factories import UserFactory
+from udata.models import Discussion
 from udata.tests.api import APITestCase
 
 
@@ -13,6 +17,48 @@ class OrganizationSearchAPIV2Test(APITestCase):
         self.assert200(response)
 
 
+class OrganizationListsAPIV2Test(APITestCase):
+    def test_list_org_reuses_by_page(self):
+        org = OrganizationFactory()
+        ReuseFactory.create_batch(3, organization=org)
+        ReuseFactory(organization=org, private=True)
+        ReuseFactory()
+
+        response = self.get(url_for("apiv2.organization_reuses", org=org, page_size=2))
+        self.assert200(response)
+        assert response.json["total"] == 3
+        assert len(response.json["data"]) == 2
+        assert response.json["next_page"] is not None
+
+        response = self.get(url_for("apiv2.organization_reuses", org=org, page=2, page_size=2))
+        self.assert200(response)
+        assert len(response.json["data"]) == 1
+
+    def test_list_org_reuses_by_page_private_when_member(self):
+        self.login()
+        org = OrganizationFactory(members=[Member(user=self.user, role="admin")])
+        ReuseFactory.create_batch(2, organization=org, private=True)
+
+        response = self.get(url_for("apiv2.organization_reuses", org=org))
+        self.assert200(response)
+        assert response.json["total"] == 2
+
+    def test_list_org_discussions_by_page(self):
+        user = UserFactory()
+        org = OrganizationFactory()
+        dataset = DatasetFactory(organization=org)
+        reuse = ReuseFactory(organization=org)
+        for subject in (dataset, reuse, dataset):
+            Discussion.objects.create(subject=subject, title="", user=user)
+        Discussion.objects.create(subject=DatasetFactory(), title="", user=user)
+
+        response = self.get(url_for("apiv2.organization_discussions", org=org, page_size=2))
+        self.assert200(response)
+        assert response.json["total"] == 3
+        assert len(response.json["data"]) == 2
+        assert response.json["data"][0]["subject"]["class"] in ("Dataset", "Reuse")
+
+
 class OrganizationExtrasAPITest(APITestCase):
     def setUp(self):
         self.login()
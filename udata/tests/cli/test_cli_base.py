@@ -15,3 +15,45 @@ class CliBaseTest(PytestOnlyTestCase):
     def test_cli_version(self):
         """Should display version without errors"""
         self.cli("--version")
+
+    def test_commands_modules(self):
+        """Should know the module of every udata command"""
+        from udata.commands import COMMANDS, cli
+
+        self.cli("--help")
+
+        assert set(cli.commands) - {"shell"} == set(COMMANDS)
+
+    def test_info_without_subcommand(self):
+        """Should display the info commands"""
+        result = self.cli("info")
+
+        assert "config" in result.output
+
+    def test_parse_importtime(self):
+        from udata.commands.info import parse_importtime
+
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |     bson.int64",
+                "import time:      2000 |       2120 |   bson",
+                "something else",
+            ]
+        )
+
+        assert parse_importtime(output) == [("bson.int64", 120, 120), ("bson", 2000, 2120)]
+
+    def test_lazy_api(self):
+        """Should register the APIs when building one of their URLs"""
+        from flask import url_for
+
+        from udata import api
+
+        api.init_app(self.app, lazy=True)
+        assert "api" not in self.app.blueprints
+
+        with self.app.test_request_context():
+            assert url_for("api.datasets") == "/api/1/datasets/"
+
+        assert "api" in self.app.blueprints
@@ -1,11 +1,20 @@
+import time
+from threading import Event, Thread
 from unittest.mock import patch
 
 import pytest
 from flask import current_app
 
-from udata.core.dataset.events import serialize_resource_for_event
+from udata.core.dataset import events
+from udata.core.dataset.events import (
+    publish_resource_events,
+    queue_resource_events,
+    resource_events_metrics,
+    serialize_resource_for_event,
+)
 from udata.core.dataset.factories import DatasetFactory, ResourceFactory
 from udata.core.dataset.models import Schema
+from udata.event.values import EventMessageType
 from udata.models import Dataset
 from udata.tests.api import PytestOnlyDBTestCase
 from udata.tests.helpers import assert_emit
@@ -13,9 +22,9 @@ from udata.tests.helpers import assert_emit
 
 @pytest.mark.options(PUBLISH_ON_RESOURCE_EVENTS=True, RESOURCES_ANALYSER_URI="http://local.dev")
 class DatasetEventsTest(PytestOnlyDBTestCase):
-    @patch("requests.post")
     @pytest.mark.options(RESOURCES_ANALYSER_API_KEY=None)
-    def test_publish_message_resource_created_no_api_key(self, mock_req):
+    def test_publish_message_resource_created_no_api_key(self, rmock):
+        rmock.post(f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/")
         dataset = DatasetFactory()
         resource = ResourceFactory()
         expected_signals = (Dataset.on_resource_added,)
@@ -29,39 +38,35 @@ class DatasetEventsTest(PytestOnlyDBTestCase):
             "document": serialize_resource_for_event(resource),
         }
 
-        mock_req.assert_called_with(
-            f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/",
-            json=expected_value,
-            headers={},  # No RESOURCES_ANALYSER_API_KEY, no headers.
-        )
+        assert rmock.call_count == 1
+        assert rmock.last_request.json() == expected_value
+        # No RESOURCES_ANALYSER_API_KEY, no headers.
+        assert "Authorization" not in rmock.last_request.headers
 
-    @patch("requests.post")
     @pytest.mark.options(RESOURCES_ANALYSER_API_KEY="foobar-api-key")
-    def test_publish_message_resource_created(self, mock_req):
+    def test_publish_message_resource_created(self, rmock):
+        rmock.post(f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/")
         dataset = DatasetFactory()
         resource = ResourceFactory()
         expected_signals = (Dataset.on_resource_added,)
 
+        with assert_emit(*expected_signals):
+            dataset.add_resource(resource)
+
         expected_value = {
             "resource_id": str(resource.id),
             "dataset_id": str(dataset.id),
             "document": serialize_resource_for_event(resource),
         }
 
-        with assert_emit(*expected_signals):
-            dataset.add_resource(resource)
-
-        mock_req.assert_called_with(
-            f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/",
-            json=expected_value,
-            headers={"Authorization": "Bearer foobar-api-key"},
-        )
+        assert rmock.last_request.json() == expected_value
+        assert rmock.last_request.headers["Authorization"] == "Bearer foobar-api-key"
 
-    @patch("requests.put")
     @pytest.mark.options(RESOURCES_ANALYSER_API_KEY="foobar-api-key")
-    def test_publish_message_resource_modified(self, mock_req):
+    def test_publish_message_resource_modified(self, rmock):
         resource = ResourceFactory(schema=Schema(url="http://localhost/my-schema"))
         dataset = DatasetFactory(resources=[resource])
+        rmock.put(f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/{resource.id}")
         expected_signals = (Dataset.on_resource_updated,)
 
         resource.description = "New description"
@@ -75,24 +80,133 @@ class DatasetEventsTest(PytestOnlyDBTestCase):
         with assert_emit(*expected_signals):
             dataset.update_resource(resource)
 
-        mock_req.assert_called_with(
-            f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/{resource.id}",
-            json=expected_value,
-            headers={"Authorization": "Bearer foobar-api-key"},
-        )
+        assert rmock.last_request.json() == expected_value
+        assert rmock.last_request.headers["Authorization"] == "Bearer foobar-api-key"
 
-    @patch("requests.delete")
     @pytest.mark.options(RESOURCES_ANALYSER_API_KEY="foobar-api-key")
-    def test_publish_message_resource_removed(self, mock_req):
+    def test_publish_message_resource_removed(self, rmock):
         resource = ResourceFactory()
         dataset = DatasetFactory(resources=[resource])
+        rmock.delete(f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/{resource.id}")
         expected_signals = (Dataset.on_resource_removed,)
 
         with assert_emit(*expected_signals):
             dataset.remove_resource(resource)
 
-        mock_req.assert_called_with(
-            f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/{resource.id}",
-            json=None,
-            headers={"Authorization": "Bearer foobar-api-key"},
+        assert rmock.last_request.body is None
+        assert rmock.last_request.headers["Authorization"] == "Bearer foobar-api-key"
+
+
+@pytest.mark.options(PUBLISH_ON_RESOURCE_EVENTS=True, RESOURCES_ANALYSER_URI="http://local.dev")
+class DatasetEventsCoalescingTest(PytestOnlyDBTestCase):
+    @pytest.fixture(autouse=True)
+    def queued(self, simple_cache):
+        """Keep queued tasks instead of running them eagerly"""
+        queued = []
+        simple_cache(events)
+        with patch.object(
+            publish_resource_events,
+            "apply_async",
+            side_effect=lambda args, **kwargs: queued.append(args),
+        ):
+            yield queued
+
+    def run_queued(self, queued):
+        for args in queued:
+            publish_resource_events(*args)
+
+    def test_coalesce_events_on_a_resource(self, queued, rmock):
+        rmock.post(f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/")
+        dataset = DatasetFactory()
+        resource = ResourceFactory()
+        dataset.add_resource(resource)
+        resource.description = "First"
+        dataset.update_resource(resource)
+        resource.description = "Last"
+        dataset.update_resource(resource)
+
+        # Only ids are sent to the broker
+        assert [len(args[0][0]) for args in queued] == [4, 4, 4]
+
+        self.run_queued(queued)
+
+        # Created then modified is published once as a creation of the last state
+        assert rmock.call_count == 1
+        assert rmock.last_request.json()["document"]["description"] == "Last"
+        metrics = resource_events_metrics()
+        assert metrics["pending"] == 0
+        assert metrics["coalesced"] == 2
+        assert metrics["delivered"] == 1
+
+    def test_skip_created_then_removed_resource(self, queued, rmock):
+        dataset = DatasetFactory()
+        resource = ResourceFactory()
+        dataset.add_resource(resource)
+        dataset.remove_resource(resource)
+
+        self.run_queued(queued)
+
+        assert rmock.call_count == 0
+        assert resource_events_metrics()["pending"] == 0
+
+    def test_concurrent_events_on_a_resource(self, queued):
+        app = current_app._get_current_object()
+        dataset = DatasetFactory()
+        resource = ResourceFactory()
+        get = events.cache.get
+        reading = Event()
+
+        def slow_get(key):
+            value = get(key)
+            reading.set()
+            time.sleep(0.1)  # Another worker queues an event meanwhile
+            return value
+
+        def queue(action):
+            with app.app_context():
+                queue_resource_events(dataset.id, [resource.id], action)
+
+        with patch.object(events.cache, "get", side_effect=slow_get):
+            created = Thread(target=queue, args=(EventMessageType.CREATED,))
+            created.start()
+            reading.wait()
+            queue(EventMessageType.MODIFIED)
+            created.join()
+
+        pending = events.cache.get(events.PENDING_KEY.format(resource.id))
+        assert pending["action"] == EventMessageType.CREATED.value
+
+    def test_batch_bulk_events(self, queued, rmock):
+        rmock.put(rmock.ANY)
+        resources = ResourceFactory.build_batch(3)
+        dataset = DatasetFactory(resources=resources)
+        for resource in resources:
+            resource.description = "Updated"
+
+        dataset.update_resources(resources)
+
+        assert len(queued) == 1
+        assert len(queued[0][0]) == 3
+        self.run_queued(queued)
+        assert rmock.call_count == 3
+        assert resource_events_metrics()["delivered"] == 3
+
+    def test_publish_failure(self, queued, rmock):
+        rmock.post(
+            f"{current_app.config['RESOURCES_ANALYSER_URI']}/api/resources/", status_code=500
         )
+        dataset = DatasetFactory()
+        dataset.add_resource(ResourceFactory())
+
+        with pytest.raises(RuntimeError):
+            self.run_queued(queued)
+
+        assert resource_events_metrics()["failed"] == 1
+
+    def test_resource_events_command(self, queued):
+        dataset = DatasetFactory()
+        dataset.add_resource(ResourceFactory())
+
+        result = self.cli("dataset", "resource-events")
+
+        assert "Pending events: 1" in result.output
@@ -119,6 +119,45 @@ class DatasetModelTest(PytestOnlyDBTestCase):
         with pytest.raises(ValidationError):
             dataset.update_resource(resource)
 
+    def test_add_resources(self):
+        dataset = DatasetFactory(resources=[ResourceFactory()])
+        resources = ResourceFactory.build_batch(3)
+
+        with assert_emit(Dataset.on_resources_added), assert_not_emit(Dataset.on_resource_added):
+            dataset.add_resources(resources)
+        assert len(dataset.resources) == 4
+        assert [r.id for r in dataset.resources[:3]] == [r.id for r in resources]
+        assert dataset.quality_cached == dataset.compute_quality()
+
+    def test_add_resources_with_existing_id(self):
+        resource = ResourceFactory()
+        dataset = DatasetFactory(resources=[resource])
+
+        with pytest.raises(MongoEngineValidationError):
+            dataset.add_resources([ResourceFactory(), ResourceFactory(id=resource.id)])
+        dataset.reload()
+        assert len(dataset.resources) == 1
+
+    def test_update_resources(self):
+        resources = ResourceFactory.build_batch(3)
+        dataset = DatasetFactory(resources=resources)
+        resources[0].description = "First"
+        resources[2].description = "Last"
+
+        with assert_emit(Dataset.on_resources_updated):
+            dataset.update_resources([resources[2], resources[0]])
+        assert [r.description for r in dataset.resources] == [
+            "First",
+            resources[1].description,
+            "Last",
+        ]
+
+    def test_update_resources_unknown(self):
+        dataset = DatasetFactory(resources=[ResourceFactory()])
+
+        with pytest.raises(MongoEngineValidationError):
+            dataset.update_resources([ResourceFactory()])
+
     def test_last_update_with_resource(self):
         user = UserFactory()
         dataset = DatasetFactory(owner=user)
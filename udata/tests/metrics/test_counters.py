@@ -0,0 +1,68 @@
+import pytest
+
+from udata.core.dataservices.factories import DataserviceFactory
+from udata.core.dataset.factories import DatasetFactory
+from udata.core.metrics.counters import FAMILIES, compute_counters
+from udata.core.organization.factories import OrganizationFactory
+from udata.core.reuse.factories import ReuseFactory
+from udata.core.spatial.factories import GeoZoneFactory, SpatialCoverageFactory
+from udata.core.user.factories import UserFactory
+from udata.models import GeoZone, Organization, User
+from udata.tests.api import PytestOnlyDBTestCase
+
+
+class CountersTest(PytestOnlyDBTestCase):
+    def test_geozones(self):
+        paris = GeoZoneFactory()
+        arles = GeoZoneFactory()
+        empty = GeoZoneFactory()
+        empty.metrics["datasets"] = 12
+        empty.save()
+
+        for _ in range(3):
+            DatasetFactory(spatial=SpatialCoverageFactory(zones=[paris.id]))
+        DatasetFactory(spatial=SpatialCoverageFactory(zones=[paris.id, arles.id, arles.id]))
+        DatasetFactory(spatial=SpatialCoverageFactory(zones=[arles.id]), private=True)
+
+        result = compute_counters("geozones")
+
+        assert result == {"geozones.datasets": 2}
+        assert GeoZone.objects.get(id=paris.id).metrics["datasets"] == 4
+        assert GeoZone.objects.get(id=arles.id).metrics["datasets"] == 1
+        assert GeoZone.objects.get(id=empty.id).metrics["datasets"] == 0
+
+    def test_organizations_and_users(self):
+        org = OrganizationFactory()
+        user = UserFactory()
+        DatasetFactory.create_batch(2, organization=org)
+        DatasetFactory(owner=user)
+        DatasetFactory(owner=user, private=True)
+        ReuseFactory(organization=org, visible=True)
+        DataserviceFactory(owner=user)
+
+        compute_counters("organizations", "users")
+
+        org = Organization.objects.get(id=org.id)
+        assert org.metrics["datasets"] == 2
+        assert org.metrics["reuses"] == 1
+        assert org.metrics["dataservices"] == 0
+        user = User.objects.get(id=user.id)
+        assert user.metrics["datasets"] == 1
+        assert user.metrics["reuses"] == 0
+        assert user.metrics["dataservices"] == 1
+
+    def test_reset_in_batches(self):
+        orgs = OrganizationFactory.create_batch(5)
+        for org in orgs:
+            org.metrics["datasets"] = 3
+            org.save()
+        counter = FAMILIES["organizations"][0]
+
+        counter.write({}, batch_size=2)
+
+        for org in orgs:
+            assert Organization.objects.get(id=org.id).metrics["datasets"] == 0
+
+    def test_unknown_family(self):
+        with pytest.raises(ValueError):
+            compute_counters("unknown")
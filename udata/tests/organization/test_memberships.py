@@ -0,0 +1,103 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from udata.core.dataset.factories import DatasetFactory
+from udata.core.followers.models import Follow
+from udata.core.organization import memberships
+from udata.core.organization.factories import OrganizationFactory
+from udata.core.organization.models import Member
+from udata.core.user.factories import UserFactory
+from udata.tests.api import PytestOnlyDBTestCase
+
+
+class MembershipsTest(PytestOnlyDBTestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, simple_cache):
+        return simple_cache(memberships)
+
+    def test_roles(self):
+        user = UserFactory()
+        admin_of = OrganizationFactory(members=[Member(user=user, role="admin")])
+        editor_of = OrganizationFactory(members=[Member(user=user, role="editor")])
+        deleted = OrganizationFactory(
+            members=[Member(user=user, role="admin")], deleted=datetime.now(UTC)
+        )
+        OrganizationFactory()
+
+        result = memberships.get(user)
+
+        assert result.roles == {admin_of.id: "admin", editor_of.id: "editor", deleted.id: "admin"}
+        assert sorted(result.active) == sorted([admin_of.id, editor_of.id])
+        assert sorted(user.organization_ids) == sorted([admin_of.id, editor_of.id])
+
+    def test_loaded_once(self, app, mocker):
+        user = UserFactory()
+        OrganizationFactory(members=[Member(user=user, role="admin")])
+        load = mocker.spy(memberships, "load")
+
+        memberships.get(user)
+        memberships.get(user)
+        with app.app_context():  # Another request
+            memberships.get(user)
+
+        load.assert_called_once()
+
+    def test_invalidated_on_members_change(self, app):
+        user = UserFactory()
+        org = OrganizationFactory(members=[Member(user=user, role="admin")])
+        assert memberships.get(user).active == [org.id]
+
+        org.members = []
+        org.save()
+
+        assert memberships.get(user).active == []
+        with app.app_context():
+            assert memberships.get(user).active == []
+
+    def test_invalidated_once_written(self, mocker):
+        user = UserFactory()
+        org = OrganizationFactory(members=[Member(user=user, role="admin")])
+        memberships.get(user)
+
+        def invalidate(*user_ids):
+            # A concurrent request would load the new members
+            assert memberships.load(user.id).active == []
+            return memberships.cache.delete_many(
+                *(memberships.CACHE_KEY.format(id) for id in user_ids)
+            )
+
+        invalidate = mocker.patch.object(memberships, "invalidate", side_effect=invalidate)
+
+        org.members = []
+        org.save()
+
+        invalidate.assert_called_once_with(user.id)
+
+    def test_invalidated_on_role_change(self):
+        user = UserFactory()
+        org = OrganizationFactory(members=[Member(user=user, role="admin")])
+        assert memberships.get(user).roles == {org.id: "admin"}
+
+        org.members[0].role = "editor"
+        org.save()
+
+        assert memberships.get(user).roles == {org.id: "editor"}
+
+    def test_anonymous(self):
+        assert memberships.get(None).active == []
+
+    def test_org_counts(self):
+        user = UserFactory()
+        orgs = OrganizationFactory.create_batch(2, members=[Member(user=user, role="admin")])
+        DatasetFactory.create_batch(2, organization=orgs[0])
+        DatasetFactory(organization=orgs[1])
+        DatasetFactory(organization=orgs[1], private=True)
+        DatasetFactory()
+        Follow.objects.create(follower=UserFactory(), following=orgs[0])
+        Follow.objects.create(follower=UserFactory(), following=orgs[1])
+        Follow.objects.create(follower=UserFactory(), following=OrganizationFactory())
+
+        assert user.datasets_org_count == 3
+        assert user.followers_org_count == 2
+        assert UserFactory().datasets_org_count == 0
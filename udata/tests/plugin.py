@@ -22,6 +22,24 @@ def rmock():
         yield m
 
 
+@pytest.fixture
+def simple_cache(app, mocker):
+    """
+    Patch the `cache` of some modules with a shared in-memory cache:
+    `cache = simple_cache(module, ...)`
+    """
+    from flask_caching import Cache
+
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+
+    def patch_modules(*modules):
+        for module in modules:
+            mocker.patch.object(module, "cache", cache)
+        return cache
+
+    return patch_modules
+
+
 @pytest.fixture
 def instance_path(app, tmpdir):
     """Use temporary application instance_path"""
@@ -30,7 +48,7 @@ def instance_path(app, tmpdir):
     app.instance_path = str(tmpdir)
     app.config["FS_ROOT"] = str(tmpdir / "fs")
     # Force local storage:
-    for s in "resources", "avatars", "logos", "images", "chunks", "tmp":
+    for s in "resources", "avatars", "logos", "images", "chunks", "tmp", "profiles":
         key = "{0}_FS_{{0}}".format(s.upper())
         app.config[key.format("BACKEND")] = "local"
         app.config.pop(key.format("ROOT"), None)
@@ -82,9 +82,10 @@ class SearchAdaptorTest:
         parser = FakeSearch.as_request_parser()
         assert isinstance(parser, RequestParser)
 
-        # query + tag and other filters + sorts + pagination
-        assert len(parser.args) == 6
+        # query + tag and other filters + facets + sorts + pagination
+        assert len(parser.args) == 7
         assertHasArgument(parser, "q", str)
+        assertHasArgument(parser, "facets", str)
         assertHasArgument(parser, "sort", str)
         assertHasArgument(parser, "tag", clean_string)
         assertHasArgument(parser, "other", clean_string)
@@ -95,9 +96,10 @@ class SearchAdaptorTest:
         parser = FakeSearchWithBool.as_request_parser()
         assert isinstance(parser, RequestParser)
 
-        # query + boolean filter + sorts + pagination
-        assert len(parser.args) == 5
+        # query + boolean filter + facets + sorts + pagination
+        assert len(parser.args) == 6
         assertHasArgument(parser, "q", str)
+        assertHasArgument(parser, "facets", str)
         assertHasArgument(parser, "sort", str)
         assertHasArgument(parser, "boolean", inputs.boolean)
         assertHasArgument(parser, "page", int)
@@ -108,9 +110,10 @@ class SearchAdaptorTest:
         filter = FakeSearchWithCoverage.filters["coverage"]
         assert isinstance(parser, RequestParser)
 
-        # query + range facet + sorts + pagination
-        assert len(parser.args) == 5
+        # query + range facet + facets + sorts + pagination
+        assert len(parser.args) == 6
         assertHasArgument(parser, "q", str)
+        assertHasArgument(parser, "facets", str)
         assertHasArgument(parser, "sort", str)
         assertHasArgument(parser, "coverage", filter.validate_parameter)
         assertHasArgument(parser, "page", int)
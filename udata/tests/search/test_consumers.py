@@ -38,6 +38,8 @@ def test_parse_dataset_obj():
             "public_service": 1,
             "followers": 401,
             "badges": ["public-service"],
+            "slug": "ministere-de-l-economie-des-finances-et-de-la-relance",
+            "acronym": "MEFR",
         },
         "owner": None,
         "format": ["pdf", "pdf", "pdf", "pdf", "txt", "txt", "txt", "txt", "txt", "txt"],
@@ -51,6 +53,8 @@ def test_parse_dataset_obj():
         ],
         "granularity": "fr:commune",
         "schema_": ["etalab/schema-irve"],
+        "slug": "demandes-de-valeurs-foncieres",
+        "metrics": {"views": 7806, "followers": 72, "reuses": 45},
     }
     document = DatasetConsumer.load_from_dict(copy.deepcopy(obj)).to_dict()
 
@@ -65,6 +69,8 @@ def test_parse_dataset_obj():
         "tags",
         "license",
         "owner",
+        "slug",
+        "metrics",
     ]:
         assert document[key] == obj[key]
 
@@ -91,6 +97,8 @@ def test_parse_dataset_obj():
     assert document["organization"] == obj["organization"]["id"]
     assert document["organization_name"] == obj["organization"]["name"]
     assert document["organization_badges"] == obj["organization"]["badges"]
+    assert document["organization_slug"] == obj["organization"]["slug"]
+    assert document["organization_acronym"] == obj["organization"]["acronym"]
     assert document["orga_followers"] == log2p(401)
     assert document["resources_ids"] == [res["id"] for res in obj["resources"]]
     assert document["resources_titles"] == [res["title"] for res in obj["resources"]]
@@ -1,5 +1,24 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from elasticsearch_dsl import Q
+from elasticsearch_dsl.response import Response
+from flask_caching.backends import SimpleCache
+
+from udata import search
+from udata.app import cache
+from udata.core.dataset.models import Dataset
+from udata.core.dataset.search import DatasetSearch
+from udata.search.cache import bump_index_generation, cached_search, results_cache_key
 from udata.search.query import DEFAULT_PAGE_SIZE, SearchQuery
-from udata.tests.api import APITestCase
+from udata.tests.api import APITestCase, PytestOnlyAPITestCase
+from udata_search_service.search_clients import (
+    DATASET_FACETS,
+    SearchableDataset,
+    add_facets,
+    parse_facets,
+)
 
 
 class QueryTest(APITestCase):
@@ -55,3 +74,175 @@ class QueryTest(APITestCase):
         assert params["sort"] == "-created"
         assert params["organization"] == "534fff81a3a7292c64a77e5c"
         assert params["tag"] == ["tag-1", "tag-2"]
+
+    def test_search_query_facets(self):
+        assert SearchQuery(params={}).facets is None
+        assert SearchQuery(params={"facets": "tag,format"}).facets == ["format", "tag"]
+        assert SearchQuery(params={"facets": "none"}).facets == []
+        assert "facets" not in SearchQuery(params={"facets": "tag"}).to_search_params()
+
+
+class FacetsCacheTest(APITestCase):
+    def search(self, **params):
+        return search.search_for(Dataset, **params)
+
+    def test_cache_key_ignores_pagination_and_sort(self):
+        key = self.search(q="insee", tag=["a", "b"]).facets_cache_key()
+        assert (
+            key
+            == self.search(q="insee", tag=["b", "a"], page=3, sort="-created").facets_cache_key()
+        )
+        assert key != self.search(q="insee", tag=["a"]).facets_cache_key()
+        assert key != self.search(q="insee", tag=["a", "b"], facets="tag").facets_cache_key()
+
+    def test_cache_key_generation(self):
+        key = self.search(q="insee").facets_cache_key()
+        with patch.object(cache, "get", return_value="new-generation"):
+            assert self.search(q="insee").facets_cache_key() != key
+
+    def test_no_cache_key_without_facets(self):
+        assert self.search(facets="none").facets_cache_key() is None
+
+    def test_execute_search_uses_cached_facets(self):
+        self.app.config["ELASTICSEARCH_URL"] = "http://localhost:9200"
+        self.app.config["SEARCH_CACHE_TTL"] = 0
+        facets = {"tag": [{"name": "all", "count": 1}]}
+        with (
+            patch("udata.search.get_elastic_client"),
+            patch.object(DatasetSearch, "service_class") as service_class,
+            patch.object(cache, "get", return_value=facets),
+        ):
+            service_class.return_value.search.return_value = ([], 0, 1, {})
+            result = self.search(q="insee").execute_search()
+
+        params = service_class.return_value.search.call_args.args[0]
+        assert params["facets"] == []
+        assert result.facets == facets
+
+    def test_execute_search_caches_facets(self):
+        self.app.config["ELASTICSEARCH_URL"] = "http://localhost:9200"
+        self.app.config["SEARCH_CACHE_TTL"] = 0
+        facets = {"tag": [{"name": "all", "count": 1}]}
+        with (
+            patch("udata.search.get_elastic_client"),
+            patch.object(DatasetSearch, "service_class") as service_class,
+            patch.object(cache, "set") as cache_set,
+        ):
+            service_class.return_value.search.return_value = ([], 0, 1, facets)
+            result = self.search(q="insee", facets="tag").execute_search()
+
+        params = service_class.return_value.search.call_args.args[0]
+        assert params["facets"] == ["tag"]
+        assert result.facets == facets
+        assert cache_set.call_args.args[1] == facets
+
+
+class LeanSearchTest(APITestCase):
+    def test_lean_search_elastic_returns_sources(self):
+        entity = Mock(id="1", slug="lean", title="Lean")
+        with (
+            patch("udata.search.get_elastic_client"),
+            patch.object(DatasetSearch, "service_class") as service_class,
+        ):
+            service_class.return_value.search.return_value = ([entity], 1, 1, {})
+            data = search.search_for(Dataset, lean=True, facets="none").search_elastic()
+
+        assert data["ids"] == ["1"]
+        assert [source["slug"] for source in data["sources"]] == ["lean"]
+        assert set(data["sources"][0]) == {"id", *DatasetSearch.lean_fields}
+
+    def test_lean_changes_results_cache_key(self):
+        key = search.search_for(Dataset, q="insee").results_cache_key()
+        assert search.search_for(Dataset, q="insee", lean=True).results_cache_key() != key
+
+
+class ResultsCacheTest(PytestOnlyAPITestCase):
+    @pytest.fixture(autouse=True)
+    def store(self):
+        store = SimpleCache()
+        with patch("udata.search.cache.cache", store):
+            yield store
+
+    def test_cache_results(self):
+        compute = Mock(return_value={"ids": ["1"], "total": 1, "facets": {}})
+
+        assert cached_search("key", compute) == compute.return_value
+        assert cached_search("key", compute) == compute.return_value
+        compute.assert_called_once()
+
+    def test_serve_stale_while_refreshing(self, store):
+        store.set("key", {"at": time.time() - 60, "value": "stale"})
+        # Another request is refreshing the entry
+        store.add("key:lock", 1)
+
+        assert cached_search("key", Mock(return_value="fresh")) == "stale"
+
+        store.delete("key:lock")
+        assert cached_search("key", Mock(return_value="fresh")) == "fresh"
+        assert cached_search("key", Mock(return_value="other")) == "fresh"
+
+    def test_serve_stale_on_refresh_error(self, store):
+        store.set("key", {"at": time.time() - 60, "value": "stale"})
+
+        assert cached_search("key", Mock(side_effect=ConnectionError)) == "stale"
+
+    def test_coalesce_concurrent_misses(self, store):
+        store.add("key:lock", 1)
+        compute = Mock(return_value="computed")
+
+        def concurrent_store(delay):
+            store.set("key", {"at": time.time(), "value": "concurrent"})
+
+        with patch("udata.search.cache.time.sleep", side_effect=concurrent_store):
+            assert cached_search("key", compute) == "concurrent"
+        compute.assert_not_called()
+
+    def test_generation_changes_key(self):
+        key = results_cache_key("dataset", {"q": "insee"})
+        bump_index_generation("dataset")
+        assert results_cache_key("dataset", {"q": "insee"}) != key
+        assert results_cache_key("reuse", {"q": "insee"}) != key
+
+
+class FacetsAggregationsTest:
+    def test_add_requested_facets(self):
+        search = SearchableDataset.search()
+        filters = {"license": Q("term", license="cc-by"), "format": Q("term", format="csv")}
+
+        add_facets(
+            search,
+            DATASET_FACETS,
+            ["license", "format"],
+            lambda key: [value for name, value in filters.items() if name != key],
+        )
+
+        aggs = search.to_dict()["aggs"]
+        assert set(aggs) == {"license_filtered", "format_filtered"}
+        assert aggs["license_filtered"]["filter"] == {
+            "bool": {"must": [{"term": {"format": "csv"}}]}
+        }
+        assert "cardinality" not in str(aggs)
+
+    def test_no_facets(self):
+        search = SearchableDataset.search()
+        add_facets(search, DATASET_FACETS, [])
+        assert "aggs" not in search.to_dict()
+
+    def test_parse_facets(self):
+        search = SearchableDataset.search()
+        response = Response(
+            search,
+            {
+                "hits": {"hits": [], "total": {"value": 0}},
+                "aggregations": {
+                    "tag_filtered": {
+                        "doc_count": 7,
+                        "tag": {"buckets": [{"key": "insee", "doc_count": 3}]},
+                    }
+                },
+            },
+        )
+
+        assert parse_facets(response, DATASET_FACETS) == {
+            "tag": [{"name": "all", "count": 7}, {"name": "insee", "count": 3}]
+        }
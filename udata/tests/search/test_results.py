@@ -1,5 +1,7 @@
 from udata.core.dataset.factories import DatasetFactory
 from udata.core.dataset.search import DatasetSearch
+from udata.core.reuse.factories import ReuseFactory
+from udata.core.reuse.search import ReuseSearch
 from udata.models import Dataset
 from udata.search.result import SearchResult
 from udata.tests.api import APITestCase
@@ -60,3 +62,63 @@ class ResultTest(APITestCase):
         objects = search_results.objects
         for o in objects:
             assert isinstance(o, Dataset)
+
+    def test_results_lean_objects_from_sources(self):
+        datasets = DatasetFactory.create_batch(2)
+        sources = [DatasetSearch.lean_source_from_document(d) for d in datasets]
+        for dataset in datasets:
+            dataset.delete()
+
+        search_query = DatasetSearch.temp_search()(params={"lean": True})
+        search_results = SearchResult(
+            query=search_query,
+            result=[{"id": source["id"]} for source in sources],
+            sources=sources,
+            page=1,
+            page_size=20,
+            total=2,
+        )
+
+        # Served from the sources only: deleted datasets are still there
+        objects = search_results.get_objects()
+        assert [o["id"] for o in objects] == [str(d.id) for d in datasets]
+        assert [o["slug"] for o in objects] == [d.slug for d in datasets]
+
+    def test_results_lean_objects_fallback_on_missing_fields(self):
+        indexed, outdated, deleted = DatasetFactory.create_batch(3)
+        sources = [
+            DatasetSearch.lean_source_from_document(indexed),
+            # Indexed before lean fields were added
+            {"id": str(outdated.id)},
+            {"id": str(deleted.id)},
+        ]
+        deleted.delete()
+
+        search_query = DatasetSearch.temp_search()(params={"lean": True})
+        search_results = SearchResult(
+            query=search_query,
+            result=[{"id": source["id"]} for source in sources],
+            sources=sources,
+            page=1,
+            page_size=20,
+            total=3,
+        )
+
+        objects = search_results.get_objects()
+        assert [o["id"] for o in objects] == [str(indexed.id), str(outdated.id)]
+        assert objects[1]["slug"] == outdated.slug
+
+    def test_results_lean_unsupported(self):
+        reuses = ReuseFactory.create_batch(2)
+
+        search_query = ReuseSearch.temp_search()(params={"lean": True})
+        search_results = SearchResult(
+            query=search_query,
+            result=[{"id": str(reuse.id)} for reuse in reuses],
+            page=1,
+            page_size=20,
+            total=2,
+        )
+
+        assert not search_query.lean
+        assert search_results.get_objects() == reuses
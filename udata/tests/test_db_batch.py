@@ -0,0 +1,121 @@
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from mongoengine.connection import get_db
+
+from udata.core.dataset.factories import DatasetFactory
+from udata.core.dataset.models import Dataset
+from udata.db.batch import BulkWriter, batches, parallel, split_ids
+from udata.tests.api import PytestOnlyDBTestCase
+
+
+class BatchTest(PytestOnlyDBTestCase):
+    @pytest.fixture
+    def db(self):
+        db = get_db()
+        db.items.insert_many([{"_id": n, "even": n % 2 == 0} for n in range(10)])
+        yield db
+        db.items.drop()
+
+    def test_batches(self, db):
+        result = list(batches(db.items, batch_size=4))
+
+        assert [[doc["_id"] for doc in batch] for batch in result] == [
+            [0, 1, 2, 3],
+            [4, 5, 6, 7],
+            [8, 9],
+        ]
+
+    def test_batches_with_query_and_range(self, db):
+        result = list(batches(db.items, {"even": True}, batch_size=2, start=2, end=8))
+
+        assert [[doc["_id"] for doc in batch] for batch in result] == [[2, 4], [6]]
+
+    def test_batches_of_models(self):
+        datasets = DatasetFactory.create_batch(3)
+
+        result = list(batches(Dataset, batch_size=2))
+
+        assert [len(batch) for batch in result] == [2, 1]
+        assert [dataset.id for batch in result for dataset in batch] == sorted(
+            dataset.id for dataset in datasets
+        )
+        assert isinstance(result[0][0], Dataset)
+
+    def test_bulk_writer(self, db):
+        with BulkWriter(db.others, batch_size=3) as writer:
+            for n in range(5):
+                writer.insert_one({"_id": n})
+            assert db.others.count_documents({}) == 3
+
+        assert db.others.count_documents({}) == 5
+        assert writer.inserted == 5
+        db.others.drop()
+
+    def test_split_ids(self, db):
+        assert split_ids(db.items, parts=4) == [2, 5, 7]
+        assert split_ids(db.items, {"even": True}, parts=2) == [4]
+
+    def test_parallel(self, db):
+        seen = []
+
+        count = parallel(db.items, lambda batch: seen.extend(batch), batch_size=2)
+
+        assert count == 10
+        assert sorted(doc["_id"] for doc in seen) == list(range(10))
+
+
+class ResumableMigrationTest(PytestOnlyDBTestCase):
+    FILENAME = "test_batch_migration_temp.py"
+
+    @pytest.fixture
+    def db(self):
+        db = get_db()
+        db.items.insert_many([{"_id": n} for n in range(10)])
+        yield db
+        db.items.drop()
+        db.processed.drop()
+        db.failures.drop()
+        db.migrations.delete_one({"filename": self.FILENAME})
+
+    @pytest.fixture(autouse=True)
+    def migration_file(self):
+        migration_path = Path(__file__).parent.parent / "migrations" / self.FILENAME
+        migration_path.write_text(
+            dedent(
+                """\
+                '''Process items by batches, failing once on the sixth one'''
+                from udata.db.batch import batches
+
+                def migrate(db):
+                    for batch in batches(db.items, batch_size=2):
+                        for item in batch:
+                            if item["_id"] == 5 and not db.failures.find_one():
+                                db.failures.insert_one({})
+                                raise ValueError("Failure")
+                            db.processed.update_one(
+                                {"_id": item["_id"]}, {"$inc": {"runs": 1}}, upsert=True
+                            )
+                """
+            )
+        )
+        yield
+        migration_path.unlink()
+
+    def test_resume(self, db):
+        self.cli("db migrate")
+
+        record = db.migrations.find_one({"filename": self.FILENAME})
+        assert record["checkpoints"] == {"items": 3}
+        assert "Interrupted" in self.cli("db status").output
+
+        result = self.cli("db migrate")
+
+        assert "Resume" in result.output
+        runs = {item["_id"]: item["runs"] for item in db.processed.find()}
+        # The interrupted batch is processed again
+        assert runs == {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 1, 6: 1, 7: 1, 8: 1, 9: 1}
+        record = db.migrations.find_one({"filename": self.FILENAME})
+        assert "checkpoints" not in record
+        assert record["ops"][-1]["success"]
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+
+from udata.core.activity.models import Activity
+from udata.core.dataset.models import Dataset
+from udata.db import indexes
+from udata.tests.api import PytestOnlyDBTestCase
+
+
+class IndexesTest(PytestOnlyDBTestCase):
+    @pytest.fixture(autouse=True)
+    def stats(self):
+        with patch.object(indexes, "index_stats", return_value={}) as index_stats:
+            yield index_stats
+
+    @pytest.fixture
+    def collection(self):
+        collection = Dataset._get_collection()
+        collection.drop_indexes()
+        indexes.build(Dataset, indexes.declared_indexes(Dataset))
+        return collection
+
+    def test_one_model_by_collection(self):
+        models = indexes.collection_models()
+
+        collections = [model._get_collection_name() for model in models]
+        assert collections == sorted(set(collections))
+        assert Activity in models
+
+    def test_declared_indexes(self):
+        fields = [spec["fields"] for spec in indexes.declared_indexes(Dataset)]
+
+        assert [("slug", 1)] in fields
+        assert [("title", "text")] in fields
+
+    def test_up_to_date(self, collection):
+        diff = indexes.diff(Dataset)
+
+        assert diff.missing == []
+        assert diff.extra == {}
+
+    def test_missing_and_extra(self, collection):
+        collection.drop_index("slug_1")
+        collection.create_index([("license", 1)])
+
+        diff = indexes.diff(Dataset)
+
+        assert [spec["fields"] for spec in diff.missing] == [[("slug", 1)]]
+        assert list(diff.extra) == ["license_1"]
+
+    def test_unused(self, collection, stats):
+        stats.return_value = {"slug_1": 0, "created_at_internal_1": 12}
+
+        assert indexes.diff(Dataset).unused == ["slug_1"]
+
+    def test_commands(self, collection):
+        collection.drop_index("slug_1")
+
+        result = self.cli("db indexes plan --model Dataset")
+        assert "dataset: {slug: 1}" in result.output
+        assert "1 index(es) to build" in result.output
+
+        result = self.cli("db indexes diff -m Dataset")
+        assert "+ {slug: 1}" in result.output
+
+        self.cli("db indexes apply -m Dataset")
+        assert "slug_1" in collection.index_information()
+        result = self.cli("db indexes plan -m Dataset")
+        assert "Nothing to build" in result.output
@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+from unittest.mock import patch
 
 import pytest
 from flask import url_for
@@ -31,6 +32,7 @@ from udata.core.user.factories import AdminFactory, UserFactory
 from udata.core.user.models import User
 from udata.features.notifications.models import Notification
 from udata.models import Dataset, Member
+from udata.tasks import DocumentReference
 from udata.tests.helpers import capture_mails
 from udata.utils import faker
 
@@ -1132,7 +1134,7 @@ class NotifyDiscussionsTest(APITestCase):
         )
 
         with capture_mails() as mails:
-            notify_new_discussion(discussion.id)
+            notify_new_discussion(discussion)
 
         # Should have sent one mail to the owner
         self.assertEqual(len(mails), 1)
@@ -1143,6 +1145,38 @@ class NotifyDiscussionsTest(APITestCase):
         self.assertEqual(len(notifications), 1)
         self.assertEqual(notifications[0].details.status, DiscussionStatus.NEW_DISCUSSION)
 
+    def test_new_discussion_signal_sends_a_reference(self):
+        owner = UserFactory()
+        user = UserFactory()
+        discussion = Discussion.objects.create(
+            subject=DatasetFactory(owner=owner),
+            user=user,
+            title=faker.sentence(),
+            discussion=[Message(content=faker.sentence(), posted_by=user)],
+        )
+
+        with (
+            patch.object(
+                notify_new_discussion, "delay", wraps=notify_new_discussion.delay
+            ) as delay,
+            capture_mails() as mails,
+        ):
+            on_new_discussion.send(discussion)
+
+        delay.assert_called_once_with(DocumentReference.of(discussion))
+        self.assertEqual(len(mails), 1)
+        self.assertEqual(mails[0].recipients[0], owner.email)
+
+    def test_discussion_deleted_before_notification(self):
+        discussion = DiscussionFactory(subject=DatasetFactory())
+        discussion_id = str(discussion.id)
+        discussion.delete()
+
+        with capture_mails() as mails:
+            notify_new_discussion(discussion_id)
+
+        self.assertEqual(len(mails), 0)
+
     def test_new_discussion_comment_mail(self):
         owner = UserFactory()
         poster = UserFactory()
@@ -1158,7 +1192,7 @@ class NotifyDiscussionsTest(APITestCase):
         )
 
         with capture_mails() as mails:
-            notify_new_discussion_comment(discussion.id, message=len(discussion.discussion) - 1)
+            notify_new_discussion_comment(discussion, message=len(discussion.discussion) - 1)
 
         # Should have sent one mail to the owner and the other participants
         # and no mail to the commenter. The owner should appear only once in the recipients
@@ -1190,8 +1224,8 @@ class NotifyDiscussionsTest(APITestCase):
         )
 
         with capture_mails():
-            notify_new_discussion(discussion.id)
-            notify_new_discussion_comment(discussion.id, message=len(discussion.discussion) - 1)
+            notify_new_discussion(discussion)
+            notify_new_discussion_comment(discussion, message=len(discussion.discussion) - 1)
 
         # Verify previous notifications were handled
         notifications = Notification.objects(
@@ -1217,7 +1251,7 @@ class NotifyDiscussionsTest(APITestCase):
         )
 
         with capture_mails() as mails:
-            notify_discussion_closed(discussion.id, message=len(discussion.discussion) - 1)
+            notify_discussion_closed(discussion, message=len(discussion.discussion) - 1)
 
         # Should have sent one mail to each participant
         # and no mail to the closer
@@ -1247,15 +1281,15 @@ class NotifyDiscussionsTest(APITestCase):
         )
 
         with capture_mails():
-            notify_new_discussion(discussion.id)
-            notify_new_discussion_comment(discussion.id, message=1)
+            notify_new_discussion(discussion)
+            notify_new_discussion_comment(discussion, message=1)
 
             # Properly close the discussion to ensure closed_by is set
             discussion.closed = datetime.now(UTC)
             discussion.closed_by = commenter
             discussion.save()
 
-            notify_discussion_closed(discussion.id, message=len(discussion.discussion) - 1)
+            notify_discussion_closed(discussion, message=len(discussion.discussion) - 1)
 
         # Verify previous notifications (NEW_DISCUSSION and NEW_COMMENT) were handled
         notifications = Notification.objects(
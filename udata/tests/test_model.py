@@ -16,14 +16,15 @@ from mongoengine.fields import (
 )
 from mongoengine.signals import pre_save
 
+from udata.core.dataset.factories import DatasetFactory
 from udata.errors import ConfigError
 from udata.i18n import _
 from udata.models import Dataset
-from udata.mongo import build_test_config, db, validate_config
+from udata.mongo import build_test_config, db, slug_fields, validate_config
 from udata.mongo.datetime_fields import DateField, DateRange, Datetimed
 from udata.mongo.document import UDataDocument as Document
 from udata.mongo.extras_fields import ExtrasField
-from udata.mongo.slug_fields import SlugField
+from udata.mongo.slug_fields import SlugCounter, SlugField, backfill_slug_counters
 from udata.mongo.url_field import URLField
 from udata.mongo.uuid_fields import AutoUUIDField
 from udata.settings import Defaults
@@ -291,6 +292,65 @@ class SlugFieldTest(PytestOnlyDBTestCase):
         field = SlugField()
         assert field.slugify("à-€-ü") == "a-eur-u"
 
+    def test_suffix_from_counter(self):
+        """SlugField should suffix colliding slugs with the next counter value"""
+        slugs = [SlugTester.objects.create(title="title").slug for i in range(3)]
+
+        assert slugs == ["title", "title-1", "title-2"]
+        counter = SlugCounter.objects.get(namespace="slug_tester", base_slug="title")
+        assert counter.value == 2
+
+    def test_counter_starts_after_existing_suffixes(self):
+        """SlugField should initialize a counter from the existing contiguous suffixes"""
+        SlugTester.objects.create(title="title")
+        SlugTester.objects.create(title="other", slug="title-1")
+        SlugTester.objects.create(title="other", slug="title-2019")
+
+        assert SlugTester.objects.create(title="title").slug == "title-2"
+
+    def test_counter_skips_taken_slugs(self):
+        """SlugField should not allocate slugs manually set after the counter"""
+        SlugTester.objects.create(title="title")
+        SlugTester.objects.create(title="title")
+        SlugTester.objects.create(title="other", slug="title-2")
+
+        assert SlugTester.objects.create(title="title").slug == "title-3"
+
+    def test_backfill_counters_command(self):
+        [DatasetFactory(title="title") for i in range(2)]
+        SlugCounter.drop_collection()
+
+        result = self.cli("db backfill-slug-counters -m Dataset")
+
+        assert "dataset: 1 counter(s)" in result.output
+        assert SlugCounter.objects.get(namespace="dataset", base_slug="title").value == 1
+
+    def test_concurrently_taken_slug(self, mocker):
+        """SlugField should allocate another slug if it has been taken before insertion"""
+        SlugTester.objects.create(title="title")
+        allocate = slug_fields.allocate_slug
+        stale = iter(["title"])
+        mocker.patch.object(
+            slug_fields,
+            "allocate_slug",
+            side_effect=lambda *args: next(stale, None) or allocate(*args),
+        )
+
+        obj = SlugTester.objects.create(title="title")
+
+        assert obj.slug == "title-1"
+        assert SlugTester.objects.count() == 2
+
+    def test_backfill_counters(self):
+        [SlugTester.objects.create(title="title") for i in range(3)]
+        SlugTester.objects.create(title="title 2019")
+        SlugTester.objects.create(title="other 2")
+        SlugCounter.drop_collection()
+
+        assert backfill_slug_counters(SlugTester) == 1
+        assert SlugCounter.objects.get(base_slug="title").value == 2
+        assert SlugTester.objects.create(title="title").slug == "title-3"
+
 
 class DateFieldTest(PytestOnlyDBTestCase):
     def test_none_if_empty_and_not_required(self):
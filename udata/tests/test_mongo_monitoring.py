@@ -0,0 +1,151 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from udata.mongo import monitoring
+from udata.mongo.monitoring import CommandStats, current_stats, listener, query_shape
+from udata.tasks import task
+from udata.tests.api import PytestOnlyTestCase
+
+
+def run_commands(*commands):
+    """Notify the listener of succeeded commands (mongomock doesn't publish events)"""
+    for request_id, command in enumerate(commands):
+        name = next(iter(command))
+        listener.started(SimpleNamespace(command_name=name, command=command, request_id=request_id))
+        listener.succeeded(
+            SimpleNamespace(command_name=name, request_id=request_id, duration_micros=1500)
+        )
+
+
+def find_users(count):
+    run_commands(*({"find": "user", "filter": {"_id": n}} for n in range(count)))
+
+
+@task(name="test-mongo-monitoring")
+def monitored_task(count):
+    find_users(count)
+
+
+class QueryShapeTest:
+    def test_find(self):
+        command = {"find": "user", "filter": {"_id": {"$in": [1, 2]}, "deleted": None}}
+        assert query_shape("find", command) == "find user {_id: {$in: [?]}, deleted: ?}"
+
+    def test_aggregate(self):
+        command = {
+            "aggregate": "dataset",
+            "pipeline": [{"$match": {"organization": 1}}, {"$group": {"_id": None}}],
+        }
+        assert (
+            query_shape("aggregate", command)
+            == "aggregate dataset $match | $group {organization: ?}"
+        )
+
+    def test_update(self):
+        command = {"update": "dataset", "updates": [{"q": {"_id": 1}, "u": {"$set": {"a": 1}}}]}
+        assert query_shape("update", command) == "update dataset {_id: ?}"
+
+    def test_or(self):
+        command = {"count": "reuse", "query": {"$or": [{"a": 1}, {"b": 2}]}}
+        assert query_shape("count", command) == "count reuse {$or: [{a: ?}, {b: ?}]}"
+
+
+class CommandStatsTest:
+    def test_n_plus_one(self, mocker):
+        add_breadcrumb = mocker.patch("udata.sentry.add_breadcrumb")
+        stats = CommandStats("test", threshold=3)
+        token = current_stats.set(stats)
+        try:
+            run_commands({"find": "dataset", "filter": {"slug": "a"}})
+            find_users(4)
+            run_commands({"hello": 1}, {"getMore": 1, "collection": "user"})
+        finally:
+            current_stats.reset(token)
+
+        assert stats.count == 6
+        assert stats.duration == pytest.approx(9)
+        assert stats.n_plus_one == {"find user {_id: ?}": 4}
+        add_breadcrumb.assert_called_once()
+        assert "1 likely N+1" in stats.server_timing()
+
+    def test_no_threshold(self):
+        stats = CommandStats("test")
+        stats.shapes["find user {_id: ?}"] = 100
+
+        assert stats.n_plus_one == {}
+
+
+class MonitoringTest(PytestOnlyTestCase):
+    @pytest.fixture
+    def view(self, app):
+        commands = {"count": 0}
+
+        def view():
+            find_users(commands["count"])
+            return "ok"
+
+        app.add_url_rule("/monitored/", "monitored", view)
+        return commands
+
+    def test_server_timing_in_debug(self, view, app):
+        app.debug = True
+        view["count"] = 3
+
+        response = app.test_client().get("/monitored/")
+
+        assert response.headers["Server-Timing"] == 'mongo;dur=4.50;desc="3 command(s)"'
+
+    def test_no_server_timing_in_production(self, view, app):
+        response = app.test_client().get("/monitored/")
+
+        assert "Server-Timing" not in response.headers
+
+    @pytest.mark.options(MONGO_MONITORING_LOG_SAMPLE_RATE=1)
+    def test_log_n_plus_one(self, view, app, caplog):
+        view["count"] = 12
+
+        with caplog.at_level(logging.INFO, logger=monitoring.__name__):
+            app.test_client().get("/monitored/")
+
+        [record] = caplog.records
+        assert record.levelno == logging.WARNING
+        assert "GET /monitored/: 12 MongoDB command(s)" in record.getMessage()
+        assert record.mongo["n_plus_one"] == {"find user {_id: ?}": 12}
+        assert current_stats.get() is None
+
+    @pytest.mark.options(MONGO_MONITORING_LOG_SAMPLE_RATE=1)
+    def test_log_sampled(self, view, app, caplog):
+        view["count"] = 2
+
+        with caplog.at_level(logging.INFO, logger=monitoring.__name__):
+            app.test_client().get("/monitored/")
+
+        [record] = caplog.records
+        assert record.levelno == logging.INFO
+        assert record.mongo == {
+            "scope": "GET /monitored/",
+            "commands": 2,
+            "duration_ms": 3.0,
+            "n_plus_one": {},
+        }
+
+    @pytest.mark.options(MONGO_MONITORING_LOG_SAMPLE_RATE=0)
+    def test_log_not_sampled(self, view, app, caplog):
+        view["count"] = 12
+
+        with caplog.at_level(logging.INFO, logger=monitoring.__name__):
+            app.test_client().get("/monitored/")
+
+        assert caplog.records == []
+
+    @pytest.mark.options(MONGO_MONITORING_LOG_SAMPLE_RATE=1)
+    def test_task(self, caplog):
+        with caplog.at_level(logging.INFO, logger=monitoring.__name__):
+            monitored_task.delay(10)
+
+        [record] = caplog.records
+        assert record.mongo["scope"] == "task test-mongo-monitoring"
+        assert record.mongo["commands"] == 10
+        assert current_stats.get() is None
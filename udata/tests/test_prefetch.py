@@ -0,0 +1,93 @@
+from bson import DBRef
+
+from udata.api import fields
+from udata.core.dataset.factories import DatasetFactory
+from udata.core.discussions.factories import DiscussionFactory, MessageDiscussionFactory
+from udata.core.discussions.models import Discussion
+from udata.core.organization.factories import OrganizationFactory
+from udata.core.user.factories import UserFactory
+from udata.models import Dataset, Organization
+from udata.mongo.prefetch import prefetch, reference_paths
+from udata.tests.api import PytestOnlyDBTestCase
+
+
+def raw(document, name):
+    return document._data[name]
+
+
+class PrefetchTest(PytestOnlyDBTestCase):
+    def test_prefetch_references(self):
+        org = OrganizationFactory()
+        user = UserFactory()
+        for _ in range(3):
+            DatasetFactory(organization=org)
+        DatasetFactory(owner=user)
+
+        datasets = list(Dataset.objects)
+        assert all(not isinstance(raw(d, "organization"), Organization) for d in datasets)
+
+        prefetch(datasets, "organization", "owner")
+
+        assert [raw(d, "organization") for d in datasets if d._data["organization"]] == [org] * 3
+        assert [raw(d, "owner") for d in datasets if d._data["owner"]] == [user]
+
+    def test_prefetch_generic_and_embedded_references(self):
+        user = UserFactory()
+        org = OrganizationFactory()
+        dataset = DatasetFactory()
+        message = MessageDiscussionFactory(posted_by=user, posted_by_organization=org)
+        DiscussionFactory(subject=dataset, user=user, discussion=[message])
+
+        discussions = prefetch(
+            Discussion.objects,
+            "subject",
+            "discussion.posted_by",
+            "discussion.posted_by_organization",
+        )
+
+        assert raw(discussions[0], "subject") == dataset
+        message = discussions[0].discussion[0]
+        assert raw(message, "posted_by") == user
+        assert raw(message, "posted_by_organization") == org
+        # Prefetching doesn't mark anything as changed
+        assert discussions[0]._get_changed_fields() == []
+
+    def test_prefetch_missing_reference(self):
+        org = OrganizationFactory()
+        DatasetFactory(organization=org)
+        # Bypass delete rules which would nullify the reference
+        Organization._get_collection().delete_one({"_id": org.id})
+
+        datasets = prefetch(Dataset.objects, "organization")
+
+        assert isinstance(raw(datasets[0], "organization"), DBRef)
+
+    def test_queryset_prefetch_on_paginate(self):
+        org = OrganizationFactory()
+        DatasetFactory.create_batch(2, organization=org)
+
+        page = Dataset.objects.prefetch("organization").paginate(1, 10)
+
+        assert all(isinstance(raw(d, "organization"), Organization) for d in page)
+
+
+class ReferencePathsTest:
+    def test_paths_from_model(self):
+        message = {
+            "content": fields.String(),
+            "posted_by": fields.Nested({"id": fields.String()}),
+        }
+        model = {
+            "title": fields.String(),
+            "subject": fields.Nested({"id": fields.String()}),
+            "user": fields.String(attribute="user.id"),
+            "discussion": fields.List(fields.Nested(message)),
+            "url": fields.String(attribute=lambda d: d.self_api_url()),
+        }
+
+        assert reference_paths(Discussion, model) == ["discussion.posted_by", "subject", "user"]
+
+    def test_paths_from_page_model(self):
+        page = fields.pager({"organization": fields.Nested({"id": fields.String()})})
+
+        assert reference_paths(Dataset, page) == ["organization"]
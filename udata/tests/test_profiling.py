@@ -0,0 +1,136 @@
+import json
+import time
+
+import pytest
+
+from udata import profiling
+from udata.core.storages import profiles
+from udata.profiling import HEADER, Profile, Sampler
+from udata.tasks import task
+from udata.tests import PytestOnlyTestCase
+
+TOKEN = "profiling-token"
+
+
+def busy(duration):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+@task(name="test-profiling")
+def profiled_task(duration):
+    busy(duration)
+
+
+class ProfileTest:
+    def test_sample(self):
+        sampler = Sampler(interval=0.001)
+        profile = Profile("request", "test")
+        sampler.add(profile)
+        busy(0.05)
+        sampler.remove(profile)
+
+        assert profile.stacks
+        stack = profile.stacks.most_common(1)[0][0]
+        assert stack.split(";")[-1].startswith("busy (udata/tests/test_profiling.py:")
+        assert "ProfileTest.test_sample" in stack
+
+    def test_not_sampled_once_removed(self):
+        sampler = Sampler(interval=0.001)
+        profile = Profile("request", "test")
+        running = Profile("request", "other")
+        sampler.add(profile)
+        sampler.add(running)
+        busy(0.02)
+        sampler.remove(profile)
+        stacks = dict(profile.stacks)
+        busy(0.02)
+        sampler.remove(running)
+
+        assert profile.stacks == stacks
+        assert sum(running.stacks.values()) > sum(stacks.values())
+
+    def test_formats(self):
+        profile = Profile("task", "test")
+        profile.stacks["main (a.py:1);work (a.py:5)"] = 3
+        profile.stacks["main (a.py:1)"] = 1
+
+        assert profile.collapsed() == "main (a.py:1);work (a.py:5) 3\nmain (a.py:1) 1\n"
+        speedscope = profile.speedscope(0.01)
+        assert speedscope["shared"]["frames"] == [
+            {"name": "main (a.py:1)"},
+            {"name": "work (a.py:5)"},
+        ]
+        [sampled] = speedscope["profiles"]
+        assert sampled["samples"] == [[0, 1], [0]]
+        assert sampled["weights"] == [0.03, 0.01]
+
+
+@pytest.mark.usefixtures("instance_path")
+@pytest.mark.options(PROFILING=True, PROFILING_INTERVAL=0.001)
+class ProfilingTest(PytestOnlyTestCase):
+    @pytest.fixture(autouse=True)
+    def view(self, app):
+        # Options are applied once the application is created
+        profiling.init_app(app)
+        app.add_url_rule("/profiled/", "profiled", lambda: busy(0.03) or "ok")
+
+    @pytest.mark.options(PROFILING_REQUESTS_THRESHOLD=0.01)
+    def test_slow_request(self, app):
+        app.test_client().get("/profiled/")
+
+        [filename] = profiles.list_files()
+        assert filename.startswith("requests/profiled/")
+        assert filename.endswith(".speedscope.json")
+        content = json.loads(profiles.read(filename))
+        assert any(frame["name"].startswith("busy ") for frame in content["shared"]["frames"])
+
+    @pytest.mark.options(PROFILING_REQUESTS_THRESHOLD=10)
+    def test_fast_request(self, app):
+        app.test_client().get("/profiled/")
+
+        assert list(profiles.list_files()) == []
+
+    @pytest.mark.options(
+        PROFILING_REQUESTS_THRESHOLD=None, PROFILING_TOKEN=TOKEN, PROFILING_FORMAT="collapsed"
+    )
+    def test_requested_with_token(self, app):
+        response = app.test_client().get("/profiled/", headers={HEADER: TOKEN})
+
+        filename = response.headers[HEADER]
+        assert list(profiles.list_files()) == [filename]
+        assert filename.endswith(".txt")
+        assert b"busy (" in profiles.read(filename)
+
+    @pytest.mark.options(PROFILING_REQUESTS_THRESHOLD=None, PROFILING_TOKEN=TOKEN)
+    def test_requested_without_permission(self, app):
+        response = app.test_client().get("/profiled/", headers={HEADER: "wrong"})
+
+        assert HEADER not in response.headers
+        assert list(profiles.list_files()) == []
+
+    @pytest.mark.options(PROFILING_TASKS_THRESHOLD=0.01)
+    def test_slow_task(self):
+        profiled_task.delay(0.03)
+        profiled_task.delay(0)
+
+        [filename] = profiles.list_files()
+        assert filename.startswith("tasks/test-profiling/")
+
+    @pytest.mark.options(PROFILING_REQUESTS_THRESHOLD=0.01, PROFILING_TASKS_THRESHOLD=0.01)
+    def test_commands(self, app, tmp_path):
+        app.test_client().get("/profiled/")
+        profiled_task.delay(0.03)
+        [request_profile] = [f for f in profiles.list_files() if f.startswith("requests/")]
+
+        result = self.cli("profiles", "list", "test-profiling")
+        assert "tasks/test-profiling/" in result.output
+        assert "requests/" not in result.output
+
+        output = tmp_path / "profile.json"
+        self.cli("profiles", "download", request_profile, "-o", str(output))
+        assert json.loads(output.read_text())["exporter"] == "udata"
+
+        result = self.cli("profiles", "download", "requests/unknown.json", expect_error=True)
+        assert result.exit_code != 0
@@ -61,6 +61,19 @@ class TagsTests:
             assert tag.counts["datasets"] == count
             assert tag.counts["reuses"] == count
 
+    def test_count_updates_and_removes_stale_tags(self):
+        Tag.objects.create(name="stale", counts={"datasets": 3}, total=3)
+        Tag.objects.create(name="kept", counts={"datasets": 3, "reuses": 2}, total=5)
+        DatasetFactory(tags=["kept"])
+        DatasetFactory(tags=[])
+
+        count_tags.run()
+
+        assert [tag.name for tag in Tag.objects] == ["kept"]
+        tag = Tag.objects.get(name="kept")
+        assert tag.counts == {"datasets": 1}
+        assert tag.total == 1
+
 
 class TagsUtilsTest(PytestOnlyTestCase):
     def test_tags_list(self):
@@ -0,0 +1,168 @@
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from urllib.request import urlopen
+
+import pytest
+import redis
+from flask_caching.backends import RedisCache
+
+from udata import app as udata_app
+from udata.commands.worker import metrics_exposition, serve_metrics
+from udata.tasks import (
+    SENT_AT_HEADER,
+    record_task_metrics,
+    stamp_sent_at,
+    task,
+    task_metrics,
+    wait_time,
+)
+from udata.tests.api import PytestOnlyDBTestCase
+
+TASKS = {"test-metrics": "default", "test-metrics-failure": "low"}
+
+
+@task(name="test-metrics")
+def metrics_task():
+    pass
+
+
+@task(name="test-metrics-failure")
+def failing_task():
+    raise ValueError("Failure")
+
+
+class TaskMetricsTest(PytestOnlyDBTestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, simple_cache):
+        return simple_cache(udata_app)
+
+    @pytest.fixture
+    def tasks(self):
+        with (
+            patch("udata.commands.worker.get_tasks", return_value=TASKS),
+            patch("udata.commands.worker.get_redis_connection", side_effect=redis.ConnectionError),
+        ):
+            yield
+
+    @pytest.mark.options(TASKS_METRICS=True)
+    def test_record_metrics(self):
+        metrics_task.delay()
+        metrics_task.delay()
+        with pytest.raises(ValueError):
+            failing_task.delay()
+
+        metrics = task_metrics(list(TASKS))
+
+        assert metrics["test-metrics"]["runs"] == 2
+        assert metrics["test-metrics"]["failures"] == 0
+        assert metrics["test-metrics"]["run"]["count"] == 2
+        assert metrics["test-metrics"]["run"]["histogram"][0.01] == 2
+        # Eager tasks are not published
+        assert metrics["test-metrics"]["wait"]["count"] == 0
+        assert metrics["test-metrics-failure"]["failures"] == 1
+
+    def test_metrics_disabled_by_default(self):
+        metrics_task.delay()
+
+        assert task_metrics(list(TASKS)) == {}
+
+    def test_redis_pipeline(self):
+        backend = RedisCache(key_prefix="prefix:")
+        backend._write_client = client = MagicMock()
+
+        with patch.object(udata_app, "cache", SimpleNamespace(cache=backend)):
+            record_task_metrics("test-metrics", 0.5, wait=2)
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        pipe = client.pipeline.return_value.__enter__.return_value
+        assert pipe.incrby.call_count == 5
+        pipe.incrby.assert_any_call("prefix:tasks:metrics:test-metrics:runs", 1)
+        pipe.execute.assert_called_once_with()
+
+    def test_wait_time(self):
+        headers = {}
+        stamp_sent_at(headers=headers)
+        request = SimpleNamespace(eta=None, get=lambda key: headers.get(key))
+
+        assert 0 <= wait_time(request) < 1
+
+        headers[SENT_AT_HEADER] -= 60
+        assert 60 <= wait_time(request) < 61
+
+        request.eta = (datetime.now() - timedelta(seconds=10)).isoformat()
+        assert 10 <= wait_time(request) < 11
+
+    @pytest.mark.options(TASKS_METRICS=True)
+    def test_metrics_command(self, tasks):
+        metrics_task.delay()
+
+        result = self.cli("worker", "metrics")
+        assert "test-metrics : 1 run(s), 0 failure(s), 0 retry(ies)" in result.output
+        assert "mean wait -" in result.output
+
+        self.cli("worker", "metrics", "--reset")
+        result = self.cli("worker", "metrics")
+        assert "No task metrics recorded" in result.output
+
+    @pytest.mark.options(TASKS_METRICS=True)
+    def test_exposition(self, tasks):
+        metrics_task.delay()
+
+        exposition = metrics_exposition()
+
+        assert 'udata_task_runs_total{task="test-metrics",queue="default"} 1' in exposition
+        assert (
+            'udata_task_run_seconds_bucket{task="test-metrics",queue="default",le="+Inf"} 1'
+            in exposition
+        )
+        assert "udata_task_wait_seconds_bucket" not in exposition
+        assert "udata_queue_length" not in exposition
+
+    @pytest.mark.options(TASKS_METRICS=True)
+    def test_serve_metrics(self, tasks):
+        metrics_task.delay()
+        server = serve_metrics(0)
+        assert server.server_address[0] == "127.0.0.1"
+        try:
+            url = "http://127.0.0.1:{0}/metrics".format(server.server_address[1])
+            with urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain")
+        finally:
+            server.shutdown()
+
+        assert 'udata_task_runs_total{task="test-metrics",queue="default"} 1' in body
+
+    def test_start_metrics_host(self):
+        with (
+            patch("udata.commands.worker.serve_metrics") as serve,
+            patch("udata.commands.worker.celery.Worker") as worker,
+        ):
+            worker.return_value.exitcode = 0
+            self.cli("worker", "start", "--metrics-port", "9808")
+            serve.assert_called_once_with(9808, "127.0.0.1")
+
+            serve.reset_mock()
+            self.cli("worker", "start", "--metrics-port", "9808", "--metrics-host", "0.0.0.0")
+            serve.assert_called_once_with(9808, "0.0.0.0")
+
+    def test_status_oldest_waiting_task(self):
+        message = {"headers": {"task": "test-metrics", SENT_AT_HEADER: time.time() - 90}}
+
+        class FakeRedis:
+            def llen(self, queue):
+                return 1
+
+            def lrange(self, queue, start, end):
+                return [json.dumps(message)]
+
+        with (
+            patch("udata.commands.worker.get_tasks", return_value=TASKS),
+            patch("udata.commands.worker.get_redis_connection", return_value=FakeRedis()),
+        ):
+            result = self.cli("worker", "status", "-q", "default")
+
+        assert 'Queue "default": 1 task(s), oldest waiting for 1m' in result.output
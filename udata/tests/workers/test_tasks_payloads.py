@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+import pytest
+from blinker import Namespace
+
+from udata import app as udata_app
+from udata.core.dataset.factories import DatasetFactory
+from udata.models import Dataset
+from udata.tasks import (
+    DocumentReference,
+    TaskPayloadTooLarge,
+    connect,
+    load_references,
+    payload_stats,
+    task,
+)
+from udata.tests.api import PytestOnlyDBTestCase
+
+ns = Namespace()
+on_test_signal = ns.signal("test-payload-signal")
+
+received = []
+
+
+@task(name="test-payload")
+def payload_task(*args, **kwargs):
+    received.append((args, kwargs))
+
+
+@connect(on_test_signal, name="test-payload-connect")
+def connected_task(dataset):
+    received.append(dataset)
+
+
+class DocumentReferenceTest(PytestOnlyDBTestCase):
+    def test_load_references_in_bulk(self):
+        datasets = DatasetFactory.create_batch(3)
+        refs = [DocumentReference.of(dataset) for dataset in datasets]
+
+        args, kwargs = load_references((refs[0], "value"), {"others": refs[1:], "flag": True})
+
+        assert args == (datasets[0], "value")
+        assert kwargs == {"others": datasets[1:], "flag": True}
+
+    def test_load_missing_reference(self):
+        dataset = DatasetFactory()
+        ref = DocumentReference.of(dataset)
+        dataset.delete()
+
+        args, _ = load_references((ref,), {})
+
+        assert args == (None,)
+
+    def test_connect_sends_a_reference(self):
+        dataset = DatasetFactory()
+        received.clear()
+
+        with patch.object(connected_task, "delay", wraps=connected_task.delay) as delay:
+            on_test_signal.send(dataset)
+
+        delay.assert_called_once_with(DocumentReference("Dataset", str(dataset.id)))
+        assert isinstance(received[0], Dataset)
+        assert received[0].id == dataset.id
+
+
+class TaskPayloadTest(PytestOnlyDBTestCase):
+    @pytest.fixture(autouse=True)
+    def cache(self, simple_cache):
+        return simple_cache(udata_app)
+
+    @pytest.mark.options(TASKS_PAYLOAD_STATS=True)
+    def test_record_payload_sizes(self):
+        payload_task.delay("x" * 10)
+        payload_task.delay("x" * 2000)
+        payload_task.delay("x" * 3000)
+
+        stats = payload_stats(["test-payload"])["test-payload"]
+
+        assert stats["count"] == 3
+        assert 1000 < stats["mean"] < 4096
+        assert stats["histogram"][1024] == 1
+        assert stats["histogram"][4096] == 2
+        assert stats["histogram"][None] == 0
+
+    def test_stats_disabled_by_default(self):
+        payload_task.delay("x")
+
+        assert payload_stats(["test-payload"]) == {}
+
+    @pytest.mark.options(TASKS_PAYLOAD_MAX_SIZE=1024)
+    def test_reject_oversized_payload(self):
+        received.clear()
+
+        with pytest.raises(TaskPayloadTooLarge):
+            payload_task.delay("x" * 2000)
+
+        assert received == []
+
+    @pytest.mark.options(TASKS_PAYLOAD_STATS=True)
+    def test_cache_errors_are_ignored(self, cache):
+        received.clear()
+
+        with patch.object(cache.cache, "inc", side_effect=ConnectionError("down")):
+            payload_task.delay("x")
+
+        assert received == [(("x",), {})]
+
+    @pytest.mark.options(TASKS_PAYLOAD_STATS=True)
+    def test_payloads_command(self):
+        with patch("udata.commands.worker.get_tasks", return_value={"test-payload": "default"}):
+            payload_task.delay("x" * 2000)
+
+            result = self.cli("worker", "payloads")
+            assert "test-payload : 1 task(s)" in result.output
+            assert "<=4KB: 1" in result.output
+
+            self.cli("worker", "payloads", "--reset")
+            result = self.cli("worker", "payloads")
+            assert "No payload size recorded" in result.output
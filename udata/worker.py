@@ -1,5 +1,5 @@
 from udata.app import create_app, standalone
 
-_app = standalone(create_app())
+_app = standalone(create_app(), lazy_api=True)
 
 from udata.tasks import celery  # noqa
@@ -25,6 +25,8 @@ class DatasetConsumer(Dataset):
         data["orga_sp"] = organization.get("public_service") if organization else None
         data["organization_name"] = organization.get("name") if organization else None
         data["organization_badges"] = organization.get("badges") if organization else None
+        data["organization_slug"] = organization.get("slug") if organization else None
+        data["organization_acronym"] = organization.get("acronym") if organization else None
 
         resources = data["resources"]
         data["resources_ids"] = [res.get("id") for res in resources]
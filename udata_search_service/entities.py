@@ -87,11 +87,21 @@ class Dataset(EntityBase):
     format_family: List[str] = None
     producer_type: List[str] = None
 
+    # Display only fields, served by lean searches
+    slug: str = None
+    description_short: str = None
+    last_modified: datetime.date = None
+    metrics: dict = None
+    organization_slug: str = None
+    organization_acronym: str = None
+
     def __post_init__(self):
         if isinstance(self.created_at, str):
             self.created_at = isoparse(self.created_at)
         if isinstance(self.last_update, str):
             self.last_update = isoparse(self.last_update)
+        if isinstance(self.last_modified, str):
+            self.last_modified = isoparse(self.last_modified)
         if isinstance(self.temporal_coverage_start, str):
             self.temporal_coverage_start = isoparse(self.temporal_coverage_start)
         if isinstance(self.temporal_coverage_end, str):
@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
 
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import NotFoundError
@@ -10,6 +10,7 @@ from elasticsearch_dsl import (
     Float,
     Integer,
     Keyword,
+    Object,
     Text,
     analyzer,
     query,
@@ -60,6 +61,135 @@ dgv_analyzer = analyzer(
 )
 
 
+LAST_UPDATE_RANGES = [
+    {"key": "last_30_days", "from": "now-30d/d"},
+    {"key": "last_12_months", "from": "now-12M/d"},
+    {"key": "last_3_years", "from": "now-3y/d"},
+]
+
+
+class Facet(NamedTuple):
+    """A facet aggregation, named after its key in search results facets"""
+
+    name: str
+    field: str
+    agg_type: str = "terms"
+    # The filter ignored when computing this facet (defaults to the facet name)
+    filter_key: Optional[str] = None
+
+    def add_to(self, search, filters: list) -> None:
+        # The facet total is the `doc_count` of the filter bucket:
+        # it is exact and much cheaper than a `cardinality` aggregation on `_id`.
+        bucket = search.aggs.bucket(
+            f"{self.name}_filtered",
+            "filter",
+            filter=query.Bool(must=filters) if filters else query.MatchAll(),
+        )
+        if self.agg_type == "date_range":
+            bucket.bucket(self.name, self.agg_type, field=self.field, ranges=LAST_UPDATE_RANGES)
+        else:
+            bucket.bucket(self.name, self.agg_type, field=self.field, size=50)
+
+    def parse(self, aggregations) -> Optional[list]:
+        filtered_name = f"{self.name}_filtered"
+        if not hasattr(aggregations, filtered_name):
+            return None
+        filtered = getattr(aggregations, filtered_name)
+        buckets = [
+            {"name": bucket.key, "count": bucket.doc_count}
+            for bucket in getattr(filtered, self.name).buckets
+        ]
+        return [{"name": "all", "count": filtered.doc_count}] + buckets
+
+
+def requested_facets(facets: List[Facet], names: Optional[Iterable[str]]) -> List[Facet]:
+    """Filter facets by name: all facets are computed if `names` is `None`"""
+    if names is None:
+        return facets
+    names = set(names)
+    return [facet for facet in facets if facet.name in names]
+
+
+def add_facets(
+    search,
+    facets: List[Facet],
+    names: Optional[Iterable[str]] = None,
+    get_filters_except: Optional[Callable[[str], list]] = None,
+) -> None:
+    """Add the requested facets aggregations to `search`, each ignoring its own filter"""
+    for facet in requested_facets(facets, names):
+        filters = get_filters_except(facet.filter_key or facet.name) if get_filters_except else []
+        facet.add_to(search, filters)
+
+
+def parse_facets(response, facets: List[Facet], names: Optional[Iterable[str]] = None) -> dict:
+    results = {}
+    aggregations = getattr(response, "aggregations", None)
+    if aggregations is None:
+        return results
+    for facet in requested_facets(facets, names):
+        parsed = facet.parse(aggregations)
+        if parsed is not None:
+            results[facet.name] = parsed
+    return results
+
+
+ORGANIZATION_FACETS = [
+    Facet("producer_type", "producer_type"),
+]
+
+TOPIC_FACETS = [
+    Facet("tag", "tags"),
+    Facet("organization_id_with_name", "organization_with_id"),
+    Facet("producer_type", "producer_type"),
+    Facet("last_update", "last_modified", "date_range", "last_update_range"),
+]
+
+DATASET_FACETS = [
+    Facet("format_family", "format_family"),
+    Facet("access_type", "access_type"),
+    Facet("producer_type", "producer_type"),
+    Facet("organization_id_with_name", "organization_with_id"),
+    Facet("last_update", "last_update", "date_range", "last_update_range"),
+    Facet("tag", "tags"),
+    Facet("license", "license"),
+    Facet("format", "format"),
+    Facet("schema", "schema"),
+    Facet("geozone", "geozones"),
+    Facet("granularity", "granularity"),
+    Facet("badge", "badges"),
+    Facet("topics", "topics"),
+]
+
+REUSE_FACETS = [
+    Facet("producer_type", "producer_type"),
+    Facet("organization_id_with_name", "organization_with_id"),
+    Facet("topic", "topic"),
+    Facet("type", "type"),
+    Facet("tag", "tags"),
+    Facet("badge", "badges"),
+    Facet("last_update", "last_modified", "date_range", "last_update_range"),
+]
+
+DATASERVICE_FACETS = [
+    Facet("access_type", "access_type"),
+    Facet("producer_type", "producer_type"),
+    Facet("organization_id_with_name", "organization_with_id"),
+    Facet("tag", "tags"),
+    Facet("badge", "badges"),
+    Facet("last_update", "metadata_modified_at", "date_range", "last_update_range"),
+]
+
+DISCUSSION_FACETS = [
+    Facet("object_type", "subject_class"),
+    Facet("last_update", "created_at", "date_range"),
+]
+
+POST_FACETS = [
+    Facet("last_update", "last_modified", "date_range"),
+]
+
+
 class IndexDocument(Document):
     @classmethod
     def _matches(cls, hit):
@@ -244,6 +374,13 @@ class SearchableDataset(IndexDocument):
     access_type = Keyword()
     format_family = Keyword(multi=True)
     producer_type = Keyword(multi=True)
+    # Display only fields, not searchable
+    slug = Keyword(index=False)
+    description_short = Text(index=False)
+    last_modified = Date(index=False)
+    metrics = Object(enabled=False)
+    organization_slug = Keyword(index=False)
+    organization_acronym = Keyword(index=False)
 
 
 ALL_DOCUMENT_CLASSES = [
@@ -326,6 +463,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchableOrganization.search()
 
@@ -382,8 +520,7 @@ class ElasticClient:
                 )
             )
 
-        search.aggs.bucket("producer_type", "terms", field="producer_type", size=50)
-        search.aggs.metric("total_count", "cardinality", field="_id")
+        add_facets(search, ORGANIZATION_FACETS, facets)
 
         if post_filters:
             search = search.post_filter(query.Bool(must=post_filters))
@@ -402,23 +539,7 @@ class ElasticClient:
             )
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        if hasattr(response, "aggregations"):
-            total_count = (
-                int(response.aggregations.total_count.value)
-                if hasattr(response.aggregations, "total_count")
-                else 0
-            )
-
-            for agg_name in ["producer_type"]:
-                if hasattr(response.aggregations, agg_name):
-                    buckets = [
-                        {"name": bucket.key, "count": bucket.doc_count}
-                        for bucket in response.aggregations[agg_name].buckets
-                    ]
-                    facets[agg_name] = [{"name": "all", "count": total_count}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, ORGANIZATION_FACETS, facets)
 
     def query_topics(
         self,
@@ -427,6 +548,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchableTopic.search()
 
@@ -498,71 +620,7 @@ class ElasticClient:
                     filters_list.append(filter_dict[key])
             return filters_list
 
-        tag_filters = get_filters_except("tag")
-        if tag_filters:
-            tag_agg = search.aggs.bucket(
-                "tag_filtered", "filter", filter=query.Bool(must=tag_filters)
-            )
-            tag_agg.bucket("tag", "terms", field="tags", size=50)
-            tag_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("tag", "terms", field="tags", size=50)
-            search.aggs.metric("tag_total", "cardinality", field="_id")
-
-        org_filters = get_filters_except("organization_id_with_name")
-        if org_filters:
-            org_agg = search.aggs.bucket(
-                "organization_id_with_name_filtered", "filter", filter=query.Bool(must=org_filters)
-            )
-            org_agg.bucket(
-                "organization_id_with_name", "terms", field="organization_with_id", size=50
-            )
-            org_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "organization_id_with_name", "terms", field="organization_with_id", size=50
-            )
-            search.aggs.metric("organization_id_with_name_total", "cardinality", field="_id")
-
-        producer_filters = get_filters_except("producer_type")
-        if producer_filters:
-            producer_agg = search.aggs.bucket(
-                "producer_type_filtered", "filter", filter=query.Bool(must=producer_filters)
-            )
-            producer_agg.bucket("producer_type", "terms", field="producer_type", size=50)
-            producer_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("producer_type", "terms", field="producer_type", size=50)
-            search.aggs.metric("producer_type_total", "cardinality", field="_id")
-
-        last_update_filters = get_filters_except("last_update_range")
-        if last_update_filters:
-            last_update_agg = search.aggs.bucket(
-                "last_update_filtered", "filter", filter=query.Bool(must=last_update_filters)
-            )
-            last_update_agg.bucket(
-                "last_update",
-                "date_range",
-                field="last_modified",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            last_update_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "last_update",
-                "date_range",
-                field="last_modified",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            search.aggs.metric("last_update_total", "cardinality", field="_id")
+        add_facets(search, TOPIC_FACETS, facets, get_filters_except)
 
         post_filters = []
         for key, value in filter_dict.items():
@@ -596,44 +654,7 @@ class ElasticClient:
             )
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        if hasattr(response, "aggregations"):
-            facet_configs = [
-                ("tag", "tag_filtered", "tag_total"),
-                (
-                    "organization_id_with_name",
-                    "organization_id_with_name_filtered",
-                    "organization_id_with_name_total",
-                ),
-                ("producer_type", "producer_type_filtered", "producer_type_total"),
-                ("last_update", "last_update_filtered", "last_update_total"),
-            ]
-
-            for facet_name, filtered_name, total_name in facet_configs:
-                if hasattr(response.aggregations, filtered_name):
-                    filtered_agg = getattr(response.aggregations, filtered_name)
-                    if hasattr(filtered_agg, facet_name):
-                        buckets = [
-                            {"name": bucket.key, "count": bucket.doc_count}
-                            for bucket in getattr(filtered_agg, facet_name).buckets
-                        ]
-                        total_count = (
-                            int(filtered_agg.total.value) if hasattr(filtered_agg, "total") else 0
-                        )
-                        facets[facet_name] = [{"name": "all", "count": total_count}] + buckets
-                elif hasattr(response.aggregations, facet_name):
-                    buckets = [
-                        {"name": bucket.key, "count": bucket.doc_count}
-                        for bucket in getattr(response.aggregations, facet_name).buckets
-                    ]
-                    total_count = (
-                        int(getattr(response.aggregations, total_name).value)
-                        if hasattr(response.aggregations, total_name)
-                        else 0
-                    )
-                    facets[facet_name] = [{"name": "all", "count": total_count}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, TOPIC_FACETS, facets)
 
     def query_datasets(
         self,
@@ -642,6 +663,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchableDataset.search()
 
@@ -817,172 +839,7 @@ class ElasticClient:
                     filters_list.append(filter_dict[key])
             return filters_list
 
-        format_filters = get_filters_except("format_family")
-        if format_filters:
-            format_agg = search.aggs.bucket(
-                "format_family_filtered", "filter", filter=query.Bool(must=format_filters)
-            )
-            format_agg.bucket("format_family", "terms", field="format_family", size=50)
-            format_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("format_family", "terms", field="format_family", size=50)
-            search.aggs.metric("format_family_total", "cardinality", field="_id")
-
-        access_filters = get_filters_except("access_type")
-        if access_filters:
-            access_agg = search.aggs.bucket(
-                "access_type_filtered", "filter", filter=query.Bool(must=access_filters)
-            )
-            access_agg.bucket("access_type", "terms", field="access_type", size=50)
-            access_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("access_type", "terms", field="access_type", size=50)
-            search.aggs.metric("access_type_total", "cardinality", field="_id")
-
-        producer_filters = get_filters_except("producer_type")
-        if producer_filters:
-            producer_agg = search.aggs.bucket(
-                "producer_type_filtered", "filter", filter=query.Bool(must=producer_filters)
-            )
-            producer_agg.bucket("producer_type", "terms", field="producer_type", size=50)
-            producer_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("producer_type", "terms", field="producer_type", size=50)
-            search.aggs.metric("producer_type_total", "cardinality", field="_id")
-
-        org_name_filters = get_filters_except("organization_id_with_name")
-        if org_name_filters:
-            org_name_agg = search.aggs.bucket(
-                "organization_id_with_name_filtered",
-                "filter",
-                filter=query.Bool(must=org_name_filters),
-            )
-            org_name_agg.bucket(
-                "organization_id_with_name", "terms", field="organization_with_id", size=50
-            )
-            org_name_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "organization_id_with_name", "terms", field="organization_with_id", size=50
-            )
-            search.aggs.metric("organization_id_with_name_total", "cardinality", field="_id")
-
-        last_update_filters = get_filters_except("last_update_range")
-        if last_update_filters:
-            last_update_agg = search.aggs.bucket(
-                "last_update_filtered", "filter", filter=query.Bool(must=last_update_filters)
-            )
-            last_update_agg.bucket(
-                "last_update",
-                "date_range",
-                field="last_update",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            last_update_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "last_update",
-                "date_range",
-                field="last_update",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            search.aggs.metric("last_update_total", "cardinality", field="_id")
-
-        tag_filters = get_filters_except("tag")
-        if tag_filters:
-            tag_agg = search.aggs.bucket(
-                "tag_filtered", "filter", filter=query.Bool(must=tag_filters)
-            )
-            tag_agg.bucket("tag", "terms", field="tags", size=50)
-            tag_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("tag", "terms", field="tags", size=50)
-            search.aggs.metric("tag_total", "cardinality", field="_id")
-
-        license_filters = get_filters_except("license")
-        if license_filters:
-            license_agg = search.aggs.bucket(
-                "license_filtered", "filter", filter=query.Bool(must=license_filters)
-            )
-            license_agg.bucket("license", "terms", field="license", size=50)
-            license_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("license", "terms", field="license", size=50)
-            search.aggs.metric("license_total", "cardinality", field="_id")
-
-        format_filters = get_filters_except("format")
-        if format_filters:
-            format_agg = search.aggs.bucket(
-                "format_filtered", "filter", filter=query.Bool(must=format_filters)
-            )
-            format_agg.bucket("format", "terms", field="format", size=50)
-            format_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("format", "terms", field="format", size=50)
-            search.aggs.metric("format_total", "cardinality", field="_id")
-
-        schema_filters = get_filters_except("schema")
-        if schema_filters:
-            schema_agg = search.aggs.bucket(
-                "schema_filtered", "filter", filter=query.Bool(must=schema_filters)
-            )
-            schema_agg.bucket("schema", "terms", field="schema", size=50)
-            schema_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("schema", "terms", field="schema", size=50)
-            search.aggs.metric("schema_total", "cardinality", field="_id")
-
-        geozone_filters = get_filters_except("geozone")
-        if geozone_filters:
-            geozone_agg = search.aggs.bucket(
-                "geozone_filtered", "filter", filter=query.Bool(must=geozone_filters)
-            )
-            geozone_agg.bucket("geozone", "terms", field="geozones", size=50)
-            geozone_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("geozone", "terms", field="geozones", size=50)
-            search.aggs.metric("geozone_total", "cardinality", field="_id")
-
-        granularity_filters = get_filters_except("granularity")
-        if granularity_filters:
-            granularity_agg = search.aggs.bucket(
-                "granularity_filtered", "filter", filter=query.Bool(must=granularity_filters)
-            )
-            granularity_agg.bucket("granularity", "terms", field="granularity", size=50)
-            granularity_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("granularity", "terms", field="granularity", size=50)
-            search.aggs.metric("granularity_total", "cardinality", field="_id")
-
-        badge_filters = get_filters_except("badge")
-        if badge_filters:
-            badge_agg = search.aggs.bucket(
-                "badge_filtered", "filter", filter=query.Bool(must=badge_filters)
-            )
-            badge_agg.bucket("badge", "terms", field="badges", size=50)
-            badge_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("badge", "terms", field="badges", size=50)
-            search.aggs.metric("badge_total", "cardinality", field="_id")
-
-        topics_filters = get_filters_except("topics")
-        if topics_filters:
-            topics_agg = search.aggs.bucket(
-                "topics_filtered", "filter", filter=query.Bool(must=topics_filters)
-            )
-            topics_agg.bucket("topics", "terms", field="topics", size=50)
-            topics_agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket("topics", "terms", field="topics", size=50)
-            search.aggs.metric("topics_total", "cardinality", field="_id")
+        add_facets(search, DATASET_FACETS, facets, get_filters_except)
 
         post_filters = []
         for key, value in filter_dict.items():
@@ -1008,53 +865,7 @@ class ElasticClient:
             )
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        if hasattr(response, "aggregations"):
-            facet_configs = [
-                ("format_family", "format_family_filtered", "format_family_total"),
-                ("access_type", "access_type_filtered", "access_type_total"),
-                ("producer_type", "producer_type_filtered", "producer_type_total"),
-                (
-                    "organization_id_with_name",
-                    "organization_id_with_name_filtered",
-                    "organization_id_with_name_total",
-                ),
-                ("last_update", "last_update_filtered", "last_update_total"),
-                ("tag", "tag_filtered", "tag_total"),
-                ("license", "license_filtered", "license_total"),
-                ("format", "format_filtered", "format_total"),
-                ("schema", "schema_filtered", "schema_total"),
-                ("geozone", "geozone_filtered", "geozone_total"),
-                ("granularity", "granularity_filtered", "granularity_total"),
-                ("badge", "badge_filtered", "badge_total"),
-                ("topics", "topics_filtered", "topics_total"),
-            ]
-
-            for facet_name, filtered_name, total_name in facet_configs:
-                if hasattr(response.aggregations, filtered_name):
-                    filtered_agg = getattr(response.aggregations, filtered_name)
-                    if hasattr(filtered_agg, facet_name):
-                        buckets = [
-                            {"name": bucket.key, "count": bucket.doc_count}
-                            for bucket in getattr(filtered_agg, facet_name).buckets
-                        ]
-                        total_count = (
-                            int(filtered_agg.total.value) if hasattr(filtered_agg, "total") else 0
-                        )
-                        facets[facet_name] = [{"name": "all", "count": total_count}] + buckets
-                elif hasattr(response.aggregations, facet_name):
-                    buckets = [
-                        {"name": bucket.key, "count": bucket.doc_count}
-                        for bucket in getattr(response.aggregations, facet_name).buckets
-                    ]
-                    total_count = (
-                        int(getattr(response.aggregations, total_name).value)
-                        if hasattr(response.aggregations, total_name)
-                        else 0
-                    )
-                    facets[facet_name] = [{"name": "all", "count": total_count}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, DATASET_FACETS, facets)
 
     def query_reuses(
         self,
@@ -1063,6 +874,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchableReuse.search()
 
@@ -1223,53 +1035,7 @@ class ElasticClient:
                     flt.append(filter_dict[k])
             return flt
 
-        facet_fields = {
-            "producer_type": ("producer_type", "producer_type"),
-            "organization_id_with_name": ("organization_with_id", "organization_id_with_name"),
-            "topic": ("topic", "topic"),
-            "type": ("type", "type"),
-            "tag": ("tags", "tag"),
-            "badge": ("badges", "badge"),
-        }
-
-        for facet_key, (es_field, agg_name) in facet_fields.items():
-            f = get_filters_except(facet_key)
-            if f:
-                agg = search.aggs.bucket(
-                    f"{agg_name}_filtered", "filter", filter=query.Bool(must=f)
-                )
-                agg.bucket(agg_name, "terms", field=es_field, size=50)
-                agg.metric("total", "cardinality", field="_id")
-            else:
-                search.aggs.bucket(agg_name, "terms", field=es_field, size=50)
-                search.aggs.metric(f"{agg_name}_total", "cardinality", field="_id")
-
-        f = get_filters_except("last_update_range")
-        if f:
-            agg = search.aggs.bucket("last_update_filtered", "filter", filter=query.Bool(must=f))
-            agg.bucket(
-                "last_update",
-                "date_range",
-                field="last_modified",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "last_update",
-                "date_range",
-                field="last_modified",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            search.aggs.metric("last_update_total", "cardinality", field="_id")
+        add_facets(search, REUSE_FACETS, facets, get_filters_except)
 
         post_filters = []
         for k in [
@@ -1303,50 +1069,7 @@ class ElasticClient:
 
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-
-        for facet_key, (_, agg_name) in facet_fields.items():
-            filtered_name = f"{agg_name}_filtered"
-            total_name = f"{agg_name}_total"
-
-            if hasattr(response.aggregations, filtered_name):
-                fa = getattr(response.aggregations, filtered_name)
-                buckets = [
-                    {"name": b.key, "count": b.doc_count} for b in getattr(fa, agg_name).buckets
-                ]
-                total = int(fa.total.value) if hasattr(fa, "total") else 0
-                facets[agg_name] = [{"name": "all", "count": total}] + buckets
-
-            elif hasattr(response.aggregations, agg_name):
-                buckets = [
-                    {"name": b.key, "count": b.doc_count}
-                    for b in getattr(response.aggregations, agg_name).buckets
-                ]
-                total = (
-                    int(getattr(response.aggregations, total_name).value)
-                    if hasattr(response.aggregations, total_name)
-                    else 0
-                )
-                facets[agg_name] = [{"name": "all", "count": total}] + buckets
-
-        if hasattr(response.aggregations, "last_update_filtered"):
-            fa = response.aggregations.last_update_filtered
-            buckets = [{"name": b.key, "count": b.doc_count} for b in fa.last_update.buckets]
-            total = int(fa.total.value) if hasattr(fa, "total") else 0
-            facets["last_update"] = [{"name": "all", "count": total}] + buckets
-        elif hasattr(response.aggregations, "last_update"):
-            buckets = [
-                {"name": b.key, "count": b.doc_count}
-                for b in response.aggregations.last_update.buckets
-            ]
-            total = (
-                int(response.aggregations.last_update_total.value)
-                if hasattr(response.aggregations, "last_update_total")
-                else 0
-            )
-            facets["last_update"] = [{"name": "all", "count": total}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, REUSE_FACETS, facets)
 
     def query_dataservices(
         self,
@@ -1355,6 +1078,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ):
         search = SearchableDataservice.search()
 
@@ -1510,53 +1234,7 @@ class ElasticClient:
                     filters_list.append(filter_dict[k])
             return filters_list
 
-        facet_fields = {
-            "access_type": ("access_type", "access_type"),
-            "producer_type": ("producer_type", "producer_type"),
-            "organization_id_with_name": ("organization_with_id", "organization_id_with_name"),
-            "tag": ("tags", "tag"),
-            "badge": ("badges", "badge"),
-        }
-
-        for facet_name, (es_field, agg_name) in facet_fields.items():
-            f = get_filters_except(facet_name)
-            if f:
-                agg = search.aggs.bucket(
-                    f"{agg_name}_filtered", "filter", filter=query.Bool(must=f)
-                )
-                agg.bucket(agg_name, "terms", field=es_field, size=50)
-                agg.metric("total", "cardinality", field="_id")
-            else:
-                search.aggs.bucket(agg_name, "terms", field=es_field, size=50)
-                search.aggs.metric(f"{agg_name}_total", "cardinality", field="_id")
-
-        # last_update facet
-        f = get_filters_except("last_update_range")
-        if f:
-            agg = search.aggs.bucket("last_update_filtered", "filter", filter=query.Bool(must=f))
-            agg.bucket(
-                "last_update",
-                "date_range",
-                field="metadata_modified_at",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            agg.metric("total", "cardinality", field="_id")
-        else:
-            search.aggs.bucket(
-                "last_update",
-                "date_range",
-                field="metadata_modified_at",
-                ranges=[
-                    {"key": "last_30_days", "from": "now-30d/d"},
-                    {"key": "last_12_months", "from": "now-12M/d"},
-                    {"key": "last_3_years", "from": "now-3y/d"},
-                ],
-            )
-            search.aggs.metric("last_update_total", "cardinality", field="_id")
+        add_facets(search, DATASERVICE_FACETS, facets, get_filters_except)
 
         post_filters = []
         for k in [
@@ -1583,47 +1261,7 @@ class ElasticClient:
         results_number = response.hits.total.value
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        for facet_name, (_, agg_name) in facet_fields.items():
-            filtered_name = f"{agg_name}_filtered"
-            total_name = f"{agg_name}_total"
-            if hasattr(response.aggregations, filtered_name):
-                fa = getattr(response.aggregations, filtered_name)
-                buckets = [
-                    {"name": b.key, "count": b.doc_count} for b in getattr(fa, agg_name).buckets
-                ]
-                total = int(fa.total.value) if hasattr(fa, "total") else 0
-                facets[agg_name] = [{"name": "all", "count": total}] + buckets
-            elif hasattr(response.aggregations, agg_name):
-                buckets = [
-                    {"name": b.key, "count": b.doc_count}
-                    for b in getattr(response.aggregations, agg_name).buckets
-                ]
-                total = (
-                    int(getattr(response.aggregations, total_name).value)
-                    if hasattr(response.aggregations, total_name)
-                    else 0
-                )
-                facets[agg_name] = [{"name": "all", "count": total}] + buckets
-
-        if hasattr(response.aggregations, "last_update_filtered"):
-            fa = response.aggregations.last_update_filtered
-            buckets = [{"name": b.key, "count": b.doc_count} for b in fa.last_update.buckets]
-            total = int(fa.total.value) if hasattr(fa, "total") else 0
-            facets["last_update"] = [{"name": "all", "count": total}] + buckets
-        elif hasattr(response.aggregations, "last_update"):
-            buckets = [
-                {"name": b.key, "count": b.doc_count}
-                for b in response.aggregations.last_update.buckets
-            ]
-            total = (
-                int(response.aggregations.last_update_total.value)
-                if hasattr(response.aggregations, "last_update_total")
-                else 0
-            )
-            facets["last_update"] = [{"name": "all", "count": total}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, DATASERVICE_FACETS, facets)
 
     def find_one_organization(self, organization_id: str) -> Optional[dict]:
         try:
@@ -1702,6 +1340,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchableDiscussion.search()
 
@@ -1740,18 +1379,7 @@ class ElasticClient:
         else:
             search = search.query(query.MatchAll())
 
-        search.aggs.bucket("object_type", "terms", field="subject_class", size=50)
-        search.aggs.bucket(
-            "last_update",
-            "date_range",
-            field="created_at",
-            ranges=[
-                {"key": "last_30_days", "from": "now-30d/d"},
-                {"key": "last_12_months", "from": "now-12M/d"},
-                {"key": "last_3_years", "from": "now-3y/d"},
-            ],
-        )
-        search.aggs.metric("total_count", "cardinality", field="_id")
+        add_facets(search, DISCUSSION_FACETS, facets)
 
         if post_filters:
             search = search.post_filter(query.Bool(must=post_filters))
@@ -1770,23 +1398,7 @@ class ElasticClient:
             )
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        if hasattr(response, "aggregations"):
-            total_count = (
-                int(response.aggregations.total_count.value)
-                if hasattr(response.aggregations, "total_count")
-                else 0
-            )
-
-            for agg_name in ["object_type", "last_update"]:
-                if hasattr(response.aggregations, agg_name):
-                    buckets = [
-                        {"name": bucket.key, "count": bucket.doc_count}
-                        for bucket in response.aggregations[agg_name].buckets
-                    ]
-                    facets[agg_name] = [{"name": "all", "count": total_count}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, DISCUSSION_FACETS, facets)
 
     def find_one_discussion(self, discussion_id: str) -> Optional[dict]:
         try:
@@ -1813,6 +1425,7 @@ class ElasticClient:
         page_size: int,
         filters: dict,
         sort: Optional[str] = None,
+        facets: Optional[Iterable[str]] = None,
     ) -> Tuple[int, List[dict], dict]:
         search = SearchablePost.search()
 
@@ -1855,17 +1468,7 @@ class ElasticClient:
         else:
             search = search.query(query.MatchAll())
 
-        search.aggs.bucket(
-            "last_update",
-            "date_range",
-            field="last_modified",
-            ranges=[
-                {"key": "last_30_days", "from": "now-30d/d"},
-                {"key": "last_12_months", "from": "now-12M/d"},
-                {"key": "last_3_years", "from": "now-3y/d"},
-            ],
-        )
-        search.aggs.metric("total_count", "cardinality", field="_id")
+        add_facets(search, POST_FACETS, facets)
 
         if post_filters:
             search = search.post_filter(query.Bool(must=post_filters))
@@ -1884,23 +1487,7 @@ class ElasticClient:
             )
         res = [hit.to_dict(skip_empty=False) for hit in response.hits]
 
-        facets = {}
-        if hasattr(response, "aggregations"):
-            total_count = (
-                int(response.aggregations.total_count.value)
-                if hasattr(response.aggregations, "total_count")
-                else 0
-            )
-
-            for agg_name in ["last_update"]:
-                if hasattr(response.aggregations, agg_name):
-                    buckets = [
-                        {"name": bucket.key, "count": bucket.doc_count}
-                        for bucket in response.aggregations[agg_name].buckets
-                    ]
-                    facets[agg_name] = [{"name": "all", "count": total_count}] + buckets
-
-        return results_number, res, facets
+        return results_number, res, parse_facets(response, POST_FACETS, facets)
 
     def find_one_post(self, post_id: str) -> Optional[dict]:
         try: